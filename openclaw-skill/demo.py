@@ -11,6 +11,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from scripts.mock_databricks import MockDatabricksClient
+from scripts.result_batch import ColumnBatch
+from scripts.result_stream import iter_rows, StatementError
+from scripts.frame_cache import FrameCache, synthetic_frame
 from scripts.mock_data import MOCK_INVENTORY, MOCK_PRODUCTION_JOBS, MOCK_EMPLOYEES
 
 def demo_inventory_lookup():
@@ -24,30 +27,33 @@ def demo_inventory_lookup():
     print("\n1. Looking up SKU 'ABC123'...")
     result = client.execute_statement("SELECT * FROM inventory WHERE sku = 'ABC123'")
     if result.get('status', {}).get('state') == 'SUCCEEDED':
-        data = result.get('result', {}).get('data_array', [])
+        data = ColumnBatch.from_response(result)
         if data:
             row = data[0]
-            print(f"   ✅ Found: {row[1]}")
-            print(f"   📦 Available: {row[4]} units")
-            print(f"   📍 Location: {row[5]}")
+            print(f"   ✅ Found: {row['description']}")
+            print(f"   📦 Available: {row['quantity_available']} units")
+            print(f"   📍 Location: {row['warehouse_location']}")
     
     # Test barcode lookup
     print("\n2. Looking up barcode '987654321098'...")
     result = client.execute_statement("SELECT * FROM inventory WHERE barcode = '987654321098'")
     if result.get('status', {}).get('state') == 'SUCCEEDED':
-        data = result.get('result', {}).get('data_array', [])
+        data = ColumnBatch.from_response(result)
         if data:
             row = data[0]
-            print(f"   ✅ Found: {row[0]}")
-            print(f"   📍 Location: {row[5]}")
+            print(f"   ✅ Found: {row['sku']}")
+            print(f"   📍 Location: {row['warehouse_location']}")
     
     # Test low stock
     print("\n3. Low stock items:")
-    result = client.execute_statement("SELECT * FROM inventory WHERE quantity_available <= reorder_point")
-    if result.get('status', {}).get('state') == 'SUCCEEDED':
-        data = result.get('result', {}).get('data_array', [])
-        for row in data:
-            print(f"   ⚠️  {row[0]}: {row[2]} units available")
+    # Streamed chunk by chunk: each item prints as soon as its chunk arrives
+    try:
+        for sku, available in iter_rows(
+            client, "SELECT sku, quantity_available FROM inventory WHERE quantity_available <= reorder_point"
+        ):
+            print(f"   ⚠️  {sku}: {available} units available")
+    except StatementError as e:
+        print(f"   ❌ {e}")
 
 def demo_production_status():
     """Demo: Check production jobs"""
@@ -60,21 +66,21 @@ def demo_production_status():
     print("\n1. Checking job 'JOB001'...")
     result = client.execute_statement("SELECT * FROM production WHERE job_id = 'JOB001'")
     if result.get('status', {}).get('state') == 'SUCCEEDED':
-        data = result.get('result', {}).get('data_array', [])
+        data = ColumnBatch.from_response(result)
         if data:
             row = data[0]
-            print(f"   👤 Customer: {row[1]}")
-            print(f"   📊 Status: {row[6]}")
-            print(f"   📈 Progress: {row[4]}/{row[3]}")
+            print(f"   👤 Customer: {row['customer_name']}")
+            print(f"   📊 Status: {row['status']}")
+            print(f"   📈 Progress: {row['quantity_produced']}/{row['quantity_ordered']}")
     
     # Test overdue jobs
     print("\n2. Overdue jobs:")
     result = client.execute_statement("SELECT * FROM production WHERE status = 'DELAYED'")
     if result.get('status', {}).get('state') == 'SUCCEEDED':
-        data = result.get('result', {}).get('data_array', [])
+        data = ColumnBatch.from_response(result)
         for row in data:
-            due_date = row[8] if len(row) > 8 else "Unknown"
-            print(f"   🚨 {row[0]}: {row[1]} - Due: {due_date}")
+            due_date = row.get('estimated_completion') or "Unknown"
+            print(f"   🚨 {row['job_id']}: {row['customer_name']} - Due: {due_date}")
 
 def demo_full_pipeline():
     """Demo: Simulate the full voice + vision pipeline"""
@@ -87,14 +93,25 @@ def demo_full_pipeline():
     print("🔍 Tool Call: inventory_lookup(barcode='123456789012')")
     
     client = MockDatabricksClient()
-    result = client.execute_statement("SELECT * FROM inventory WHERE barcode = '123456789012'")
     
-    if result.get('status', {}).get('state') == 'SUCCEEDED':
-        data = result.get('result', {}).get('data_array', [])
-        if data:
-            item = data[0]
-            print(f"📊 Database: Returns inventory data")
-            print(f"🔊 AI Response: \"{item[1]}, SKU {item[0]}. {item[4]} units available at {item[5]}.\"")
+    def decode_and_lookup(frame):
+        # Barcode decoding happens on the phone; the mock frame always shows this one
+        result = client.execute_statement("SELECT * FROM inventory WHERE barcode = '123456789012'")
+        if result.get('status', {}).get('state') == 'SUCCEEDED':
+            return ColumnBatch.from_response(result)
+        return None
+    
+    # The glasses keep streaming while the user looks at the item; near-identical
+    # frames reuse the first frame's lookup
+    frames = FrameCache()
+    for take in range(3):
+        data = frames.lookup(synthetic_frame(seed=7, shift=take % 2, take=take), decode_and_lookup)
+    
+    if data:
+        item = data[0]
+        print(f"📊 Database: Returns inventory data")
+        print(f"🔊 AI Response: \"{item['description']}, SKU {item['sku']}. {item['quantity_available']} units available at {item['warehouse_location']}.\"")
+    print(f"🖼️  Frames: {frames.hits + frames.misses} streamed, {frames.misses} decoded + queried")
     
     print("\n✅ Full pipeline working!")
 
@@ -6,12 +6,25 @@ Demonstrates the full OpenClaw Voice Vision system
 
 import sys
 import os
+from functools import lru_cache
 
 # Add scripts to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
 
 from mock_data import MOCK_INVENTORY, MOCK_PRODUCTION_JOBS, MOCK_EMPLOYEES, MOCK_CUSTOMERS
 from mock_databricks import MockDatabricksClient
+from production_aggregates import ProductionAggregates
+from synthetic_data import REFERENCE_DATE
+
+@lru_cache(maxsize=None)
+def warehouse():
+    """Mock warehouse shared by the demos; its inventory column store is encoded once"""
+    return MockDatabricksClient(verbose=False)
+
+@lru_cache(maxsize=None)
+def production_aggregates():
+    """Due-date index over the mock jobs, built on first use and kept for later calls"""
+    return ProductionAggregates(MOCK_PRODUCTION_JOBS)
 
 def print_header(title):
     print(f"\n{'='*60}")
@@ -44,7 +57,7 @@ def demo_inventory():
     
     # Low stock alert
     print("\n⚠️  Low Stock Items:")
-    low_stock = [i for i in MOCK_INVENTORY if i["quantity_available"] <= i["reorder_point"]]
+    low_stock = warehouse().inventory.low_stock()
     for item in low_stock:
         print(f"   • {item['sku']}: {item['quantity_available']} units (reorder at {item['reorder_point']})")
 
@@ -75,7 +88,8 @@ def demo_production():
     
     # Overdue jobs
     print("\n🚨 Overdue Jobs:")
-    overdue = [j for j in MOCK_PRODUCTION_JOBS if j["status"] == "DELAYED"]
+    # Open jobs past their estimated completion, from the due-date index
+    overdue = production_aggregates().overdue(REFERENCE_DATE.isoformat())
     for job in overdue:
         print(f"   • {job['job_id']}: {job['customer_name']} - {job['priority']} priority")
 
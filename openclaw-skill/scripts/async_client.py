@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Async Statement Client
+asyncio front end for any execute_statement client, with a concurrency limit
+and single-flight de-duplication of identical in-flight statements
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional
+
+try:
+    from sql_engine import statement_key
+except ImportError:
+    from scripts.sql_engine import statement_key
+
+
+class AsyncStatementClient:
+    """
+    Wraps a blocking client (MockDatabricksClient, DatabricksClient) or a client
+    whose execute_statement is already a coroutine.
+
+    Identical statements (same normalized SQL, parameters and options) issued while one
+    is running share that execution's result. Waiters receive the same response
+    object, so treat it as read-only. Streamed statements (fetch_all=False) are never
+    shared: each caller gets its own statement_id and chunk cursor.
+    """
+
+    def __init__(self, client, max_concurrency: int = 8, executor: Optional[ThreadPoolExecutor] = None):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._native = inspect.iscoroutinefunction(client.execute_statement)
+        self._own_executor = executor is None and not self._native
+        self._executor = executor or (None if self._native else
+                                      ThreadPoolExecutor(max_concurrency, thread_name_prefix="statement"))
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.executions = 0
+        self.deduplicated = 0
+
+    async def execute_statement(self, sql: str, **kwargs) -> Dict[str, Any]:
+        """Run sql, or join an identical statement that is already running"""
+        if not kwargs.get("fetch_all", True):
+            return await self._execute(sql, kwargs)
+
+        key = statement_key(sql, kwargs.get("parameters"))
+        options = {k: v for k, v in kwargs.items() if k != "parameters"}
+        if options:  # fetch_all, wait_timeout, catalog, ... change the response
+            key += " -- " + repr(sorted(options.items()))
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._execute(sql, kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._finished, key))
+        else:
+            self.deduplicated += 1
+        # The execution is a task of its own and every caller - the first included - awaits it
+        # through shield, so cancelling any one caller never cancels it for the others
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved when every caller was cancelled
+
+    async def _execute(self, sql: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._semaphore:
+            self.executions += 1
+            if self._native:
+                return await self.client.execute_statement(sql, **kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(self.client.execute_statement, sql, **kwargs))
+
+    async def execute_many(self, statements: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Run statements concurrently (bounded by max_concurrency), results in order"""
+        return list(await asyncio.gather(*(self.execute_statement(sql, **kwargs) for sql in statements)))
+
+    def close(self):
+        """Release the worker threads this client created"""
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+async def _demo():
+    try:
+        from mock_databricks import MockDatabricksClient
+    except ImportError:
+        from scripts.mock_databricks import MockDatabricksClient
+
+    async with AsyncStatementClient(MockDatabricksClient(), max_concurrency=4) as client:
+        # Ten wearers scan the same item while two others check jobs
+        statements = ["SELECT * FROM inventory WHERE sku = 'ABC123'"] * 10 + [
+            "SELECT * FROM production WHERE job_id = 'JOB001'",
+            "SELECT * FROM production WHERE job_id = 'JOB004'",
+        ]
+        results = await client.execute_many(statements)
+
+    ok = sum(r["status"]["state"] == "SUCCEEDED" for r in results)
+    print(f"\n✅ {ok}/{len(results)} statements succeeded")
+    print(f"⚡ {client.executions} executions, {client.deduplicated} joined an in-flight duplicate")
+
+
+def main():
+    """CLI demo"""
+    print("⚡ Async Statement Client Demo")
+    print("=" * 50)
+    asyncio.run(_demo())
+
+if __name__ == "__main__":
+    main()
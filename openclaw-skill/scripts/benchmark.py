@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the Skill Tools
+Latency, throughput and peak memory of every tool method and query route,
+across synthetic data sizes, with JSON baselines and regression checks
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, List, Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.synthetic_data import generate_dataset, iter_timesheets, REFERENCE_DATE
+from scripts.mock_databricks import MockDatabricksClient
+from scripts.customer_insights import CustomerInsights
+from scripts.employee_hours import EmployeeHours
+from scripts.trigram_index import TrigramIndex
+from scripts.production_aggregates import ProductionAggregates
+from scripts.timesheet_store import TimesheetStore
+from scripts.records import compact_dataset
+
+Case = Tuple[str, Callable[[], Any]]
+
+
+def build_cases(rows: int, seed: int = 42, records: bool = False) -> List[Case]:
+    """Every benchmarked operation, bound to realistic arguments from a dataset of this size"""
+    dataset = generate_dataset(rows, seed)
+    if records:
+        dataset = compact_dataset(dataset)
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence client banners
+        client = MockDatabricksClient(dataset)
+        ci = CustomerInsights(dataset=dataset)
+        eh = EmployeeHours(client, dataset=dataset, today=REFERENCE_DATE)
+    search_index = TrigramIndex((row["sku"], row["description"]) for row in dataset["inventory"])
+    aggregates = ProductionAggregates(dict(job) for job in dataset["production_jobs"])
+    today = REFERENCE_DATE.isoformat()
+    # Two years of daily hours per employee
+    timesheets = TimesheetStore(REFERENCE_DATE.replace(year=REFERENCE_DATE.year - 2))
+    departments = {e["employee_id"]: e["department"] for e in dataset["employees"]}
+    for employee_id, first_day, hours in iter_timesheets(dataset["employees"], days=730, seed=seed):
+        timesheets.record_series(employee_id, first_day, hours, departments[employee_id])
+
+    customer = dataset["customers"][len(dataset["customers"]) // 2]
+    employee = dataset["employees"][len(dataset["employees"]) // 2]
+    item = dataset["inventory"][len(dataset["inventory"]) // 2]
+    job = dataset["production_jobs"][len(dataset["production_jobs"]) // 2]
+    prefix = customer["name"].split()[0]
+    first_name = employee["name"].split()[0]
+    # Speech-to-text spellings: first vowel swapped for one that sounds alike
+    misheard_employee = re.sub("[aeiou]", "y", employee["name"], count=1)
+    misheard_customer = re.sub("[aeiou]", "y", customer["name"], count=1)
+
+    summary = ci.get_customer_summary(customer["name"])
+    order_status = ci.get_order_status(customer["name"])
+    hours = eh.get_employee_hours(employee["employee_id"])
+    roster = eh.get_department_roster(employee["department"])
+
+    routes = {
+        "inventory_by_sku": ("_handle_inventory_query", f"SELECT * FROM inventory WHERE sku = '{item['sku']}'"),
+        "inventory_low_stock": ("_handle_inventory_query",
+                                "SELECT sku, quantity_available, reorder_point FROM inventory "
+                                "WHERE quantity_available <= reorder_point"),
+        "production_by_job": ("_handle_production_query", f"SELECT * FROM production WHERE job_id = '{job['job_id']}'"),
+        "production_delayed": ("_handle_production_query",
+                               "SELECT job_id, customer_name FROM production WHERE status = 'DELAYED' "
+                               "ORDER BY estimated_completion LIMIT 20"),
+        "employee_by_department": ("_handle_employee_query",
+                                   f"SELECT employee_id, name FROM employees WHERE department = '{employee['department']}'"),
+        "customer_top_revenue": ("_handle_customer_query",
+                                 "SELECT name, ytd_revenue FROM customers ORDER BY ytd_revenue DESC LIMIT 5"),
+    }
+
+    cases: List[Case] = [
+        ("CustomerInsights.get_customer_summary", lambda: ci.get_customer_summary(customer["name"])),
+        ("CustomerInsights.get_customer_summary[prefix]", lambda: ci.get_customer_summary(prefix)),
+        ("CustomerInsights.get_customer_summary[misheard]", lambda: ci.get_customer_summary(misheard_customer)),
+        ("CustomerInsights.get_order_status", lambda: ci.get_order_status(customer["name"])),
+        ("CustomerInsights.get_top_customers", lambda: ci.get_top_customers(5)),
+        ("CustomerInsights.get_customer_rank", lambda: ci.get_customer_rank(customer["name"])),
+        ("CustomerInsights.format_customer_response", lambda: ci.format_customer_response(summary)),
+        ("CustomerInsights.format_order_status_response", lambda: ci.format_order_status_response(order_status)),
+        ("CustomerInsights.iter_order_status_response[first]",
+         lambda: next(ci.iter_order_status_response(order_status))),
+        ("EmployeeHours.get_employee_hours", lambda: eh.get_employee_hours(employee["employee_id"])),
+        ("EmployeeHours.get_employee_hours[name]", lambda: eh.get_employee_hours(first_name)),
+        ("EmployeeHours.get_employee_hours[misheard]", lambda: eh.get_employee_hours(misheard_employee)),
+        ("EmployeeHours.get_department_roster", lambda: eh.get_department_roster(employee["department"])),
+        ("EmployeeHours.get_department_roster[shift]",
+         lambda: eh.get_department_roster(employee["department"], shift=employee["shift"])),
+        ("EmployeeHours.get_department_roster[shift,status]",
+         lambda: eh.get_department_roster(employee["department"], shift=employee["shift"], status="Active")),
+        ("EmployeeHours.search_employees", lambda: eh.search_employees(first_name)),
+        ("EmployeeHours.format_hours_response", lambda: eh.format_hours_response(hours)),
+        ("EmployeeHours.format_roster_response", lambda: eh.format_roster_response(roster)),
+        ("EmployeeHours.iter_roster_response[first]", lambda: next(eh.iter_roster_response(roster))),
+        ("ProductionAggregates.summary", lambda: aggregates.summary(today)),
+        ("ProductionAggregates.overdue", lambda: aggregates.overdue(today)),
+        ("TimesheetStore.hours", lambda: timesheets.hours(employee["employee_id"], "2025-03-01", today)),
+        ("TimesheetStore.department_rollup", lambda: timesheets.department_rollup("2025-03-01", today)),
+        ("TimesheetStore.overtime", lambda: timesheets.overtime("2026-02-09")),
+        ("TrigramIndex.search", lambda: search_index.search(item["description"], limit=5)),
+        ("TrigramIndex.search[typo]", lambda: search_index.search("carbn fram", limit=5)),
+    ]
+    for name, (route, sql) in routes.items():
+        plan = client.engine.plan(sql)
+        handler = getattr(client, route)
+        cases.append((f"MockDatabricksClient.{route}[{name}]", lambda h=handler, p=plan: h(p, {})))
+        cases.append((f"MockDatabricksClient.execute_statement[{name}]",
+                      lambda s=sql: client.execute_statement(s)))
+    return cases
+
+
+def measure(fn: Callable[[], Any], min_time: float = 0.2, min_runs: int = 5, max_runs: int = 100_000) -> Dict[str, float]:
+    """Time fn repeatedly; report ops/sec, p50/p99 latency and peak traced memory"""
+    fn()  # Warm caches and lazy indexes before timing
+
+    latencies = []
+    clock = time.perf_counter_ns
+    deadline = time.perf_counter() + min_time
+    while len(latencies) < min_runs or (time.perf_counter() < deadline and len(latencies) < max_runs):
+        start = clock()
+        fn()
+        latencies.append(clock() - start)
+
+    # Memory is traced in a separate pass: tracemalloc would distort the timings
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(min(len(latencies), 20)):
+        fn()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "runs": len(latencies),
+        "ops_per_sec": len(latencies) / (total / 1e9) if total else float("inf"),
+        "p50_us": latencies[len(latencies) // 2] / 1e3,
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1e3,
+        "peak_kib": max(peak, 0) / 1024,
+    }
+
+
+def run(sizes: List[int], min_time: float = 0.2, pattern: str = "", seed: int = 42,
+        records: bool = False) -> Dict[str, Any]:
+    """Benchmark every case at every size; records=True runs them over compact records instead of dicts"""
+    results: Dict[str, Dict[str, Any]] = {}
+    for rows in sizes:
+        print(f"\n📊 {rows:,} inventory rows")
+        for name, fn in build_cases(rows, seed, records):
+            if pattern and pattern not in name:
+                continue
+            stats = measure(fn, min_time)
+            results[f"{name}@{rows}"] = stats
+            print(f"   {name:<62} {stats['ops_per_sec']:>12,.0f} ops/s  "
+                  f"p50 {stats['p50_us']:>9.1f}µs  p99 {stats['p99_us']:>9.1f}µs  "
+                  f"peak {stats['peak_kib']:>8.1f}KiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": sizes,
+            "seed": seed,
+            "records": records,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25) -> List[str]:
+    """Cases whose p50 latency grew, or throughput fell, by more than threshold"""
+    regressions = []
+    for key, stats in current["results"].items():
+        base = baseline["results"].get(key)
+        if not base:
+            continue
+        slower = stats["p50_us"] / base["p50_us"] - 1 if base["p50_us"] else 0.0
+        fewer = 1 - stats["ops_per_sec"] / base["ops_per_sec"] if base["ops_per_sec"] else 0.0
+        if slower > threshold or fewer > threshold:
+            regressions.append(
+                f"{key}: p50 {base['p50_us']:.1f}µs -> {stats['p50_us']:.1f}µs, "
+                f"{base['ops_per_sec']:,.0f} -> {stats['ops_per_sec']:,.0f} ops/s"
+            )
+    return regressions
+
+
+def main():
+    """CLI: run the suite, optionally save a baseline or compare against one"""
+    parser = argparse.ArgumentParser(description="Benchmark the skill tools")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated inventory row counts")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to run each case")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--records", action="store_true", help="load tables as compact records (records.py)")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    print("⏱️  OpenClaw Skill Benchmarks")
+    print("=" * 50)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    current = run(sizes, args.min_time, args.filter, args.seed, args.records)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n🚨 {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   • {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions over {args.threshold:.0%} against {args.compare}")
+
+if __name__ == "__main__":
+    main()
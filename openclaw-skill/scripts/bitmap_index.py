@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Bitmap Indexes for Categorical Columns
+Dictionary-encoded low-cardinality columns (department, shift, status) with one
+integer bitmap per value, so any conjunction of filters is a bitwise AND and a
+count is a popcount
+"""
+
+from itertools import islice
+from typing import Dict, Any, List, Iterable, Iterator, Sequence, Tuple
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Positions of the set bits, lowest first"""
+    # Walk the bytes: clearing bits in the big int itself would copy it once per bit
+    for index, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+        while byte:
+            low = byte & -byte
+            yield index * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+class Selection:
+    """
+    Records picked by a bitmap, decoded only when read.
+    len() is a popcount; iteration and slicing materialize just the records visited.
+    """
+    __slots__ = ("records", "bits")
+
+    def __init__(self, records: Sequence[Dict[str, Any]], bits: int):
+        self.records = records
+        self.bits = bits
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        records = self.records
+        return (records[position] for position in iter_bits(self.bits))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            if (item.start or 0) >= 0 and (item.stop is None or item.stop >= 0) and (item.step or 1) > 0:
+                return list(islice(self, item.start, item.stop, item.step))
+            return list(self)[item]
+        if item < 0:
+            item += len(self)
+        for record in islice(self, item, None):
+            return record
+        raise IndexError("selection index out of range")
+
+    def __repr__(self) -> str:
+        return f"Selection({len(self)} records)"
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+
+class BitmapIndex:
+    """
+    For each indexed column: value -> code (case-insensitive) and code -> bitmap of the
+    positions holding it. Positions are record indexes, appended in order.
+    """
+
+    def __init__(self, columns: Sequence[str], records: Iterable[Dict[str, Any]] = ()):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._codes: Dict[str, Dict[str, int]] = {column: {} for column in self.columns}
+        self._bitmaps: Dict[str, List[int]] = {column: [] for column in self.columns}
+        self._row_codes: Dict[str, List[int]] = {column: [] for column in self.columns}
+        self._size = 0
+        self._bulk_load(records)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _code(self, column: str, value: Any) -> int:
+        codes = self._codes[column]
+        key = str(value).casefold()
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(codes)
+            self._bitmaps[column].append(0)
+        return code
+
+    def _bulk_load(self, records: Iterable[Dict[str, Any]]):
+        # Setting bits one at a time rebuilds a growing int per record; instead encode
+        # every row, then build each bitmap once from a byte buffer
+        start = self._size
+        for record in records:
+            for column in self.columns:
+                self._row_codes[column].append(self._code(column, record.get(column)))
+            self._size += 1
+        if self._size == start:
+            return
+        for column in self.columns:
+            buffers = [bytearray((self._size + 7) // 8) for _ in self._bitmaps[column]]
+            for position in range(start, self._size):
+                buffers[self._row_codes[column][position]][position >> 3] |= 1 << (position & 7)
+            bitmaps = self._bitmaps[column]
+            for code, buffer in enumerate(buffers):
+                bitmaps[code] |= int.from_bytes(buffer, "little")
+
+    def add(self, record: Dict[str, Any]) -> int:
+        """Index the next record; returns its position"""
+        position = self._size
+        for column in self.columns:
+            code = self._code(column, record.get(column))
+            self._row_codes[column].append(code)
+            self._bitmaps[column][code] |= 1 << position
+        self._size += 1
+        return position
+
+    def update(self, position: int, column: str, value: Any):
+        """Move one record to a new value in column (e.g. a status change)"""
+        codes = self._row_codes[column]
+        old, new = codes[position], self._code(column, value)
+        if old != new:
+            bit = 1 << position
+            self._bitmaps[column][old] &= ~bit
+            self._bitmaps[column][new] |= bit
+            codes[position] = new
+
+    def bitmap(self, column: str, value: Any) -> int:
+        """Positions holding value in column (case-insensitive); 0 if none do"""
+        codes = self._codes.get(column)
+        if codes is None:
+            raise KeyError(f"{column} is not an indexed column (have {', '.join(self.columns)})")
+        code = codes.get(str(value).casefold())
+        return 0 if code is None else self._bitmaps[column][code]
+
+    def select(self, **filters: Any) -> int:
+        """AND of every column=value filter; None values are ignored"""
+        bits = (1 << self._size) - 1
+        for column, value in filters.items():
+            if value is not None:
+                bits &= self.bitmap(column, value)
+                if not bits:
+                    break
+        return bits
+
+    def count(self, **filters: Any) -> int:
+        return self.select(**filters).bit_count()
+
+    def values(self, column: str) -> List[str]:
+        """Distinct (case-folded) values of column that some record still holds"""
+        return [value for value, code in self._codes[column].items() if self._bitmaps[column][code]]
+
+    def counts(self, column: str, **filters: Any) -> Dict[str, int]:
+        """Records per value of column among those matching filters"""
+        bits = self.select(**filters)
+        return {value: (bits & self._bitmaps[column][code]).bit_count()
+                for value, code in self._codes[column].items() if bits & self._bitmaps[column][code]}
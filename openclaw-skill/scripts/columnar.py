@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Columnar Tables for the Mock Warehouse
+Numeric columns in typed arrays, categorical strings dictionary-encoded,
+so scans like low-stock become whole-column masks instead of per-row dict access
+"""
+
+import operator
+from array import array
+from itertools import compress, repeat
+from math import fsum
+from typing import Dict, Any, List, Optional, Iterable, Sequence, Tuple
+
+try:
+    from sql_engine import lookup_positions, type_mismatch
+except ImportError:
+    from scripts.sql_engine import lookup_positions, type_mismatch
+
+_numpy = None  # Imported on first vectorized operation; False once known to be missing
+
+
+def numpy_or_none():
+    """NumPy if it is installed, else None. Imported on first call: it is the heaviest import here"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:  # Optional - the array/map path gives the same answers
+            _numpy = False
+    return _numpy or None
+
+# Databricks column types -> array typecodes; everything else is stored as strings
+_TYPECODES = {
+    "INT": "q", "BIGINT": "q", "SMALLINT": "q", "TINYINT": "q",
+    "DOUBLE": "d", "FLOAT": "d", "DECIMAL": "d",
+}
+
+_COMPARISONS = {
+    "=": operator.eq, "!=": operator.ne, "<>": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+
+class StringDictionary:
+    """Maps repeated strings to small integer codes"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        """Code for value, or None if it never occurs (without adding it)"""
+        return self._codes.get(value)
+
+
+class ColumnarTable:
+    """
+    Column-major table.
+    Numeric columns must be non-null; string columns may be dictionary-encoded.
+    """
+
+    def __init__(self, name: str, schema: Sequence[Tuple[str, str]], rows: Iterable[Dict[str, Any]] = (),
+                 indexed: Iterable[str] = (), categorical: Iterable[str] = ()):
+        self.name = name
+        self.schema = list(schema)
+        self.columns = [column for column, _ in self.schema]
+        self.indexed = set(indexed)
+        self.dictionaries: Dict[str, StringDictionary] = {c: StringDictionary() for c in categorical}
+        self.data: Dict[str, Any] = {}
+        for column, type_name in self.schema:
+            if column in self.dictionaries:
+                self.data[column] = array("I")
+            elif type_name.upper() in _TYPECODES:
+                self.data[column] = array(_TYPECODES[type_name.upper()])
+            else:
+                self.data[column] = []
+        # Typed arrays have no NULL: these columns refuse None up front
+        self._non_null = [column for column in self.columns
+                          if column not in self.dictionaries and isinstance(self.data[column], array)]
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {}
+        self._length = 0
+
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, row: Dict[str, Any]) -> int:
+        """Add a row dict and return its position (ValueError for a NULL numeric, adding nothing)"""
+        for column in self._non_null:
+            if row.get(column) is None:
+                self._reject_null(column)
+        position = self._length
+        for column in self.columns:
+            value = row.get(column)
+            dictionary = self.dictionaries.get(column)
+            self.data[column].append(dictionary.encode(value) if dictionary is not None else value)
+        self._length += 1
+        for column, index in self._indexes.items():
+            index.setdefault(row.get(column), []).append(position)
+        return position
+
+    def set_value(self, position: int, column: str, value: Any):
+        """Update one cell in place"""
+        if value is None and column in self._non_null:
+            self._reject_null(column)
+        if column in self._indexes:
+            old = self.value(position, column)
+            self._indexes[column][old].remove(position)
+            self._indexes[column].setdefault(value, []).append(position)
+        dictionary = self.dictionaries.get(column)
+        self.data[column][position] = dictionary.encode(value) if dictionary is not None else value
+
+    def _reject_null(self, column: str):
+        raise ValueError(f"{self.name}.{column} is numeric and cannot be NULL")
+
+    def value(self, position: int, column: str) -> Any:
+        raw = self.data[column][position]
+        dictionary = self.dictionaries.get(column)
+        return dictionary.values[raw] if dictionary is not None else raw
+
+    def row(self, position: int) -> Dict[str, Any]:
+        """Materialize one row as a dict"""
+        return {column: self.value(position, column) for column in self.columns}
+
+    def rows(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.row(p) for p in positions]
+
+    def decoded(self, column: str) -> Sequence[Any]:
+        """Column values with dictionary codes resolved"""
+        dictionary = self.dictionaries.get(column)
+        if dictionary is not None:
+            return list(map(dictionary.values.__getitem__, self.data[column]))
+        return self.data[column]
+
+    def as_numpy(self, column: str):
+        """Zero-copy NumPy view of a numeric or code column (requires NumPy)"""
+        np = numpy_or_none()
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        values = self.data[column]
+        if not isinstance(values, array):
+            raise TypeError(f"{column} is not stored in a typed array")
+        return np.frombuffer(values, dtype=np.dtype(values.typecode))
+
+    def index(self, column: str) -> Dict[Any, List[int]]:
+        """Hash index value -> positions, built on first use and maintained on append"""
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for position, value in enumerate(self.decoded(column)):
+                index.setdefault(value, []).append(position)
+            self._indexes[column] = index
+        return index
+
+    # -- vectorized predicates -------------------------------------------------
+
+    def _is_numeric(self, column: str) -> bool:
+        return column not in self.dictionaries and isinstance(self.data[column], array)
+
+    def compare(self, left: str, op: str, right: Any, right_is_column: bool = False):
+        """
+        Whole-column comparison: left <op> right, where right is a column name or a scalar.
+        Returns a NumPy bool array when NumPy is available, else a list of bools.
+        """
+        compare = _COMPARISONS[op]
+        n = self._length
+        np = numpy_or_none()
+        left_dict = self.dictionaries.get(left)
+
+        if not right_is_column and right is None:
+            return [False] * n  # Comparisons against NULL are never true
+
+        # Categorical column vs scalar equality compares codes, not strings
+        if left_dict is not None and not right_is_column and op in ("=", "!=", "<>"):
+            code = left_dict.code(right)
+            if code is None:
+                return [op != "="] * n
+            if np is not None:
+                return compare(self.as_numpy(left), code)
+            return list(map(compare, self.data[left], repeat(code, n)))
+
+        right_numeric = self._is_numeric(right) if right_is_column else isinstance(right, (int, float))
+        if self._is_numeric(left) and right_numeric:
+            if np is not None:
+                other = self.as_numpy(right) if right_is_column else right
+                return compare(self.as_numpy(left), other)
+            # Typed arrays hold no NULLs, so the operator runs directly in map()
+            right_values = self.data[right] if right_is_column else repeat(right, n)
+            return list(map(compare, self.data[left], right_values))
+
+        left_values = self.decoded(left)
+        right_values = self.decoded(right) if right_is_column else repeat(right, n)
+        return list(map(_null_safe(compare), left_values, right_values))
+
+    def positions(self, mask) -> List[int]:
+        """Row positions where mask is true"""
+        np = numpy_or_none()
+        if np is not None and not isinstance(mask, list):
+            return np.flatnonzero(mask).tolist()
+        return list(compress(range(self._length), mask))
+
+    def filter(self, plan, params: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Rows matching a SqlEngine plan, using column masks for simple conjunctions"""
+        if plan.predicate is None:
+            return (self.row(p) for p in range(self._length))
+
+        if plan.lookup and plan.lookup[0] in self.indexed:
+            column, values = plan.lookup
+            candidates = lookup_positions(self.index(column), values(params))
+            if plan.lookup_exact:
+                return self.rows(candidates)
+            predicate = plan.predicate
+            return (row for row in self.rows(candidates) if predicate(row, params))
+
+        if plan.conjuncts is not None:
+            mask = None
+            for left, op, right in plan.conjuncts:
+                # Normalize to column <op> operand
+                if left.kind != "column" and right.kind == "column":
+                    left, right, op = right, left, _FLIPPED[op]
+                if left.kind != "column":
+                    result = _null_safe(_COMPARISONS[op])(left(None, params), right(None, params))
+                    current = [result] * self._length
+                elif right.kind == "column":
+                    current = self.compare(left.column, op, right.column, right_is_column=True)
+                else:
+                    current = self.compare(left.column, op, right(None, params))
+                mask = current if mask is None else _and(mask, current)
+            return (self.row(p) for p in self.positions(mask))
+
+        predicate = plan.predicate
+        return (row for row in map(self.row, range(self._length)) if predicate(row, params))
+
+
+_FLIPPED = {"=": "=", "!=": "!=", "<>": "<>", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+def _null_safe(compare):
+    def safe(a, b):
+        # SQL semantics: any comparison against NULL is not true
+        if a is None or b is None:
+            return False
+        try:
+            return compare(a, b)
+        except TypeError:
+            raise type_mismatch(a, b) from None
+    return safe
+
+
+def _and(a, b):
+    if numpy_or_none() is not None and not isinstance(a, list) and not isinstance(b, list):
+        return a & b
+    return list(map(operator.and_, a, b))
+
+
+# Inventory column layout; free-text and location columns repeat heavily across SKUs
+INVENTORY_CATEGORICAL = ("description", "warehouse_location", "last_updated")
+
+
+class InventoryColumns(ColumnarTable):
+    """Inventory held column-wise, with the low-stock / reorder / valuation scans vectorized"""
+
+    def __init__(self, schema: Sequence[Tuple[str, str]], rows: Iterable[Dict[str, Any]] = ()):
+        super().__init__("inventory", schema, rows, indexed=("sku", "barcode"),
+                         categorical=INVENTORY_CATEGORICAL)
+
+    def low_stock_positions(self) -> List[int]:
+        """Positions where quantity_available <= reorder_point"""
+        mask = self.compare("quantity_available", "<=", "reorder_point", right_is_column=True)
+        return self.positions(mask)
+
+    def low_stock(self) -> List[Dict[str, Any]]:
+        """Items at or below their reorder point"""
+        return self.rows(self.low_stock_positions())
+
+    def reorder_shortfall(self) -> List[Tuple[str, int]]:
+        """(sku, units below reorder point) for every low-stock item"""
+        positions = self.low_stock_positions()
+        sku = self.data["sku"]
+        available = self.data["quantity_available"]
+        reorder = self.data["reorder_point"]
+        return [(sku[p], reorder[p] - available[p]) for p in positions]
+
+    def value_on_hand(self) -> float:
+        """Total inventory value: sum of quantity_on_hand * unit_cost"""
+        np = numpy_or_none()
+        if np is not None:
+            return float(np.dot(self.as_numpy("quantity_on_hand"), self.as_numpy("unit_cost")))
+        return fsum(map(operator.mul, self.data["quantity_on_hand"], self.data["unit_cost"]))
@@ -10,22 +10,66 @@ import os
 # Handle both direct execution and module import
 try:
     from mock_data import MOCK_CUSTOMERS, MOCK_PRODUCTION_JOBS
+    from entity_store import EntityStore
+    from order_index import OrderIndex
+    from leaderboard import RevenueLeaderboard
 except ImportError:
     from scripts.mock_data import MOCK_CUSTOMERS, MOCK_PRODUCTION_JOBS
-from typing import Dict, Any, List
+    from scripts.entity_store import EntityStore
+    from scripts.order_index import OrderIndex
+    from scripts.leaderboard import RevenueLeaderboard
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def default_indexes() -> Tuple[EntityStore, OrderIndex, RevenueLeaderboard]:
+    """Indexes over mock_data, built on first use and shared by every CustomerInsights instance"""
+    return (
+        EntityStore(MOCK_CUSTOMERS, id_field="customer_id"),
+        OrderIndex(MOCK_PRODUCTION_JOBS),
+        RevenueLeaderboard(MOCK_CUSTOMERS),
+    )
+
+
+def __getattr__(name: str):
+    # CUSTOMER_STORE / ORDER_INDEX / REVENUE_LEADERBOARD used to be built at import time
+    shared = {"CUSTOMER_STORE": 0, "ORDER_INDEX": 1, "REVENUE_LEADERBOARD": 2}
+    if name in shared:
+        return default_indexes()[shared[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class CustomerInsights:
     """Query customer information"""
     
+    def __init__(self, customers: Optional[EntityStore] = None, orders: Optional[OrderIndex] = None,
+                 leaderboard: Optional[RevenueLeaderboard] = None,
+                 dataset: Optional[Dict[str, List[Dict]]] = None):
+        # An empty store or index is still the caller's: compare with None, not truthiness
+        if dataset is not None:
+            # Tables from synthetic_data.generate_dataset / load_dataset
+            if customers is None:
+                customers = EntityStore(dataset["customers"], id_field="customer_id")
+            if orders is None:
+                orders = OrderIndex(dataset["production_jobs"])
+            if leaderboard is None:
+                leaderboard = RevenueLeaderboard(dataset["customers"])
+        if customers is None or orders is None or leaderboard is None:
+            shared = default_indexes()
+            customers = customers if customers is not None else shared[0]
+            orders = orders if orders is not None else shared[1]
+            leaderboard = leaderboard if leaderboard is not None else shared[2]
+        self.customers = customers
+        self.orders = orders
+        self.leaderboard = leaderboard
+    
     def get_customer_summary(self, customer_name: str) -> Dict[str, Any]:
         """Get full customer profile"""
         
-        # Find customer
-        customer = None
-        for c in MOCK_CUSTOMERS:
-            if customer_name.lower() in c["name"].lower():
-                customer = c
-                break
+        # Find customer: exact id/name, then name prefix, substring, then how it sounds
+        customer, fuzzy_match = self.customers.resolve(customer_name)
         
         if not customer:
             return {
@@ -34,8 +78,7 @@ class CustomerInsights:
             }
         
         # Get their orders
-        orders = [j for j in MOCK_PRODUCTION_JOBS 
-                 if j["customer_name"] == customer["name"]]
+        orders = self.orders.jobs_for(customer["name"])
         
         return {
             "found": True,
@@ -48,7 +91,8 @@ class CustomerInsights:
             "ytd_revenue": customer["ytd_revenue"],
             "outstanding_orders": customer["outstanding_orders"],
             "last_contact": customer["last_contact"],
-            "orders": orders
+            "orders": orders,
+            "fuzzy_match": fuzzy_match
         }
     
     def get_order_status(self, customer_name: str) -> Dict[str, Any]:
@@ -58,85 +102,108 @@ class CustomerInsights:
         if not customer_data.get("found"):
             return customer_data
         
-        orders = customer_data.get("orders", [])
-        
-        in_progress = [o for o in orders if o["status"] == "IN_PROGRESS"]
-        completed = [o for o in orders if o["status"] == "COMPLETED"]
-        delayed = [o for o in orders if o["status"] == "DELAYED"]
+        name = customer_data["name"]
         
+        # Counters are maintained by the order index - no scan over the orders
         return {
             "found": True,
-            "customer": customer_data["name"],
-            "total_orders": len(orders),
-            "in_progress": len(in_progress),
-            "completed_recent": len(completed),
-            "delayed": len(delayed),
-            "orders": orders
+            "customer": name,
+            "total_orders": self.orders.order_count(name),
+            "in_progress": self.orders.status_count(name, "IN_PROGRESS"),
+            "completed_recent": self.orders.status_count(name, "COMPLETED"),
+            "delayed": self.orders.status_count(name, "DELAYED"),
+            "orders": customer_data.get("orders", []),
+            "fuzzy_match": customer_data["fuzzy_match"]
         }
     
     def get_top_customers(self, limit: int = 5) -> List[Dict]:
         """Get top customers by revenue"""
-        sorted_customers = sorted(
-            MOCK_CUSTOMERS, 
-            key=lambda x: x["ytd_revenue"], 
-            reverse=True
-        )
-        return sorted_customers[:limit]
+        return self.leaderboard.top(limit)
     
-    def format_customer_response(self, data: Dict[str, Any]) -> str:
-        """Format customer summary as natural language"""
+    def get_customer_rank(self, customer_name: str) -> Dict[str, Any]:
+        """Where a customer ranks by YTD revenue"""
+        customer = self.customers.lookup(customer_name)
+        if not customer:
+            return {
+                "found": False,
+                "message": f"Customer '{customer_name}' not found"
+            }
+        
+        return {
+            "found": True,
+            "name": customer["name"],
+            "rank": self.leaderboard.rank(customer["customer_id"]),
+            "of": len(self.leaderboard),
+            "ytd_revenue": customer["ytd_revenue"]
+        }
+    
+    def update_revenue(self, customer_name: str, ytd_revenue: float) -> bool:
+        """Record new YTD revenue for a customer and re-rank them"""
+        customer = self.customers.lookup(customer_name)
+        if not customer:
+            return False
+        self.leaderboard.update_revenue(customer["customer_id"], ytd_revenue)
+        return True
+    
+    def iter_customer_response(self, data: Dict[str, Any]) -> Iterator[str]:
+        """Customer summary as natural language, one sentence or clause at a time so speech can start early"""
         if not data.get("found"):
-            return data.get("message", "Customer not found")
+            yield data.get("message", "Customer not found")
+            return
         
         name = data.get("name")
         revenue = data.get("ytd_revenue", 0)
-        orders = data.get("total_orders", 0)
-        outstanding = data.get("outstanding_orders", 0)
         contact = data.get("contact")
         
-        response = f"{name}. Contact: {contact}. "
-        response += f"YTD revenue: ${revenue:,.0f}. "
-        response += f"{orders} total orders. "
+        if data.get("fuzzy_match"):
+            yield f"I think you mean {name}. "
+        
+        # Name and headline number first
+        yield f"{name}. Contact: {contact}. YTD revenue: ${revenue:,.0f}. "
+        
+        orders = data.get("total_orders", 0)
+        outstanding = data.get("outstanding_orders", 0)
+        yield f"{orders} total orders. "
         
         if outstanding > 0:
-            response += f"{outstanding} orders in progress. "
+            yield f"{outstanding} orders in progress. "
         
         # Last contact
         last_contact = data.get("last_contact")
         if last_contact:
-            response += f"Last contact: {last_contact}. "
-        
-        return response
+            yield f"Last contact: {last_contact}. "
     
-    def format_order_status_response(self, data: Dict[str, Any]) -> str:
-        """Format order status as natural language"""
+    def format_customer_response(self, data: Dict[str, Any]) -> str:
+        """Format customer summary as natural language"""
+        return "".join(self.iter_customer_response(data))
+    
+    def iter_order_status_response(self, data: Dict[str, Any]) -> Iterator[str]:
+        """Order status as natural language, one sentence or clause at a time so speech can start early"""
         if not data.get("found"):
-            return data.get("message", "Customer not found")
+            yield data.get("message", "Customer not found")
+            return
         
         customer = data.get("customer")
         total = data.get("total_orders", 0)
+        yield f"{customer} has {total} orders. "
+        
         in_progress = data.get("in_progress", 0)
         delayed = data.get("delayed", 0)
-        
-        response = f"{customer} has {total} orders. "
-        
         if in_progress > 0:
-            response += f"{in_progress} in progress. "
+            yield f"{in_progress} in progress. "
         
         if delayed > 0:
-            response += f"⚠️ {delayed} delayed. "
+            yield f"⚠️ {delayed} delayed. "
         
-        # Detail recent orders
+        # Detail recent orders, stopping at the first two open ones
         orders = data.get("orders", [])
-        if orders:
-            recent = [o for o in orders if o["status"] in ["IN_PROGRESS", "DELAYED"]][:2]
-            if recent:
-                response += "Recent: "
-                for o in recent:
-                    response += f"{o['job_id']} ({o['status'].lower()}), "
-                response = response.rstrip(", ") + ". "
-        
-        return response
+        recent = list(islice((o for o in orders if o["status"] in ["IN_PROGRESS", "DELAYED"]), 2))
+        if recent:
+            yield "Recent: " + ", ".join(f"{o['job_id']} ({o['status'].lower()})" for o in recent) + ". "
+    
+    def format_order_status_response(self, data: Dict[str, Any]) -> str:
+        """Format order status as natural language"""
+        return "".join(self.iter_order_status_response(data))
 
 
 def main():
@@ -161,6 +228,11 @@ def main():
     top = ci.get_top_customers(3)
     for i, c in enumerate(top, 1):
         print(f"   {i}. {c['name']}: ${c['ytd_revenue']:,.0f}")
+    
+    # Test 4: Rank
+    print("\n4. Where does Acme rank?...")
+    result = ci.get_customer_rank("Acme")
+    print(f"   #{result['rank']} of {result['of']}")
 
 if __name__ == "__main__":
     main()
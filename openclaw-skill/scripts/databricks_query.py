@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Databricks SQL Client
+Statement Execution API over a pooled keep-alive session, with adaptive status polling
+"""
+
+import os
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+STATEMENTS_PATH = "/api/2.0/sql/statements"
+
+# States after which a statement will not change again
+_TERMINAL_STATES = {"SUCCEEDED", "FAILED", "CANCELED", "CLOSED"}
+
+
+@lru_cache(maxsize=None)
+def load_env():
+    """Read DATABRICKS_* settings from a .env file, once, when a client is configured from the environment"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+def _failed(error_code: str, message: str) -> Dict[str, Any]:
+    """A response in the FAILED shape of a failed statement"""
+    return {"status": {"state": "FAILED", "error": {"error_code": error_code, "message": message}}}
+
+
+class DatabricksClient:
+    """Real warehouse client with the same execute_statement signature as MockDatabricksClient"""
+
+    def __init__(self, host: Optional[str] = None, token: Optional[str] = None,
+                 warehouse_id: Optional[str] = None, pool_size: int = 10,
+                 timeout: float = 60.0, request_timeout: float = 30.0,
+                 min_poll_interval: float = 0.05, max_poll_interval: float = 2.0):
+        if not (host and token and warehouse_id):
+            load_env()
+        self.host = (host or os.getenv("DATABRICKS_HOST", "")).rstrip("/")
+        self.token = token or os.getenv("DATABRICKS_TOKEN", "")
+        self.warehouse_id = warehouse_id or os.getenv("DATABRICKS_WAREHOUSE_ID", "")
+        if not (self.host and self.token and self.warehouse_id):
+            raise ValueError("Set DATABRICKS_HOST, DATABRICKS_TOKEN and DATABRICKS_WAREHOUSE_ID")
+
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        # Running average of how long statements take to finish, used to pace polling
+        self._expected_duration = min_poll_interval * 4
+
+        # One pooled session: TCP/TLS connections are reused across statements.
+        # Only idempotent GETs are retried; a retried POST could run a statement twice.
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=frozenset({"GET"}))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json",
+        })
+
+    def execute_statement(self, sql: str, **kwargs) -> Dict[str, Any]:
+        """
+        Submit sql and wait for it to finish.
+        Extra keyword arguments (parameters, catalog, schema, row_limit, wait_timeout, ...)
+        are passed through to the API. All result chunks are gathered into result.data_array,
+        unless fetch_all=False: then only the first chunk is returned and later ones are
+        read with get_chunk (see result_stream.iter_rows).
+        """
+        fetch_all = kwargs.pop("fetch_all", True)
+        body = {
+            "statement": sql,
+            "warehouse_id": self.warehouse_id,
+            "wait_timeout": "10s",
+            "on_wait_timeout": "CONTINUE",
+            "disposition": "INLINE",
+            "format": "JSON_ARRAY",
+        }
+        body.update(kwargs)
+
+        started = time.monotonic()
+        response = self._request("POST", STATEMENTS_PATH, json=body)
+        response = self._wait(response, started)
+
+        if fetch_all and response.get("status", {}).get("state") == "SUCCEEDED":
+            self._collect_chunks(response)
+        return response
+
+    def _wait(self, response: Dict[str, Any], started: float) -> Dict[str, Any]:
+        """Poll until the statement reaches a terminal state, backing off adaptively"""
+        statement_id = response.get("statement_id")
+        state = response.get("status", {}).get("state")
+        if state in _TERMINAL_STATES or not statement_id:
+            return response
+
+        # Start near half the usual statement duration, then back off geometrically
+        delay = min(max(self._expected_duration / 2, self.min_poll_interval), self.max_poll_interval)
+        deadline = started + self.timeout
+        while state not in _TERMINAL_STATES:
+            if time.monotonic() + delay > deadline:
+                self.cancel(statement_id)
+                return {
+                    "statement_id": statement_id,
+                    "status": {
+                        "state": "CANCELED",
+                        "error": {"error_code": "TIMEOUT", "message": f"Statement exceeded {self.timeout}s"}
+                    }
+                }
+            time.sleep(delay)
+            delay = min(delay * 1.6, self.max_poll_interval)
+            response = self._request("GET", f"{STATEMENTS_PATH}/{statement_id}")
+            state = response.get("status", {}).get("state")
+
+        elapsed = time.monotonic() - started
+        self._expected_duration = 0.8 * self._expected_duration + 0.2 * elapsed
+        return response
+
+    def _collect_chunks(self, response: Dict[str, Any]):
+        """
+        Append every remaining chunk's rows to result.data_array. If a chunk cannot be
+        read, the whole response takes its FAILED status: partial rows would pass for all of them.
+        """
+        result = response.setdefault("result", {})
+        rows = result.setdefault("data_array", [])
+        next_index = result.get("next_chunk_index")
+        while next_index is not None:
+            chunk = self.get_chunk(response["statement_id"], next_index)
+            if chunk.get("status", {}).get("state", "SUCCEEDED") != "SUCCEEDED":
+                response["status"] = chunk["status"]
+                del response["result"]
+                return
+            rows.extend(chunk.get("data_array", []))
+            next_index = chunk.get("next_chunk_index")
+        result.pop("next_chunk_index", None)
+        result.pop("next_chunk_internal_link", None)
+        result["row_count"] = len(rows)
+
+    def get_chunk(self, statement_id: str, chunk_index: int) -> Dict[str, Any]:
+        """Fetch one result chunk of a finished statement"""
+        return self._request("GET", f"{STATEMENTS_PATH}/{statement_id}/result/chunks/{chunk_index}")
+
+    def cancel(self, statement_id: str):
+        """Ask the warehouse to stop a running statement (best effort: failures are ignored)"""
+        self._request("POST", f"{STATEMENTS_PATH}/{statement_id}/cancel", json={})
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        # API and network errors come back in the same FAILED shape as a failed statement
+        try:
+            response = self.session.request(method, self.host + path, timeout=self.request_timeout, **kwargs)
+        except requests.RequestException as e:
+            return _failed("TIMEOUT" if isinstance(e, requests.Timeout) else "NETWORK_ERROR", f"{method} {path}: {e}")
+        if response.ok:
+            return response.json() if response.content else {}
+
+        try:
+            error = response.json()
+        except ValueError:
+            error = {"message": response.text}
+        return _failed(error.get("error_code", f"HTTP_{response.status_code}"), error.get("message", response.reason))
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+
+def main():
+    """CLI demo - runs against DATABRICKS_* settings, or a local stub warehouse with --stub"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Databricks SQL client demo")
+    parser.add_argument("--stub", action="store_true", help="start a local stub warehouse and use it")
+    parser.add_argument("sql", nargs="?", default="SELECT sku, description, quantity_available FROM inventory LIMIT 5")
+    args = parser.parse_args()
+
+    print("🧱 Databricks SQL Client Demo")
+    print("=" * 50)
+
+    if args.stub:
+        try:
+            from stub_warehouse import StubWarehouse
+        except ImportError:
+            from scripts.stub_warehouse import StubWarehouse
+        warehouse = StubWarehouse(latency=0.3, chunk_rows=2)
+        server = warehouse.serve()
+        host, port = server.server_address
+        client = DatabricksClient(f"http://{host}:{port}", warehouse.token, warehouse.warehouse_id)
+    else:
+        client = DatabricksClient()
+
+    started = time.perf_counter()
+    result = client.execute_statement(args.sql)
+    elapsed = time.perf_counter() - started
+
+    state = result.get("status", {}).get("state")
+    print(f"\n📊 {state} in {elapsed * 1000:.0f} ms")
+    if state == "SUCCEEDED":
+        for row in result["result"]["data_array"]:
+            print(f"   {row}")
+    else:
+        print(f"   {result.get('status', {}).get('error', {}).get('message')}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Micro-batching DataLoader
+Single-key lookups from concurrent threads that arrive within a short window
+are coalesced into one batched query, and the results fanned back out
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, List, Callable, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class DataLoader:
+    """
+    load(key) blocks until the key's batch has run. The first key of a window makes
+    its caller the leader: it waits `window` seconds for others to join, then calls
+    batch_fn once with every distinct key collected. A full batch (max_batch keys)
+    is sent at once by whichever caller filled it, so no background thread is needed.
+
+    batch_fn(keys) returns {key: value}; keys it leaves out resolve to None.
+    Results are remembered for cache_ttl seconds (0 disables the cache).
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Dict[Hashable, Any]], window: float = 0.002,
+                 max_batch: int = 256, cache_ttl: float = 1.0, max_cached: int = 10_000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self.cache_ttl = cache_ttl
+        self.max_cached = max_cached
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Future] = {}
+        self._leader = False
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, expires_at)
+
+        self.loads = 0
+        self.cache_hits = 0
+        self.batches = 0
+        self.batched_keys = 0
+
+    def load(self, key: Hashable) -> Any:
+        """Value for key, batched with whatever other keys arrive in the same window"""
+        lead = False
+        batch = None
+        with self._lock:
+            self.loads += 1
+            value = self._cached(key)
+            if value is not _MISSING:
+                self.cache_hits += 1
+                return value
+
+            future = self._pending.get(key)
+            if future is None:
+                future = Future()
+                self._pending[key] = future
+                if len(self._pending) >= self.max_batch:
+                    batch = self._take()
+                elif not self._leader:
+                    self._leader = lead = True
+
+        if batch is not None:
+            self._run(batch)
+        elif lead:
+            if self.window > 0:
+                time.sleep(self.window)
+            with self._lock:
+                batch = self._take()
+            self._run(batch)
+        return future.result()
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """Values for several keys from one thread, in batches of at most max_batch keys"""
+        keys = list(keys)
+        found: Dict[Hashable, Any] = {}
+        with self._lock:
+            self.loads += len(keys)
+            for key in keys:
+                value = self._cached(key)
+                if value is not _MISSING:
+                    self.cache_hits += 1
+                    found[key] = value
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        for start in range(0, len(missing), self.max_batch):
+            batch = {key: Future() for key in missing[start:start + self.max_batch]}
+            self._run(batch)
+            found.update((key, future.result()) for key, future in batch.items())
+        return [found[key] for key in keys]
+
+    def prime(self, key: Hashable, value: Any):
+        """Seed the cache with a value loaded some other way"""
+        with self._lock:
+            self._store(key, value)
+
+    def clear(self, key: Optional[Hashable] = None):
+        """Forget one cached key, or all of them"""
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "cache_hits": self.cache_hits,
+            "batches": self.batches,
+            "batched_keys": self.batched_keys,
+            "keys_per_batch": self.batched_keys / self.batches if self.batches else 0.0,
+        }
+
+    # -- internals (call with the lock held unless noted) ------------------------
+
+    def _take(self) -> Dict[Hashable, Future]:
+        batch = self._pending
+        self._pending = {}
+        self._leader = False
+        return batch
+
+    def _cached(self, key: Hashable) -> Any:
+        entry = self._cache.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[1] <= self._clock():
+            del self._cache[key]
+            return _MISSING
+        return entry[0]
+
+    def _store(self, key: Hashable, value: Any):
+        if self.cache_ttl <= 0:
+            return
+        self._cache[key] = (value, self._clock() + self.cache_ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _run(self, batch: Dict[Hashable, Future]):
+        """Resolve every future in batch with one batch_fn call (lock not held)"""
+        if not batch:
+            return
+        try:
+            results = self.batch_fn(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.batched_keys += len(batch)
+            for key in batch:
+                self._store(key, results.get(key))
+        for key, future in batch.items():
+            future.set_result(results.get(key))
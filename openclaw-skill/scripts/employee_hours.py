@@ -11,36 +11,125 @@ import os
 try:
     from mock_data import MOCK_EMPLOYEES
     from mock_databricks import MockDatabricksClient
+    from entity_store import EntityStore
+    from timesheet_store import TimesheetStore, from_employees, parse_date_range
+    from synthetic_data import REFERENCE_DATE
 except ImportError:
     from scripts.mock_data import MOCK_EMPLOYEES
     from scripts.mock_databricks import MockDatabricksClient
-from typing import Dict, Any, Optional
+    from scripts.entity_store import EntityStore
+    from scripts.timesheet_store import TimesheetStore, from_employees, parse_date_range
+    from scripts.synthetic_data import REFERENCE_DATE
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+
+# Filterable with bitmaps in get_department_roster
+_ROSTER_FIELDS = ("department", "shift", "status")
+
+
+@lru_cache(maxsize=None)
+def default_store() -> EntityStore:
+    """Employee index over mock_data, built on first use and shared by every EmployeeHours instance"""
+    return EntityStore(MOCK_EMPLOYEES, id_field="employee_id", categories=_ROSTER_FIELDS)
+
+
+@lru_cache(maxsize=None)
+def default_timesheets() -> TimesheetStore:
+    """Daily hours matching mock_data's weekly totals, built on first use"""
+    return from_employees(MOCK_EMPLOYEES, REFERENCE_DATE)
+
+
+def __getattr__(name: str):
+    # EMPLOYEE_STORE used to be built at import time
+    if name == "EMPLOYEE_STORE":
+        return default_store()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class EmployeeHours:
     """Query employee data"""
     
-    def __init__(self, client=None):
-        self.client = client or MockDatabricksClient()
+    def __init__(self, client=None, employees: Optional[EntityStore] = None,
+                 dataset: Optional[Dict[str, List[Dict]]] = None,
+                 timesheets: Optional[TimesheetStore] = None, today: Optional[date] = None):
+        self._client = client
+        self._dataset = dataset
+        self._timesheets = timesheets
+        # Date ranges ("this week", "last month") are relative to this day; the mock
+        # data and demos pass synthetic_data.REFERENCE_DATE
+        self.today = today if today is not None else date.today()
         self.table = os.getenv('EMPLOYEES_TABLE', 'employees')
+        if dataset is not None and employees is None:
+            # Tables from synthetic_data.generate_dataset / load_dataset
+            employees = EntityStore(dataset["employees"], id_field="employee_id", categories=_ROSTER_FIELDS)
+        self.employees = employees if employees is not None else default_store()
+        # Side effect on a caller's store: the roster fields become its categories too
+        # (select()/set_category() on it accept them from here on; records are untouched)
+        self.employees.add_categories(_ROSTER_FIELDS)
+    
+    @property
+    def client(self):
+        """Warehouse client, created on first use (lookups are answered from the index)"""
+        if self._client is None:
+            self._client = MockDatabricksClient(self._dataset)
+        return self._client
+    
+    @property
+    def timesheets(self) -> TimesheetStore:
+        """Daily hours per employee; by default derived from the weekly totals in the employees table"""
+        if self._timesheets is None:
+            if self.employees is default_store() and self.today == REFERENCE_DATE:
+                self._timesheets = default_timesheets()
+            else:
+                self._timesheets = from_employees(list(self.employees), self.today)
+        return self._timesheets
+    
+    def _date_range(self, date_range: str) -> Tuple[date, date]:
+        """
+        Inclusive (start, end) of a date range, clipped to the days the timesheets cover.
+        ValueError (with a message to answer with) if it is unrecognised or outside them.
+        """
+        start, end = parse_date_range(date_range, self.today)
+        timesheets = self.timesheets
+        if timesheets.end is None or end < timesheets.start or start > timesheets.end:
+            raise ValueError(f"No timesheet data for {date_range}")
+        return max(start, timesheets.start), min(end, timesheets.end)
     
     def get_employee_hours(self, employee_id: str, date_range: str = "this week") -> Dict[str, Any]:
         """Get hours for a specific employee"""
         
-        # Search mock data
-        for emp in MOCK_EMPLOYEES:
-            if emp["employee_id"].upper() == employee_id.upper() or \
-               emp["name"].lower().startswith(employee_id.lower()):
-                return {
-                    "found": True,
-                    "employee_id": emp["employee_id"],
-                    "name": emp["name"],
-                    "department": emp["department"],
-                    "shift": emp["shift"],
-                    "hours_this_week": emp["hours_this_week"],
-                    "hours_last_week": emp["hours_last_week"],
-                    "status": emp["status"],
-                    "date_range": date_range
-                }
+        # Exact ID first, then name prefix (e.g. "John"), then a misheard name (e.g. "Jon Smyth")
+        emp = self.employees.get(employee_id)
+        fuzzy_match = False
+        if emp is None:
+            matches = self.employees.prefix_positions(employee_id)
+            emp = self.employees.records[matches[0]] if matches else None
+        if emp is None:
+            matches = self.employees.fuzzy(employee_id, limit=1)
+            emp = matches[0][0] if matches else None
+            fuzzy_match = emp is not None  # A guess: the answer should say who it picked
+        
+        if emp:
+            try:
+                start, end = self._date_range(date_range)
+            except ValueError as e:
+                return {"found": False, "message": str(e), "employee_id": employee_id}
+            return {
+                "found": True,
+                "employee_id": emp["employee_id"],
+                "name": emp["name"],
+                "department": emp["department"],
+                "shift": emp["shift"],
+                "hours_this_week": emp["hours_this_week"],
+                "hours_last_week": emp["hours_last_week"],
+                "status": emp["status"],
+                "date_range": date_range,
+                "start_date": start.isoformat(),
+                "end_date": end.isoformat(),
+                "hours": self.timesheets.hours(emp["employee_id"], start, end),
+                "fuzzy_match": fuzzy_match
+            }
         
         return {
             "found": False,
@@ -48,31 +137,65 @@ class EmployeeHours:
             "employee_id": employee_id
         }
     
-    def get_department_roster(self, department: str, shift: Optional[str] = None) -> Dict[str, Any]:
-        """Get employees in a department"""
-        
-        employees = [e for e in MOCK_EMPLOYEES 
-                    if e["department"].lower() == department.lower()]
+    def get_department_hours(self, date_range: str = "this week") -> Dict[str, Any]:
+        """Hours per department over a date range, from the timesheet rollups"""
+        try:
+            start, end = self._date_range(date_range)
+        except ValueError as e:
+            return {"found": False, "message": str(e), "date_range": date_range}
+        by_department = self.timesheets.department_rollup(start, end)
+        return {
+            "found": bool(by_department),
+            "date_range": date_range,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "departments": by_department,
+            "total": sum(by_department.values())
+        }
+    
+    def get_overtime(self, date_range: str = "last week") -> Dict[str, Any]:
+        """Employees over the weekly hour limit in the week a date range starts in"""
+        try:
+            start, _ = self._date_range(date_range)
+        except ValueError as e:
+            return {"found": False, "message": str(e), "date_range": date_range}
+        over = self.timesheets.overtime(start)
+        employees = [{**self.employees.get(employee_id), "hours": hours}
+                     for employee_id, hours in sorted(over.items(), key=lambda item: -item[1])
+                     if self.employees.get(employee_id)]
+        return {
+            "found": len(employees) > 0,
+            "date_range": date_range,
+            "limit": self.timesheets.weekly_limit,
+            "count": len(employees),
+            "employees": employees
+        }
+    
+    def get_department_roster(self, department: str, shift: Optional[str] = None,
+                              status: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get employees in a department, optionally on one shift or with one status.
+        "employees" is a lazy Selection: the count is a popcount and records are only
+        read when iterated or sliced (list() it before serializing)
+        """
         
-        if shift:
-            employees = [e for e in employees if e["shift"].lower() == shift.lower()]
+        # AND of the bitmaps; no record is read here
+        employees = self.employees.select(department=department, shift=shift, status=status)
+        count = len(employees)
         
         return {
-            "found": len(employees) > 0,
+            "found": count > 0,
             "department": department,
             "shift": shift,
-            "count": len(employees),
+            "status": status,
+            "count": count,
             "employees": employees
         }
     
     def search_employees(self, query: str) -> Dict[str, Any]:
         """Search employees by name or ID"""
         
-        matches = []
-        for emp in MOCK_EMPLOYEES:
-            if (query.lower() in emp["name"].lower() or 
-                query.lower() in emp["employee_id"].lower()):
-                matches.append(emp)
+        matches = self.employees.search(query, include_id=True)
         
         return {
             "found": len(matches) > 0,
@@ -81,52 +204,66 @@ class EmployeeHours:
             "employees": matches
         }
     
-    def format_hours_response(self, data: Dict[str, Any]) -> str:
-        """Format as natural language"""
+    def iter_hours_response(self, data: Dict[str, Any]) -> Iterator[str]:
+        """Hours as natural language, one sentence at a time so speech can start early"""
         if not data.get("found"):
-            return data.get("message", f"Sorry, I couldn't find that employee")
+            yield data.get("message", f"Sorry, I couldn't find that employee")
+            return
         
         name = data.get("name")
         hours = data.get("hours_this_week", 0)
         department = data.get("department")
-        status = data.get("status")
         
-        response = f"{name} from {department}. "
-        response += f"{hours} hours logged this week. "
+        if data.get("fuzzy_match"):
+            yield f"I think you mean {name}. "
+        
+        # Name and headline number first
+        date_range = data.get("date_range", "this week")
+        this_week = date_range == "this week" or data.get("hours") is None
+        if this_week:
+            yield f"{name} from {department}. {hours} hours logged this week. "
+        else:
+            yield f"{name} from {department}. {data['hours']:g} hours logged {date_range}. "
         
+        status = data.get("status")
         if status != "Active":
-            response += f"Status: {status}. "
+            yield f"Status: {status}. "
         
-        # Compare to last week
+        # Compare this week to last week
         last_week = data.get("hours_last_week", 0)
-        if last_week > 0:
+        if this_week and last_week > 0:
             diff = hours - last_week
             if abs(diff) > 5:
                 direction = "up" if diff > 0 else "down"
-                response += f"That's {abs(diff):.1f} hours {direction} from last week. "
-        
-        return response
+                yield f"That's {abs(diff):.1f} hours {direction} from last week. "
     
-    def format_roster_response(self, data: Dict[str, Any]) -> str:
-        """Format department roster"""
+    def format_hours_response(self, data: Dict[str, Any]) -> str:
+        """Format as natural language"""
+        return "".join(self.iter_hours_response(data))
+    
+    def iter_roster_response(self, data: Dict[str, Any]) -> Iterator[str]:
+        """Department roster as natural language: the headcount first, then the names"""
         if not data.get("found"):
-            return f"No employees found in {data.get('department')}"
+            yield f"No employees found in {data.get('department')}"
+            return
         
         dept = data.get("department")
         shift = data.get("shift")
         count = data.get("count", 0)
-        employees = data.get("employees", [])
         
         shift_text = f" {shift} shift" if shift else ""
-        response = f"{count} employees in{shift_text} {dept}: "
+        status_text = f" {data['status'].lower()}" if data.get("status") else ""
+        yield f"{count}{status_text} employees in{shift_text} {dept}: "
         
-        names = [e["name"].split()[0] for e in employees[:5]]
-        response += ", ".join(names)
+        employees = data.get("employees", [])
+        yield ", ".join(e["name"].split()[0] for e in employees[:5])
         
         if count > 5:
-            response += f", and {count - 5} more"
-        
-        return response
+            yield f", and {count - 5} more"
+    
+    def format_roster_response(self, data: Dict[str, Any]) -> str:
+        """Format department roster"""
+        return "".join(self.iter_roster_response(data))
 
 
 def main():
@@ -134,7 +271,7 @@ def main():
     print("👤 Employee Hours Demo")
     print("=" * 50)
     
-    eh = EmployeeHours()
+    eh = EmployeeHours(today=REFERENCE_DATE)
     
     # Test 1: Get employee hours
     print("\n1. Get hours for John...")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Indexed In-Memory Entity Store
+Hash, name-prefix and substring indexes over the mock tables, built once at load time,
+plus a phonetic index for misheard names and bitmaps over categorical fields, built on first use
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+try:
+    from phonetic_index import PhoneticIndex
+    from bitmap_index import BitmapIndex, Selection
+except ImportError:
+    from scripts.phonetic_index import PhoneticIndex
+    from scripts.bitmap_index import BitmapIndex, Selection
+
+# Separates indexed values in the substring blob; never appears in a query
+_SEP = "\x00"
+# Sorts after any character, so prefix + _MAX_CHAR bounds a prefix range
+_MAX_CHAR = "\U0010ffff"
+
+
+class _SubstringIndex:
+    """Case-folded values joined into one string so substring search runs in C"""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._blob = ""
+        self._offsets: List[int] = []
+        self._length = 0
+
+    def append(self, value: str):
+        self._offsets.append(self._length)
+        self._parts.append(value + _SEP)
+        self._length += len(value) + 1
+        self._blob = None  # Rejoined lazily on the next search
+
+    def search(self, query: str) -> List[int]:
+        """Return positions of every value containing query, in insertion order"""
+        if self._blob is None:
+            self._blob = "".join(self._parts)
+        if not query or _SEP in query:
+            return []
+
+        blob, offsets = self._blob, self._offsets
+        matches = []
+        pos = blob.find(query)
+        while pos != -1:
+            position = bisect_right(offsets, pos) - 1
+            matches.append(position)
+            # Skip to the next value so each record is reported once
+            if position + 1 >= len(offsets):
+                break
+            pos = blob.find(query, offsets[position + 1])
+        return matches
+
+
+class EntityStore:
+    """
+    Records indexed by id (hash), case-folded name (sorted prefix) and substring.
+    Fields listed in categories (e.g. department, shift) can be filtered with select().
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], id_field: str, name_field: str = "name",
+                 categories: Iterable[str] = ()):
+        self.id_field = id_field
+        self.name_field = name_field
+        self.categories = tuple(categories)
+        self.records: List[Dict[str, Any]] = []
+
+        self._by_id: Dict[str, int] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._sorted_names: List[str] = []
+        self._sorted_positions: List[int] = []
+        self._name_text = _SubstringIndex()
+        self._id_text = _SubstringIndex()
+        self._phonetic: Optional[PhoneticIndex] = None
+        self._bitmaps: Optional[BitmapIndex] = None
+
+        # Bulk load: hash and text indexes per record, then one sort for prefixes
+        pairs = []
+        for record in records:
+            position = self._index(record)
+            pairs.append((self._sorted_key(record), position))
+        pairs.sort()
+        self._sorted_names = [name for name, _ in pairs]
+        self._sorted_positions = [position for _, position in pairs]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def _sorted_key(self, record: Dict[str, Any]) -> str:
+        return str(record[self.name_field]).casefold()
+
+    def _index(self, record: Dict[str, Any]) -> int:
+        position = len(self.records)
+        self.records.append(record)
+
+        record_id = str(record[self.id_field]).casefold()
+        name = self._sorted_key(record)
+
+        self._by_id.setdefault(record_id, position)
+        self._by_name.setdefault(name, []).append(position)
+        self._name_text.append(name)
+        self._id_text.append(record_id)
+        return position
+
+    def add(self, record: Dict[str, Any]) -> int:
+        """Index a new record and return its position"""
+        position = self._index(record)
+
+        # Keep names sorted, ties in insertion order, so prefix ranges are contiguous
+        name = self._sorted_key(record)
+        index = bisect_right(self._sorted_names, name)
+        self._sorted_names.insert(index, name)
+        self._sorted_positions.insert(index, position)
+
+        if self._phonetic is not None:
+            self._phonetic.add(position, str(record[self.name_field]))
+        if self._bitmaps is not None:
+            self._bitmaps.add(record)
+        return position
+
+    def add_categories(self, fields: Iterable[str]):
+        """Make more fields filterable with select(); the bitmaps are rebuilt on next use"""
+        new = tuple(field for field in fields if field not in self.categories)
+        if new:
+            self.categories += new
+            self._bitmaps = None
+
+    @property
+    def bitmaps(self) -> BitmapIndex:
+        """Bitmap index over the category fields, built on first use"""
+        if self._bitmaps is None:
+            self._bitmaps = BitmapIndex(self.categories, self.records)
+        return self._bitmaps
+
+    def select(self, **filters: Any) -> Selection:
+        """Records matching every category=value filter (case-insensitive; None matches all)"""
+        return Selection(self.records, self.bitmaps.select(**filters))
+
+    def set_category(self, record_id: str, field: str, value: Any) -> bool:
+        """Change a category field (e.g. status) on a record, keeping the bitmaps in step"""
+        if field not in self.categories:
+            raise ValueError(f"{field} is not a category field (have {', '.join(self.categories)})")
+        position = self._by_id.get(record_id.casefold())
+        if position is None:
+            return False
+        self.records[position][field] = value
+        if self._bitmaps is not None:
+            self._bitmaps.update(position, field, value)
+        return True
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Exact, case-insensitive id lookup - O(1)"""
+        position = self._by_id.get(record_id.casefold())
+        return None if position is None else self.records[position]
+
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Exact, case-insensitive name lookup - O(1)"""
+        positions = self._by_name.get(name.casefold())
+        return self.records[positions[0]] if positions else None
+
+    def prefix_positions(self, prefix: str) -> List[int]:
+        """Positions of records whose name starts with prefix - O(log n + k)"""
+        prefix = prefix.casefold()
+        start = bisect_left(self._sorted_names, prefix)
+        end = bisect_left(self._sorted_names, prefix + _MAX_CHAR, start)
+        return sorted(self._sorted_positions[start:end])
+
+    def find_prefix(self, prefix: str) -> List[Dict[str, Any]]:
+        """Records whose name starts with prefix, in load order"""
+        return [self.records[p] for p in self.prefix_positions(prefix)]
+
+    def search(self, query: str, include_id: bool = False) -> List[Dict[str, Any]]:
+        """Records whose name (and optionally id) contains query, in load order"""
+        query = query.casefold()
+        positions = self._name_text.search(query)
+        if include_id:
+            positions = sorted(set(positions).union(self._id_text.search(query)))
+        return [self.records[p] for p in positions]
+
+    def fuzzy(self, text: str, limit: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """Records whose name sounds or is spelled like text, as (record, score), best first"""
+        if self._phonetic is None:
+            index = PhoneticIndex()
+            for position, record in enumerate(self.records):
+                index.add(position, str(record[self.name_field]))
+            self._phonetic = index
+        return [(self.records[p], score) for p, score in self._phonetic.search(text, limit)]
+
+    def lookup(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Best single match for spoken or typed text.
+        Tries exact id, exact name, name prefix, name substring, then how the name sounds.
+        """
+        return self.resolve(text)[0]
+
+    def resolve(self, text: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """lookup, plus whether the record was only found by how its name sounds (a guess)"""
+        record = self.get(text) or self.get_by_name(text)
+        if record:
+            return record, False
+
+        positions = self.prefix_positions(text)
+        if positions:
+            return self.records[positions[0]], False
+
+        positions = self._name_text.search(text.casefold())
+        if positions:
+            return self.records[positions[0]], False
+
+        matches = self.fuzzy(text, limit=1)
+        return (matches[0][0], True) if matches else (None, False)
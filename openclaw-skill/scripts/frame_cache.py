@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Perceptual-Hash Frame Cache
+Fingerprints camera frames with a difference hash (dHash) over a tiny grayscale
+thumbnail, so near-identical frames from the glasses reuse the previous frame's
+barcode decode and lookup instead of repeating them
+"""
+
+import io
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+_pillow = None  # Imported on first encoded frame; False once known to be missing
+
+Grid = Sequence[Sequence[float]]  # Grayscale pixel rows, 0-255
+
+# Neighbouring thumbnail pixels closer than this count as equal. Without it, flat areas
+# (a white label, a wall) hash to sensor noise and identical views differ by many bits.
+_FLAT = 2.0
+
+
+def pillow_or_none():
+    """PIL.Image if Pillow is installed, else None"""
+    global _pillow
+    if _pillow is None:
+        try:
+            from PIL import Image
+            _pillow = Image
+        except ImportError:  # Optional - raw grayscale grids are hashed without it
+            _pillow = False
+    return _pillow or None
+
+
+def _shrink(pixels: Grid, width: int, height: int) -> List[List[float]]:
+    """Box-average a grayscale grid down to width x height"""
+    rows, cols = len(pixels), len(pixels[0])
+    y_edges = [y * rows // height for y in range(height + 1)]
+    x_edges = [x * cols // width for x in range(width + 1)]
+    thumbnail = []
+    for y in range(height):
+        band = pixels[y_edges[y]:max(y_edges[y + 1], y_edges[y] + 1)]
+        row = []
+        for x in range(width):
+            x0, x1 = x_edges[x], max(x_edges[x + 1], x_edges[x] + 1)
+            total = sum(sum(line[x0:x1]) for line in band)
+            row.append(total / (len(band) * (x1 - x0)))
+        thumbnail.append(row)
+    return thumbnail
+
+
+def _thumbnail(frame: Any, width: int, height: int) -> List[List[float]]:
+    """width x height grayscale thumbnail of a frame: a grid, an image path, JPEG/PNG bytes or a PIL image"""
+    if isinstance(frame, (list, tuple)):
+        return _shrink(frame, width, height)
+
+    Image = pillow_or_none()
+    if Image is None:
+        raise RuntimeError("Pillow is not installed; pass frames as grayscale pixel rows")
+    if isinstance(frame, (bytes, bytearray)):
+        frame = Image.open(io.BytesIO(frame))
+    elif isinstance(frame, (str, os.PathLike)):
+        frame = Image.open(frame)
+    # For JPEGs, draft() lets the decoder downscale by up to 8x while decoding
+    frame.draft("L", (width * 8, height * 8))
+    small = frame.convert("L").resize((width, height), getattr(Image, "BOX", 4))
+    data = list(small.getdata())
+    return [data[y * width:(y + 1) * width] for y in range(height)]
+
+
+def signature(frame: Any, size: int = 8) -> Tuple[int, float]:
+    """(dhash, mean brightness 0-255) of a frame, from one thumbnail"""
+    thumbnail = _thumbnail(frame, size + 1, size)
+    fingerprint = 0
+    for row in thumbnail:
+        for left, right in zip(row, row[1:]):
+            fingerprint = (fingerprint << 1) | (left - right > _FLAT)
+    return fingerprint, sum(map(sum, thumbnail)) / (size * (size + 1))
+
+
+def dhash(frame: Any, size: int = 8) -> int:
+    """
+    size*size-bit difference hash: shrink to (size+1) x size grayscale and set a bit
+    wherever a pixel is clearly brighter than its right-hand neighbour. Small shifts, noise and
+    exposure changes flip few bits; a different scene flips about half of them.
+    """
+    return signature(frame, size)[0]
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return (a ^ b).bit_count()
+
+
+class FrameCache:
+    """
+    Results for the last few distinct frames, keyed by fingerprint.
+    A new frame within `threshold` bits and `max_brightness_shift` mean brightness of a
+    remembered one reuses its result; entries expire after `ttl` seconds so a restocked
+    shelf is looked up again. Frames with fewer than `min_bits` bits set (or clear) have
+    too little texture to tell apart - a wall, a blank label, a dark frame all hash alike -
+    so they are always computed and never remembered.
+    """
+
+    def __init__(self, max_frames: int = 16, threshold: int = 4, ttl: float = 10.0,
+                 hash_size: int = 8, min_bits: int = 4, max_brightness_shift: float = 16.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_frames = max_frames
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hash_size = hash_size
+        self.min_bits = min_bits
+        self.max_brightness_shift = max_brightness_shift
+        self._clock = clock
+        # fingerprint -> (result, expires_at, mean brightness)
+        self._frames: "OrderedDict[int, Tuple[Any, float, Optional[float]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0  # Misses on frames too featureless to cache
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def fingerprint(self, frame: Any) -> int:
+        return dhash(frame, self.hash_size)
+
+    def cacheable(self, fingerprint: int) -> bool:
+        """Whether a fingerprint has enough texture (bits set and clear) to identify a view"""
+        bits = fingerprint.bit_count()
+        return self.min_bits <= bits <= self.hash_size * self.hash_size - self.min_bits
+
+    def match(self, fingerprint: int, brightness: Optional[float] = None) -> Optional[Tuple[int, Any]]:
+        """(distance, result) of the closest live frame within threshold (and brightness), else None"""
+        now = self._clock()
+        best = None
+        for seen, (result, expires_at, seen_brightness) in list(self._frames.items()):
+            if expires_at <= now:
+                del self._frames[seen]
+                continue
+            if (brightness is not None and seen_brightness is not None
+                    and abs(brightness - seen_brightness) > self.max_brightness_shift):
+                continue
+            distance = hamming(fingerprint, seen)
+            if distance <= self.threshold and (best is None or distance < best[0]):
+                best = (distance, seen, result)
+        if best is None:
+            return None
+        self._frames.move_to_end(best[1])
+        return best[0], best[2]
+
+    def put(self, fingerprint: int, result: Any, brightness: Optional[float] = None):
+        self._frames[fingerprint] = (result, self._clock() + self.ttl, brightness)
+        self._frames.move_to_end(fingerprint)
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+
+    def lookup(self, frame: Any, compute: Callable[[Any], Any]) -> Any:
+        """compute(frame) - decode and query - unless a near-identical frame was just seen"""
+        fingerprint, brightness = signature(frame, self.hash_size)
+        if not self.cacheable(fingerprint):
+            self.misses += 1
+            self.uncacheable += 1
+            return compute(frame)
+        cached = self.match(fingerprint, brightness)
+        if cached is not None:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        result = compute(frame)
+        self.put(fingerprint, result, brightness)
+        return result
+
+    def clear(self):
+        self._frames.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "frames": len(self._frames),
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def synthetic_frame(seed: int, width: int = 160, height: int = 120, noise: int = 6,
+                    shift: int = 0, take: int = 0) -> List[List[int]]:
+    """Grayscale test frame: a scene chosen by seed, shifted sideways, with sensor noise that varies by take"""
+    import random
+    scene = random.Random(seed)
+    blobs = [(scene.randrange(width), scene.randrange(height), scene.randrange(10, 40), scene.randrange(256))
+             for _ in range(6)]
+    jitter = random.Random(f"{seed}/{shift}/{take}")
+    frame = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            value = 40 + (x + shift) * 160 // width  # Lit from one side
+            for bx, by, radius, shade in blobs:
+                if (x + shift - bx) ** 2 + (y - by) ** 2 < radius * radius:
+                    value = shade
+            row.append(min(255, max(0, value + jitter.randint(-noise, noise))))
+        frame.append(row)
+    return frame
+
+
+def main():
+    """Demo: a steady gaze at one item, a glance at another, then two blank walls"""
+    print("📷 Frame Cache Demo")
+    print("=" * 50)
+
+    lookups = []
+
+    def decode_and_lookup(frame):
+        # The result names the frame it came from, so a wrong reuse would show
+        lookups.append(frame)
+        return {"barcode": "123456789012", "frame": next(i for i, f in enumerate(frames, 1) if f is frame)}
+
+    cache = FrameCache()
+    frames = [synthetic_frame(1, shift=s, take=i) for i, s in enumerate((0, 0, 1, 2, 1))] + [synthetic_frame(2)]
+    frames += [[[shade] * 160 for _ in range(120)] for shade in (200, 100)]  # Hash alike, but not cached
+    first = cache.fingerprint(frames[0])
+    for i, frame in enumerate(frames, 1):
+        before, flat = cache.misses, cache.uncacheable
+        result = cache.lookup(frame, decode_and_lookup)
+        source = "decoded + queried" if cache.misses > before else "reused"
+        if cache.uncacheable > flat:
+            source += ", too featureless to cache"
+        distance = hamming(first, cache.fingerprint(frame))
+        print(f"   Frame {i}: {distance:2d} bits from frame 1 -> {source} (result of frame {result['frame']})")
+
+    stats = cache.stats()
+    print(f"\n   {stats['hits']} of {stats['hits'] + stats['misses']} frames served from cache, "
+          f"{len(lookups)} decode + query runs")
+
+if __name__ == "__main__":
+    main()
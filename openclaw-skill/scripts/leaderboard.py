@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Customer Revenue Leaderboard
+Sorted index on ytd_revenue, updated in place as revenue changes
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+# (-ytd_revenue, load order, customer_id): ascending order is the leaderboard,
+# and ties keep load order just like a stable sort would
+_Key = Tuple[float, int, str]
+
+
+class RevenueLeaderboard:
+    """Answers top-N and rank queries without re-sorting the customer table"""
+
+    def __init__(self, customers: Iterable[Dict[str, Any]] = ()):
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, _Key] = {}
+        self._sorted: List[_Key] = []
+        self._sequence = 0
+
+        for customer in customers:
+            self._add(customer)
+        self._sorted.sort()
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def _add(self, customer: Dict[str, Any]) -> _Key:
+        customer_id = customer["customer_id"]
+        key = (-customer["ytd_revenue"], self._sequence, customer_id)
+        self._sequence += 1
+        self._records[customer_id] = customer
+        self._keys[customer_id] = key
+        self._sorted.append(key)
+        return key
+
+    def add(self, customer: Dict[str, Any]):
+        """Place a new customer on the leaderboard - O(log n) search + shift"""
+        key = self._add(customer)
+        self._sorted.pop()
+        insort(self._sorted, key)
+
+    def update_revenue(self, customer_id: str, ytd_revenue: float):
+        """Record a customer's new revenue and move them to their new rank"""
+        old_key = self._keys[customer_id]
+        del self._sorted[bisect_left(self._sorted, old_key)]
+
+        key = (-ytd_revenue, old_key[1], customer_id)
+        self._keys[customer_id] = key
+        insort(self._sorted, key)
+        self._records[customer_id]["ytd_revenue"] = ytd_revenue
+
+    def top(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Highest-revenue customers - O(limit)"""
+        return [self._records[key[2]] for key in self._sorted[:limit]]
+
+    def rank(self, customer_id: str) -> Optional[int]:
+        """1-based revenue rank of a customer - O(log n)"""
+        key = self._keys.get(customer_id)
+        if key is None:
+            return None
+        return bisect_left(self._sorted, key) + 1
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Tool Metrics and Tracing
+Latency histograms, row counts and cache outcomes per tool, plus nested spans per
+request, exported in Prometheus text format. Nothing is wrapped unless a Metrics
+instance is installed, so a process without one pays nothing.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Mapping, Sized
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+# Upper bounds in seconds: 10 µs index hits up to multi-second warehouse queries
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                   0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Shared no-op stand-in for a span when metrics are off
+NO_SPAN = nullcontext()
+
+_current: ContextVar[Optional["Span"]] = ContextVar("openclaw_span", default=None)
+_clock = time.perf_counter
+
+
+class Histogram:
+    """Counts per bucket (not cumulative until exported), with the sum and count of observations"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, observations <= le) pairs as Prometheus expects, ending with +Inf"""
+        pairs, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (0 if empty)"""
+        if not self.count:
+            return 0.0
+        rank, running = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= rank:
+                return bound
+        return float("inf")
+
+
+class Span:
+    """One timed step of a request, and the context manager timing it; children are the steps it called"""
+    __slots__ = ("kind", "name", "tool", "start", "duration", "rows", "error", "children", "_metrics", "_token")
+
+    def __init__(self, metrics: "Metrics", kind: str, name: str):
+        self._metrics = metrics
+        self.kind = kind
+        self.name = name
+        self.tool = name if kind == "tool" else ""
+        self.duration = 0.0
+        self.rows: Optional[int] = None
+        self.error = False
+        self.children: List["Span"] = []
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        if parent is not None:
+            parent.children.append(self)
+            if self.kind != "tool":
+                self.tool = parent.tool
+        self._token = _current.set(self)
+        self.start = _clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = _clock() - self.start
+        self.error = exc_type is not None
+        _current.reset(self._token)
+        self._metrics._finish(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        span = {"kind": self.kind, "name": self.name, "ms": round(self.duration * 1000, 3)}
+        if self.rows is not None:
+            span["rows"] = self.rows
+        if self.error:
+            span["error"] = True
+        if self.children:
+            span["children"] = [child.to_dict() for child in self.children]
+        return span
+
+    def lines(self, depth: int = 0) -> Iterable[str]:
+        """Indented tree, one span per line"""
+        rows = f", {self.rows} rows" if self.rows is not None else ""
+        yield f"{'  ' * depth}{self.name} ({self.kind}) {self.duration * 1000:.3f} ms{rows}"
+        for child in self.children:
+            yield from child.lines(depth + 1)
+
+
+# Values that are never a list of rows; checked by exact type before any ABC isinstance
+_SCALARS = frozenset({str, bytes, int, float, bool, type(None)})
+
+
+def _row_count(result: Any) -> Optional[int]:
+    """
+    Rows in a statement response (data_array), a list of records, or a tool result:
+    its count, its first list, or 1 / 0 for a single found / not-found answer
+    """
+    if type(result) in _SCALARS:
+        return None
+    if type(result) is not dict and not isinstance(result, Mapping):
+        return len(result) if isinstance(result, Sized) else None
+    inner = result.get("result")
+    if type(inner) is dict:  # Statement response or SkillTools response
+        if "data_array" in inner:
+            return len(inner["data_array"] or ())
+        result = inner
+    count = result.get("count")
+    if type(count) is int:
+        return count
+    for value in result.values():
+        if type(value) in _SCALARS or type(value) is dict:
+            continue
+        if type(value) is list or (hasattr(value, "__len__") and not isinstance(value, Mapping)):
+            return len(value)
+    if "found" in result:
+        return 1 if result["found"] else 0
+    return None
+
+
+def maybe_span(metrics: Optional["Metrics"], kind: str, name: str):
+    """metrics.span(kind, name), or NO_SPAN when metrics is None"""
+    return NO_SPAN if metrics is None else metrics.span(kind, name)
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """
+    Registry shared by every thread of a process. span() times a block; instrument()
+    wraps the public methods of an object (on that instance only) so each call is a span.
+    Finished root spans are kept as traces of the last `keep_traces` requests.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, keep_traces: int = 50):
+        self.buckets = tuple(buckets)
+        self.latency: Dict[Tuple[str, str], Histogram] = {}     # (kind, name) -> seconds
+        self.rows: Dict[Tuple[str, str], int] = {}              # (kind, name) -> rows returned
+        self.errors: Dict[Tuple[str, str], int] = {}            # (kind, name) -> calls that raised
+        self.cache: Dict[Tuple[str, str], int] = {}             # (tool, outcome) -> statements
+        self.traces: Deque[Span] = deque(maxlen=keep_traces)
+        self._lock = threading.Lock()
+
+    def span(self, kind: str, name: str) -> Span:
+        """Context manager timing one step; nests under the span already open in this context"""
+        return Span(self, kind, name)
+
+    def _finish(self, span: Span):
+        key = (span.kind, span.name)
+        with self._lock:
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(self.buckets)
+            histogram.observe(span.duration)
+            if span.rows is not None:
+                self.rows[key] = self.rows.get(key, 0) + span.rows
+            if span.error:
+                self.errors[key] = self.errors.get(key, 0) + 1
+            if _current.get() is None:
+                self.traces.append(span)
+
+    def cache_outcome(self, outcome: str):
+        """Count a cache hit / miss / bypass against the tool whose request is running"""
+        span = _current.get()
+        key = (span.tool if span is not None else "", outcome)
+        with self._lock:
+            self.cache[key] = self.cache.get(key, 0) + 1
+
+    def timed(self, kind: str, name: str, fn: Callable) -> Callable:
+        """fn wrapped so every call is a span of this kind and name, with the rows it returned"""
+        @wraps(fn)
+        def timed_call(*args, **kwargs):
+            with Span(self, kind, name) as span:
+                result = fn(*args, **kwargs)
+                span.rows = _row_count(result)
+                return result
+        return timed_call
+
+    def instrument(self, obj: Any, kind: str = "method", names: Optional[Iterable[str]] = None) -> Any:
+        """
+        Time every public method of obj (or just `names`) as "<Class>.<method>" spans.
+        Generator methods (iter_*) are left alone: they return before doing their work,
+        which the format_* methods that drain them already time.
+        """
+        if names is None:
+            import inspect  # Only needed once metrics are on; slow to import
+            names = [name for name, attr in inspect.getmembers(type(obj), inspect.isfunction)
+                     if not name.startswith("_") and not inspect.isgeneratorfunction(attr)]
+        for name in names:
+            if getattr(getattr(obj, name), "__wrapped__", None) is None:
+                setattr(obj, name, self.timed(kind, f"{type(obj).__name__}.{name}", getattr(obj, name)))
+        return obj
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """The latest finished requests as nested span dicts, newest first"""
+        with self._lock:
+            spans = list(self.traces)[-limit:]
+        return [span.to_dict() for span in reversed(spans)]
+
+    def to_prometheus(self, prefix: str = "openclaw") -> str:
+        """Every metric in the Prometheus text exposition format"""
+        with self._lock:
+            latency = {key: (h.cumulative(), h.sum, h.count) for key, h in sorted(self.latency.items())}
+            rows, errors, cache = sorted(self.rows.items()), sorted(self.errors.items()), sorted(self.cache.items())
+
+        lines = [f"# HELP {prefix}_latency_seconds Time spent per tool call, method and statement",
+                 f"# TYPE {prefix}_latency_seconds histogram"]
+        for (kind, name), (buckets, total, count) in latency.items():
+            labels = f'kind="{_label(kind)}",name="{_label(name)}"'
+            lines.extend(f'{prefix}_latency_seconds_bucket{{{labels},le="{le}"}} {n}' for le, n in buckets)
+            lines.append(f"{prefix}_latency_seconds_sum{{{labels}}} {total!r}")
+            lines.append(f"{prefix}_latency_seconds_count{{{labels}}} {count}")
+
+        lines += [f"# HELP {prefix}_rows_total Rows returned", f"# TYPE {prefix}_rows_total counter"]
+        lines.extend(f'{prefix}_rows_total{{kind="{_label(kind)}",name="{_label(name)}"}} {n}'
+                     for (kind, name), n in rows)
+        lines += [f"# HELP {prefix}_errors_total Calls that raised", f"# TYPE {prefix}_errors_total counter"]
+        lines.extend(f'{prefix}_errors_total{{kind="{_label(kind)}",name="{_label(name)}"}} {n}'
+                     for (kind, name), n in errors)
+        lines += [f"# HELP {prefix}_cache_requests_total Statements by query cache outcome",
+                  f"# TYPE {prefix}_cache_requests_total counter"]
+        lines.extend(f'{prefix}_cache_requests_total{{tool="{_label(tool)}",outcome="{_label(outcome)}"}} {n}'
+                     for (tool, outcome), n in cache)
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per (kind, name): calls, mean and approximate p50/p99 in ms, rows, errors"""
+        with self._lock:
+            return [{
+                "kind": kind, "name": name, "calls": h.count,
+                "mean_ms": h.sum / h.count * 1000 if h.count else 0.0,
+                "p50_ms": h.quantile(0.5) * 1000, "p99_ms": h.quantile(0.99) * 1000,
+                "rows": self.rows.get((kind, name)), "errors": self.errors.get((kind, name), 0),
+            } for (kind, name), h in sorted(self.latency.items())]
+
+
+def main():
+    """CLI demo: a few traced tool calls, then the exported metrics"""
+    try:
+        from skill_tools import SkillTools
+    except ImportError:
+        from scripts.skill_tools import SkillTools
+
+    print("📈 Tool Metrics Demo")
+    print("=" * 50)
+
+    metrics = Metrics()
+    tools = SkillTools(metrics=metrics)
+    for name, arguments in [("customer_summary", {"customer": "Acme"}), ("employee_hours", {"employee_id": "EMP001"}),
+                            ("inventory_lookup", {"sku": "ABC123"}), ("inventory_lookup", {"sku": "ABC123"})]:
+        tools.call(name, arguments)
+
+    print("\nCustomer summary:")
+    for line in metrics.traces[0].lines():
+        print(f"   {line}")
+    print("\nSKU lookup, then the same again (cached):")
+    for span in list(metrics.traces)[-2:]:
+        for line in span.lines():
+            print(f"   {line}")
+
+    print("\nPer tool and method:")
+    for row in metrics.summary():
+        print(f"   {row['kind']:<7} {row['name']:<42} {row['calls']:>3} calls  mean {row['mean_ms']:.3f} ms")
+    print(f"\nCache outcomes: {metrics.cache}")
+
+    print("\nPrometheus (first lines):")
+    for line in metrics.to_prometheus().splitlines()[:4]:
+        print(f"   {line}")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ MOCK_INVENTORY = [
         "quantity_reserved": 50,
         "quantity_available": 400,
         "warehouse_location": "A-12-3",
+        "last_updated": "2026-02-18",
         "unit_cost": 25.50,
         "reorder_point": 100
     },
@@ -21,6 +22,7 @@ MOCK_INVENTORY = [
         "quantity_reserved": 5,
         "quantity_available": 20,
         "warehouse_location": "B-05-1",
+        "last_updated": "2026-02-18",
         "unit_cost": 450.00,
         "reorder_point": 10
     },
@@ -32,6 +34,7 @@ MOCK_INVENTORY = [
         "quantity_reserved": 30,
         "quantity_available": 90,
         "warehouse_location": "C-08-4",
+        "last_updated": "2026-02-18",
         "unit_cost": 85.00,
         "reorder_point": 50
     },
@@ -43,6 +46,7 @@ MOCK_INVENTORY = [
         "quantity_reserved": 2,
         "quantity_available": 6,
         "warehouse_location": "A-03-2",
+        "last_updated": "2026-02-18",
         "unit_cost": 120.00,
         "reorder_point": 15  # Below reorder point
     }
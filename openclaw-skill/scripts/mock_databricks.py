@@ -4,180 +4,310 @@ Mock Databricks Client for Testing
 Use this when you don't have real credentials yet
 """
 
-from typing import Dict, Any, Optional
-from scripts.mock_data import MOCK_INVENTORY, MOCK_PRODUCTION_JOBS, MOCK_EMPLOYEES, MOCK_CUSTOMERS
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    from mock_data import MOCK_INVENTORY, MOCK_PRODUCTION_JOBS, MOCK_EMPLOYEES, MOCK_CUSTOMERS
+    from sql_engine import SqlEngine, SqlError, Table, Plan
+    from columnar import InventoryColumns
+    from result_batch import manifest_columns
+except ImportError:
+    from scripts.mock_data import MOCK_INVENTORY, MOCK_PRODUCTION_JOBS, MOCK_EMPLOYEES, MOCK_CUSTOMERS
+    from scripts.sql_engine import SqlEngine, SqlError, Table, Plan
+    from scripts.columnar import InventoryColumns
+    from scripts.result_batch import manifest_columns
+
+# Warehouse table layouts (name, Databricks type) - SELECT * returns columns in this order
+INVENTORY_SCHEMA = [
+    ("sku", "STRING"), ("description", "STRING"), ("quantity_on_hand", "INT"),
+    ("quantity_reserved", "INT"), ("quantity_available", "INT"), ("warehouse_location", "STRING"),
+    ("last_updated", "DATE"), ("reorder_point", "INT"), ("unit_cost", "DOUBLE"), ("barcode", "STRING")
+]
+PRODUCTION_SCHEMA = [
+    ("job_id", "STRING"), ("customer_name", "STRING"), ("product_description", "STRING"),
+    ("quantity_ordered", "INT"), ("quantity_produced", "INT"), ("quantity_remaining", "INT"),
+    ("status", "STRING"), ("start_date", "DATE"), ("estimated_completion", "DATE"),
+    ("priority", "STRING"), ("assigned_work_center", "STRING"), ("actual_completion", "DATE")
+]
+EMPLOYEE_SCHEMA = [
+    ("employee_id", "STRING"), ("name", "STRING"), ("department", "STRING"), ("shift", "STRING"),
+    ("hours_this_week", "DOUBLE"), ("hours_last_week", "DOUBLE"), ("status", "STRING")
+]
+CUSTOMER_SCHEMA = [
+    ("customer_id", "STRING"), ("name", "STRING"), ("contact", "STRING"), ("email", "STRING"),
+    ("phone", "STRING"), ("total_orders", "INT"), ("ytd_revenue", "DOUBLE"),
+    ("outstanding_orders", "INT"), ("last_contact", "DATE")
+]
+
+# Other names the warehouse tables are queried by
+TABLE_ALIASES = {
+    "production": "production_jobs",
+    "jobs": "production_jobs",
+    "employee": "employees",
+    "customer": "customers",
+}
+
+def _aliases(table: str) -> List[str]:
+    return [alias for alias, name in TABLE_ALIASES.items() if name == table]
+
+def _names(schema: List[Tuple[str, str]]) -> List[str]:
+    return [name for name, _ in schema]
+
+# Statement Execution API parameter types that are not strings
+_PARAMETER_TYPES = {
+    "INT": int, "BIGINT": int, "SMALLINT": int, "TINYINT": int,
+    "DOUBLE": float, "FLOAT": float, "DECIMAL": float,
+}
+
+
+def bind_parameters(parameters: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Convert Statement Execution API parameters ([{name, value, type}]) to a dict"""
+    if not parameters:
+        return {}
+    if isinstance(parameters, dict):
+        return parameters
+    bound = {}
+    for p in parameters:
+        convert = _PARAMETER_TYPES.get(str(p.get("type", "STRING")).upper())
+        value = p.get("value")
+        bound[p["name"]] = convert(value) if convert and value is not None else value
+    return bound
+
 
 class MockDatabricksClient:
-    """Mock client that returns sample data for testing"""
-    
-    def __init__(self):
-        print("🎭 Using MOCK Databricks client (no real credentials needed)")
+    """Mock client that runs a SQL subset over sample data for testing"""
     
-    def execute_statement(self, sql: str, **kwargs) -> Dict[str, Any]:
-        """Mock SQL execution - parses simple queries and returns mock data"""
-        
-        sql_lower = sql.lower()
-        
-        # Inventory queries
-        if "inventory" in sql_lower or "sku" in sql_lower:
-            return self._handle_inventory_query(sql_lower)
+    def __init__(self, dataset: Optional[Dict[str, List[Dict[str, Any]]]] = None, chunk_rows: int = 1000,
+                 verbose: bool = True):
+        """
+        dataset: tables from synthetic_data.generate_dataset / load_dataset (default: mock_data)
+        chunk_rows: rows per chunk when a statement is streamed (fetch_all=False)
+        verbose: print the mock banner (servers and benchmarks turn it off)
+        """
+        if verbose:
+            print("🎭 Using MOCK Databricks client (no real credentials needed)")
+        self.chunk_rows = chunk_rows
+        self._streams: "OrderedDict[str, _Stream]" = OrderedDict()
+        self._streams_lock = threading.Lock()  # Chunks of different statements are read concurrently
         
-        # Production queries
-        if "production" in sql_lower or "job" in sql_lower:
-            return self._handle_production_query(sql_lower)
+        tables = dataset or {
+            "inventory": MOCK_INVENTORY,
+            "production_jobs": MOCK_PRODUCTION_JOBS,
+            "employees": MOCK_EMPLOYEES,
+            "customers": MOCK_CUSTOMERS,
+        }
         
-        # Employee queries
-        if "employee" in sql_lower:
-            return self._handle_employee_query(sql_lower)
+        # Tables are built the first time they are queried, so a process that only
+        # touches one table never pays for the others.
+        # Inventory is the large table, so it is held column-wise for vectorized scans.
+        self.engine = SqlEngine()
+        self.engine.register_lazy("inventory", lambda: InventoryColumns(INVENTORY_SCHEMA, tables["inventory"]))
+        self.engine.register_lazy(
+            "production_jobs",
+            lambda: Table("production_jobs", _names(PRODUCTION_SCHEMA), tables["production_jobs"], indexed=("job_id",)),
+            aliases=_aliases("production_jobs")
+        )
+        self.engine.register_lazy(
+            "employees",
+            lambda: Table("employees", _names(EMPLOYEE_SCHEMA), tables["employees"], indexed=("employee_id",)),
+            aliases=_aliases("employees")
+        )
+        self.engine.register_lazy(
+            "customers",
+            lambda: Table("customers", _names(CUSTOMER_SCHEMA), tables["customers"], indexed=("customer_id", "name")),
+            aliases=_aliases("customers")
+        )
         
-        # Customer queries
-        if "customer" in sql_lower:
-            return self._handle_customer_query(sql_lower)
+        self._types = {
+            table: dict(schema) for table, schema in (
+                ("inventory", INVENTORY_SCHEMA), ("production_jobs", PRODUCTION_SCHEMA),
+                ("employees", EMPLOYEE_SCHEMA), ("customers", CUSTOMER_SCHEMA),
+            )
+        }
         
-        # Default: return mock success
-        return {
-            "status": {"state": "SUCCEEDED"},
-            "result": {
-                "data_array": [["Mock data - query not recognized", sql]],
-                "manifest": {"schema": {"columns": [{"name": "message"}, {"name": "query"}]}}
-            }
+        self._routes = {
+            "inventory": self._handle_inventory_query,
+            "production_jobs": self._handle_production_query,
+            "employees": self._handle_employee_query,
+            "customers": self._handle_customer_query,
         }
     
-    def _handle_inventory_query(self, sql: str) -> Dict[str, Any]:
-        """Handle inventory-related queries"""
-        
-        # Check for specific SKU
-        for item in MOCK_INVENTORY:
-            if item["sku"].lower() in sql or item["barcode"] in sql:
-                return self._format_success([[
-                    item["sku"],
-                    item["description"],
-                    item["quantity_on_hand"],
-                    item["quantity_reserved"],
-                    item["quantity_available"],
-                    item["warehouse_location"],
-                    "2026-02-18",
-                    item["reorder_point"],
-                    item["unit_cost"]
-                ]])
+    @property
+    def inventory(self) -> InventoryColumns:
+        return self.engine.table("inventory")
+    
+    def execute_statement(self, sql: str, **kwargs) -> Dict[str, Any]:
+        """Mock SQL execution - SELECT with WHERE / ORDER BY / LIMIT over the mock tables"""
         
-        # Check for low stock
-        if "low" in sql or "reorder" in sql:
-            low_stock = [i for i in MOCK_INVENTORY if i["quantity_available"] <= i["reorder_point"]]
-            data = [[
-                i["sku"],
-                i["description"],
-                i["quantity_available"],
-                i["reorder_point"],
-                i["warehouse_location"]
-            ] for i in low_stock]
-            return self._format_success(data)
+        try:
+            plan = self.engine.plan(sql)
+            parameters = bind_parameters(kwargs.get("parameters"))
+            if kwargs.get("fetch_all", True):
+                return self._routes[plan.table](plan, parameters)
+            return self._start_stream(plan, parameters)
+        except SqlError as e:
+            return self._format_error(str(e))
+    
+    def _start_stream(self, plan: Plan, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return only the first chunk; later chunks are produced on demand by get_chunk,
+        so a consumer that stops early never pays for the rest of the scan.
+        """
+        statement_id = uuid.uuid4().hex
+        stream = _Stream(self.engine.iter_rows(plan, parameters), self.chunk_rows)
+        stream.next_index = None  # Claimed until the first chunk is produced
+        with self._streams_lock:
+            self._streams[statement_id] = stream
+            if len(self._streams) > _MAX_OPEN_STREAMS:
+                self._streams.popitem(last=False)
         
-        # Return all inventory
-        data = [[
-            i["sku"],
-            i["description"],
-            i["quantity_available"],
-            i["warehouse_location"]
-        ] for i in MOCK_INVENTORY]
-        return self._format_success(data)
-    
-    def _handle_production_query(self, sql: str) -> Dict[str, Any]:
+        chunk = self._next_chunk(statement_id, stream, 0)
+        response = self._format_success([], self._schema(plan))
+        response["statement_id"] = statement_id
+        response["result"].update(chunk)
+        return response
+    
+    def _next_chunk(self, statement_id: str, stream: "_Stream", chunk_index: int) -> Dict[str, Any]:
+        """Produce a claimed stream's next chunk (the scan runs outside the lock), then release it"""
+        try:
+            rows = stream.take()
+        except SqlError:
+            with self._streams_lock:
+                self._streams.pop(statement_id, None)
+            raise
+        chunk = {"chunk_index": chunk_index, "row_offset": stream.offset - len(rows),
+                 "row_count": len(rows), "data_array": rows}
+        with self._streams_lock:
+            if stream.exhausted:
+                self._streams.pop(statement_id, None)
+            else:
+                chunk["next_chunk_index"] = chunk_index + 1
+                stream.next_index = chunk_index + 1
+        return chunk
+    
+    def get_chunk(self, statement_id: str, chunk_index: int) -> Dict[str, Any]:
+        """Next chunk of a streamed statement (chunks are produced in order)"""
+        with self._streams_lock:
+            stream = self._streams.get(statement_id)
+            if stream is None or chunk_index != stream.next_index:
+                return self._format_error(f"Chunk {chunk_index} of statement {statement_id} is not available")
+            stream.next_index = None  # Claimed: a concurrent request for the same chunk is refused
+        try:
+            return self._next_chunk(statement_id, stream, chunk_index)
+        except SqlError as e:
+            return self._format_error(str(e))
+    
+    def close_statement(self, statement_id: str):
+        """Discard the rest of a streamed result"""
+        with self._streams_lock:
+            self._streams.pop(statement_id, None)
+    
+    def _handle_inventory_query(self, plan: Plan, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle inventory-related queries"""
+        return self._run(plan, parameters)
+    
+    def _handle_production_query(self, plan: Plan, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Handle production job queries"""
-        
-        # Check for specific job
-        for job in MOCK_PRODUCTION_JOBS:
-            if job["job_id"].lower() in sql:
-                return self._format_success([[
-                    job["job_id"],
-                    job["customer_name"],
-                    job["product_description"],
-                    job["quantity_ordered"],
-                    job["quantity_produced"],
-                    job["quantity_remaining"],
-                    job["status"],
-                    job["start_date"],
-                    job.get("estimated_completion", job.get("actual_completion", "")),
-                    job["priority"],
-                    job["assigned_work_center"]
-                ]])
-        
-        # Check for customer
-        for job in MOCK_PRODUCTION_JOBS:
-            if job["customer_name"].lower().split()[0] in sql.lower():
-                return self._format_success([[
-                    job["job_id"],
-                    job["customer_name"],
-                    job["product_description"],
-                    job["quantity_ordered"],
-                    job["quantity_produced"],
-                    job["status"],
-                    job.get("estimated_completion", job.get("actual_completion", ""))
-                ]])
-        
-        # Return all jobs
-        data = [[
-            j["job_id"],
-            j["customer_name"],
-            j["status"],
-            j["quantity_produced"],
-            j["quantity_ordered"]
-        ] for j in MOCK_PRODUCTION_JOBS]
-        return self._format_success(data)
-    
-    def _handle_employee_query(self, sql: str) -> Dict[str, Any]:
+        return self._run(plan, parameters)
+    
+    def _handle_employee_query(self, plan: Plan, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Handle employee queries"""
-        
-        # Check for specific employee
-        for emp in MOCK_EMPLOYEES:
-            if emp["employee_id"].lower() in sql or emp["name"].lower().split()[0] in sql.lower():
-                return self._format_success([[
-                    emp["employee_id"],
-                    emp["name"],
-                    emp["department"],
-                    emp["shift"],
-                    emp["hours_this_week"],
-                    emp["status"]
-                ]])
-        
-        # Return all employees
-        data = [[
-            e["employee_id"],
-            e["name"],
-            e["department"],
-            e["hours_this_week"]
-        ] for e in MOCK_EMPLOYEES]
-        return self._format_success(data)
-    
-    def _handle_customer_query(self, sql: str) -> Dict[str, Any]:
+        return self._run(plan, parameters)
+    
+    def _handle_customer_query(self, plan: Plan, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Handle customer queries"""
-        
-        # Return all customers
-        data = [[
-            c["customer_id"],
-            c["name"],
-            c["contact"],
-            c["ytd_revenue"],
-            c["outstanding_orders"]
-        ] for c in MOCK_CUSTOMERS]
-        return self._format_success(data)
-    
-    def _format_success(self, data_array: list) -> Dict[str, Any]:
-        """Format successful response"""
+        return self._run(plan, parameters)
+    
+    def _run(self, plan: Plan, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a parsed plan against its table"""
+        rows = list(self.engine.iter_rows(plan, parameters))
+        return self._format_success(rows, self._schema(plan))
+    
+    def _schema(self, plan: Plan) -> List[Tuple[str, str]]:
+        """(name, type) of each output column"""
+        types = self._types[plan.table]
+        return [(column, types[column]) for column in self.engine.columns(plan)]
+    
+    def _format_success(self, data_array: list, schema: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """Format successful response; read it by column name with result_batch.ColumnBatch"""
+        columns = manifest_columns(schema)
         return {
             "status": {"state": "SUCCEEDED"},
             "result": {
                 "data_array": data_array,
-                "manifest": {"schema": {"columns": [{"name": f"col_{i}"} for i in range(len(data_array[0]) if data_array else 1)]}}
+                "manifest": {"schema": {"column_count": len(columns), "columns": columns}}
+            }
+        }
+    
+    def _format_error(self, message: str) -> Dict[str, Any]:
+        """Format failed response the way the Statement Execution API does"""
+        return {
+            "status": {
+                "state": "FAILED",
+                "error": {"error_code": "BAD_REQUEST", "message": message}
             }
         }
 
 
-# Drop-in replacement for real client
-try:
-    from databricks_query import DatabricksClient
-except ImportError:
-    DatabricksClient = MockDatabricksClient
+# Streams left unread are dropped oldest-first beyond this many
+_MAX_OPEN_STREAMS = 64
+
+
+class _Stream:
+    """Lazily evaluated result rows, handed out one chunk at a time"""
+    
+    _END = object()
+    
+    def __init__(self, rows, chunk_rows: int):
+        self._rows = iter(rows)
+        self._lookahead = self._END
+        self.chunk_rows = chunk_rows
+        self.offset = 0
+        self.next_index = 0
+        self.exhausted = False
+    
+    def take(self) -> List[List[Any]]:
+        rows = [] if self._lookahead is self._END else [self._lookahead]
+        rows.extend(islice(self._rows, self.chunk_rows - len(rows)))
+        # Read one row ahead to learn whether another chunk follows
+        self._lookahead = next(self._rows, self._END)
+        self.exhausted = self._lookahead is self._END
+        self.offset += len(rows)
+        return rows
+
+
+def _load_real_client():
+    """DatabricksClient, imported on first use: it pulls in requests, which dominates start-up"""
+    try:
+        from databricks_query import DatabricksClient
+    except ImportError:
+        try:
+            from scripts.databricks_query import DatabricksClient
+        except ImportError:  # requests not installed
+            DatabricksClient = MockDatabricksClient
+    return DatabricksClient
+
+
+def __getattr__(name: str):
+    # Drop-in replacement for real client: mock_databricks.DatabricksClient still works
+    if name == "DatabricksClient":
+        return _load_real_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_client():
+    """Real warehouse client when DATABRICKS_* settings are present, otherwise the mock"""
+    configured = all(os.getenv(k) for k in ("DATABRICKS_HOST", "DATABRICKS_TOKEN", "DATABRICKS_WAREHOUSE_ID"))
+    if configured:
+        client_class = _load_real_client()
+        if client_class is not MockDatabricksClient:
+            return client_class()
+    return MockDatabricksClient()
 
 if __name__ == "__main__":
     # Test mock client
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Customer Order Index
+Secondary index from customer to production jobs, with per-status counters
+"""
+
+from collections import Counter
+from typing import Dict, Any, List, Iterable
+
+
+class OrderIndex:
+    """Maintains customer -> job ids and status counts as jobs are added or change state"""
+
+    def __init__(self, jobs: Iterable[Dict[str, Any]] = ()):
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._by_customer: Dict[str, List[str]] = {}
+        self._status_counts: Dict[str, Counter] = {}
+
+        for job in jobs:
+            self.add_job(job)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def add_job(self, job: Dict[str, Any]):
+        """Index a new job (replaces an existing job with the same id)"""
+        job_id = job["job_id"]
+        if job_id in self.jobs:
+            self.remove_job(job_id)
+
+        customer = job["customer_name"]
+        self.jobs[job_id] = job
+        self._by_customer.setdefault(customer, []).append(job_id)
+        self._status_counts.setdefault(customer, Counter())[job["status"]] += 1
+
+    def remove_job(self, job_id: str):
+        """Drop a job from the index"""
+        job = self.jobs.pop(job_id)
+        customer = job["customer_name"]
+        self._by_customer[customer].remove(job_id)
+        self._status_counts[customer][job["status"]] -= 1
+
+    def update_status(self, job_id: str, status: str):
+        """Move a job to a new status, keeping the customer's counters in step"""
+        job = self.jobs[job_id]
+        counts = self._status_counts[job["customer_name"]]
+        counts[job["status"]] -= 1
+        counts[status] += 1
+        job["status"] = status
+
+    def jobs_for(self, customer_name: str) -> List[Dict[str, Any]]:
+        """All jobs for a customer, in the order they were added"""
+        return [self.jobs[job_id] for job_id in self._by_customer.get(customer_name, [])]
+
+    def order_count(self, customer_name: str) -> int:
+        return len(self._by_customer.get(customer_name, []))
+
+    def status_count(self, customer_name: str, status: str) -> int:
+        """Number of a customer's jobs currently in status - O(1)"""
+        counts = self._status_counts.get(customer_name)
+        return counts[status] if counts else 0
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Phonetic Name Index
+Finds names that speech recognition got wrong ("Jon Smyth", "Akme Bicycle"):
+words are matched by Metaphone key, allowing one edit between keys, then whole
+names are ranked by how well every spoken word matched
+"""
+
+import heapq
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"[^\W\d_]+|\d+")
+_VOWELS = "AEIOU"
+
+# Stored words less similar than this to a spoken word are not counted as a match for it
+_MIN_WORD_SIMILARITY = 0.5
+
+
+def metaphone(word: str) -> str:
+    """Metaphone key of one word (Lawrence Philips' original rules)"""
+    w = "".join(c for c in word.upper() if "A" <= c <= "Z")
+    if not w:
+        return ""
+    if w[:2] in ("AE", "GN", "KN", "PN", "WR"):
+        w = w[1:]
+    elif w[0] == "X":
+        w = "S" + w[1:]
+    elif w[:2] == "WH":
+        w = "W" + w[2:]
+
+    n = len(w)
+    key = []
+    for i, c in enumerate(w):
+        prev = w[i - 1] if i > 0 else ""
+        nxt = w[i + 1] if i + 1 < n else ""
+        nxt2 = w[i + 2] if i + 2 < n else ""
+        if c == prev and c != "C":
+            continue
+
+        if c in _VOWELS:
+            if i == 0:
+                key.append(c)
+        elif c == "B":
+            if not (prev == "M" and i == n - 1):
+                key.append("B")
+        elif c == "C":
+            if nxt == "I" and nxt2 == "A":
+                key.append("X")
+            elif nxt == "H":
+                key.append("K" if prev == "S" else "X")
+            elif nxt in "IEY" and nxt:
+                if prev != "S":
+                    key.append("S")
+            else:
+                key.append("K")
+        elif c == "D":
+            key.append("J" if nxt == "G" and nxt2 in "EIY" and nxt2 else "T")
+        elif c == "G":
+            if nxt == "H" and not (i + 2 == n or nxt2 in _VOWELS):
+                continue
+            if nxt == "N" and (i + 2 == n or w[i + 1:] == "NED"):
+                continue
+            if prev == "D" and nxt in "EIY" and nxt:
+                continue
+            key.append("J" if nxt in "EIY" and nxt and prev != "G" else "K")
+        elif c == "H":
+            if prev in "CSPTG" and prev:
+                continue
+            if prev in _VOWELS and prev and nxt not in _VOWELS:
+                continue
+            key.append("H")
+        elif c == "K":
+            if prev != "C":
+                key.append("K")
+        elif c == "P":
+            key.append("F" if nxt == "H" else "P")
+        elif c == "Q":
+            key.append("K")
+        elif c == "S":
+            if nxt == "H" or (nxt == "I" and nxt2 in ("O", "A")):
+                key.append("X")
+            else:
+                key.append("S")
+        elif c == "T":
+            if nxt == "I" and nxt2 in ("O", "A"):
+                key.append("X")
+            elif nxt == "H":
+                key.append("0")
+            elif not (nxt == "C" and nxt2 == "H"):
+                key.append("T")
+        elif c == "V":
+            key.append("F")
+        elif c in "WY":
+            if nxt in _VOWELS and nxt:
+                key.append(c)
+        elif c == "X":
+            key.append("KS")
+        elif c == "Z":
+            key.append("S")
+        else:  # F J L M N R
+            key.append(c)
+    return "".join(key)
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance, bit-parallel (Myers/Hyyro): one pass over b, a column of a per int"""
+    if a == b:
+        return 0
+    if not a or not b:
+        return len(a) or len(b)
+
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, distance = mask, 0, len(a)
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & last:
+            distance += 1
+        elif mh & last:
+            distance -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return distance
+
+
+def _deletions(key: str) -> Set[str]:
+    """key and every string one deletion away from it"""
+    return {key} | {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.casefold())
+
+
+class PhoneticIndex:
+    """
+    Names by position, searchable by sound and spelling.
+    Work is done per distinct word: a spoken word is compared with the few stored words
+    sharing its Metaphone key or within a small edit distance, then the names holding
+    those words are scored.
+    """
+
+    def __init__(self):
+        self._positions: Dict[str, List[int]] = {}      # normalized name -> positions
+        self._name_words: Dict[str, int] = {}           # normalized name -> word count
+        self._word_names: Dict[str, Set[str]] = {}      # word -> names containing it
+        self._word_key: Dict[str, str] = {}             # word -> metaphone key
+        self._by_key: Dict[str, Set[str]] = {}          # metaphone key -> words
+        self._near_keys: Dict[str, Set[str]] = {}       # key or key minus one letter -> keys
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self._positions.values())
+
+    def add(self, position: int, name: str):
+        words = _words(name)
+        normalized = " ".join(words)
+        positions = self._positions.get(normalized)
+        if positions is not None:
+            positions.append(position)
+            return
+        self._positions[normalized] = [position]
+        self._name_words[normalized] = len(words)
+        for word in words:
+            names = self._word_names.get(word)
+            if names is None:
+                names = self._word_names[word] = set()
+                key = self._word_key[word] = metaphone(word) or word
+                words_for_key = self._by_key.get(key)
+                if words_for_key is None:
+                    words_for_key = self._by_key[key] = set()
+                    for variant in _deletions(key):
+                        self._near_keys.setdefault(variant, set()).add(key)
+                words_for_key.add(word)
+            names.add(normalized)
+
+    def _similar_words(self, spoken: str) -> Dict[str, float]:
+        """Stored words that could be what was said, with a 0..1 similarity"""
+        # Misheard words mostly keep their sound, so candidates are the words whose key is
+        # within one edit of the spoken key. Two strings one edit apart share a
+        # single-deletion variant, so the neighbours come from a few dict lookups
+        # rather than a distance computation per stored key. Keys of one or two letters
+        # would reach most short keys that way; for them only a letter added is allowed.
+        key = metaphone(spoken) or spoken
+        variants = _deletions(key) if len(key) > 2 else (key,)
+        candidates = set()
+        for stored_key in set().union(*(self._near_keys.get(v, ()) for v in variants)):
+            if stored_key == key or levenshtein(key, stored_key) == 1:
+                candidates.update(self._by_key[stored_key])
+        if spoken in self._word_names:
+            candidates.add(spoken)
+
+        similar = {}
+        for word in candidates:
+            spelling = 1 - levenshtein(spoken, word) / max(len(spoken), len(word))
+            # Sounding alike counts for half the score
+            similarity = (spelling + (1.0 if self._word_key[word] == key else spelling)) / 2
+            if similarity >= _MIN_WORD_SIMILARITY:
+                similar[word] = similarity
+        return similar
+
+    def search(self, text: str, limit: int = 5, min_score: float = 0.7) -> List[Tuple[int, float]]:
+        """
+        Best matching positions as (position, score), best first.
+        score averages each spoken word's best similarity to a word of the name;
+        ties go to names with fewer extra words. A shared key alone scores 0.5 per word,
+        so min_score keeps different names that sound alike ("Jane", "John") apart.
+        """
+        spoken = _words(text)
+        if not spoken or limit <= 0:
+            return []
+
+        scores: Dict[str, List[float]] = {}
+        for i, word in enumerate(spoken):
+            for stored, similarity in self._similar_words(word).items():
+                for name in self._word_names[stored]:
+                    per_word = scores.get(name)
+                    if per_word is None:
+                        per_word = scores[name] = [0.0] * len(spoken)
+                    if similarity > per_word[i]:
+                        per_word[i] = similarity
+
+        # Each name holds at least one position, so the best `limit` names are enough
+        ranked = heapq.nsmallest(limit, (
+            (-sum(per_word) / len(spoken), self._name_words[name] - len(spoken), self._positions[name][0], name)
+            for name, per_word in scores.items()
+        ))
+        matches = []
+        for negative_score, _, _, name in ranked:
+            score = -negative_score
+            if score < min_score:
+                break
+            for position in self._positions[name]:
+                matches.append((position, round(score, 3)))
+                if len(matches) == limit:
+                    return matches
+        return matches
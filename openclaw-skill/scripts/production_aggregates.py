@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Materialized Production Aggregates
+Running totals over production jobs (units produced per day and work center,
+remaining units by priority, status counts) and a due-date index for overdue
+jobs, all kept current as jobs change instead of recomputed per question
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import date
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+# Jobs in this status are finished: no remaining units and never overdue
+_DONE = "COMPLETED"
+
+
+def _bump(counter: Counter, key: Any, delta: int):
+    """Add delta to counter[key], dropping keys that fall to zero"""
+    value = counter[key] + delta
+    if value:
+        counter[key] = value
+    else:
+        del counter[key]
+
+
+def _remaining(job: Dict[str, Any]) -> int:
+    if job.get("quantity_remaining") is not None:
+        return job["quantity_remaining"]
+    return max((job.get("quantity_ordered") or 0) - (job.get("quantity_produced") or 0), 0)
+
+
+class ProductionAggregates:
+    """
+    Maintains production totals as jobs are added, updated or removed - each change is O(log n).
+
+    Units are credited to a day when they are reported through update_job (or add_job
+    replacing a job). A job first loaded as completed is credited on its actual_completion
+    date; units already produced on a job loaded while open have no known day, so they
+    count in the totals but not in produced_by_day.
+    """
+
+    def __init__(self, jobs: Iterable[Dict[str, Any]] = ()):
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.status_counts: Counter = Counter()
+        self.produced_by_day: Counter = Counter()
+        self.produced_by_center: Counter = Counter()
+        self.remaining_by_priority: Counter = Counter()
+        self.ordered = 0
+        self.produced = 0
+        self._due: List[Tuple[str, str]] = []  # (estimated_completion, job_id) of open jobs, sorted
+
+        for job in jobs:
+            self.add_job(job)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def _apply(self, job: Dict[str, Any], sign: int):
+        """Add (sign=1) or retract (sign=-1) one job's contribution to every aggregate"""
+        produced = job.get("quantity_produced") or 0
+        _bump(self.status_counts, job["status"], sign)
+        self.ordered += sign * (job.get("quantity_ordered") or 0)
+        self.produced += sign * produced
+        if job.get("assigned_work_center"):
+            _bump(self.produced_by_center, job["assigned_work_center"], sign * produced)
+        if job["status"] == _DONE:
+            return
+
+        _bump(self.remaining_by_priority, job.get("priority") or "NORMAL", sign * _remaining(job))
+        if job.get("estimated_completion"):
+            entry = (str(job["estimated_completion"]), job["job_id"])
+            if sign > 0:
+                insort(self._due, entry)
+            else:
+                del self._due[bisect_left(self._due, entry)]
+
+    def add_job(self, job: Dict[str, Any], day: Optional[str] = None):
+        """Index a job; a job already indexed is updated to match it (see update_job)"""
+        if job["job_id"] in self.jobs:
+            self.update_job(job["job_id"], day, **{k: v for k, v in job.items() if k != "job_id"})
+            return
+        self.jobs[job["job_id"]] = job
+        self._apply(job, 1)
+        if job["status"] == _DONE and job.get("actual_completion") and job.get("quantity_produced"):
+            _bump(self.produced_by_day, str(job["actual_completion"]), job["quantity_produced"])
+
+    def remove_job(self, job_id: str):
+        """Drop a job; units it produced stay in produced_by_day, which is history"""
+        self._apply(self.jobs.pop(job_id), -1)
+
+    def update_job(self, job_id: str, day: Optional[str] = None, **changes):
+        """Apply field changes to a job; newly produced units are credited to day (default today)"""
+        job = self.jobs[job_id]
+        self._apply(job, -1)
+        before = job.get("quantity_produced") or 0
+        job.update(changes)
+        if "quantity_remaining" not in changes and job.get("quantity_remaining") is not None:
+            job["quantity_remaining"] = max((job.get("quantity_ordered") or 0) - (job.get("quantity_produced") or 0), 0)
+        self._apply(job, 1)
+
+        delta = (job.get("quantity_produced") or 0) - before
+        if delta:
+            _bump(self.produced_by_day, day or date.today().isoformat(), delta)
+
+    def overdue(self, as_of: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Open jobs due before as_of (default today), earliest first - O(log n + k)"""
+        as_of = as_of or date.today().isoformat()
+        end = bisect_left(self._due, (as_of,))
+        return [self.jobs[job_id] for _, job_id in self._due[:end]]
+
+    def summary(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """Every aggregate as plain dicts, with the units produced on day (default today)"""
+        day = day or date.today().isoformat()
+        return {
+            "jobs": len(self.jobs),
+            "by_status": dict(self.status_counts),
+            "produced": self.produced,
+            "ordered": self.ordered,
+            "day": day,
+            "produced_on_day": self.produced_by_day[day],
+            "produced_by_center": dict(self.produced_by_center),
+            "remaining_by_priority": dict(self.remaining_by_priority),
+        }
+
+
+def main():
+    """CLI demo"""
+    try:
+        from mock_data import MOCK_PRODUCTION_JOBS
+        from synthetic_data import REFERENCE_DATE
+    except ImportError:
+        from scripts.mock_data import MOCK_PRODUCTION_JOBS
+        from scripts.synthetic_data import REFERENCE_DATE
+
+    print("🏭 Production Aggregates Demo")
+    print("=" * 50)
+
+    today = REFERENCE_DATE.isoformat()
+    aggregates = ProductionAggregates(dict(job) for job in MOCK_PRODUCTION_JOBS)
+    summary = aggregates.summary(today)
+    print(f"\n1. {summary['jobs']} jobs, {summary['produced']} of {summary['ordered']} units produced")
+    print(f"   By work center: {summary['produced_by_center']}")
+    print(f"   Remaining by priority: {summary['remaining_by_priority']}")
+
+    print(f"\n2. Overdue as of {today}:")
+    for job in aggregates.overdue(today):
+        print(f"   🚨 {job['job_id']}: {job['customer_name']} - due {job['estimated_completion']}")
+
+    print("\n3. JOB001 finishes 10 more units today...")
+    aggregates.update_job("JOB001", day=today, quantity_produced=50, status="COMPLETED")
+    summary = aggregates.summary(today)
+    print(f"   Produced today: {summary['produced_on_day']}; remaining by priority: {summary['remaining_by_priority']}")
+
+if __name__ == "__main__":
+    main()
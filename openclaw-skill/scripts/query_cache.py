@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Query Result Cache
+TTL + LRU cache in front of any client's execute_statement, bounded by bytes,
+with per-table TTLs and invalidation by table name
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set, Tuple, Callable
+
+try:
+    from sql_engine import statement_key, referenced_tables
+    from mock_databricks import TABLE_ALIASES
+except ImportError:
+    from scripts.sql_engine import statement_key, referenced_tables
+    from scripts.mock_databricks import TABLE_ALIASES
+
+# Seconds a result stays fresh: stock moves constantly, rosters and accounts rarely
+DEFAULT_TABLE_TTLS = {
+    "inventory": 30.0,
+    "production_jobs": 60.0,
+    "employees": 300.0,
+    "customers": 600.0,
+}
+
+
+class _Entry:
+    __slots__ = ("result", "size", "expires_at", "tables")
+
+    def __init__(self, result: Dict[str, Any], size: int, expires_at: float, tables: Tuple[str, ...]):
+        self.result = result
+        self.size = size
+        self.expires_at = expires_at
+        self.tables = tables
+
+
+class CachedClient:
+    """
+    Wraps a client; repeated statements (same normalized SQL, parameters and options)
+    are answered from memory until their TTL passes or their table is invalidated.
+    Cached responses are shared between callers, so treat them as read-only.
+    Statements whose tables cannot be read from the SQL are never cached, since no
+    invalidation could reach them.
+    """
+
+    def __init__(self, client, max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 30.0,
+                 table_ttls: Optional[Dict[str, float]] = None,
+                 aliases: Optional[Dict[str, str]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.table_ttls = dict(DEFAULT_TABLE_TTLS if table_ttls is None else table_ttls)
+        self.aliases = TABLE_ALIASES if aliases is None else aliases
+        self._clock = clock
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_table: Dict[str, Set[str]] = {}
+        # Bumped by invalidate (per table) and clear (all): a result fetched across a bump may be stale
+        self._generations: Dict[str, int] = {}
+        self._clears = 0
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Called with "hit", "miss" or "bypass" per statement (metrics.py installs one)
+        self.on_outcome: Optional[Callable[[str], None]] = None
+
+    def __getattr__(self, name):
+        # Everything else (get_chunk, cancel, engine, ...) goes to the wrapped client
+        return getattr(self.client, name)
+
+    def _tables(self, sql: str) -> Tuple[str, ...]:
+        return tuple(sorted({self.aliases.get(t, t) for t in referenced_tables(sql)}))
+
+    def _generation(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        return (self._clears,) + tuple(self._generations.get(t, 0) for t in tables)
+
+    def generation(self, table: str) -> Tuple[int, ...]:
+        """Changes whenever table is invalidated or the cache is cleared (TTL expiry and eviction don't)"""
+        with self._lock:
+            return self._generation((self.aliases.get(table, table),))
+
+    def _ttl(self, tables: Tuple[str, ...]) -> float:
+        # A statement is only as fresh as its most volatile table
+        return min((self.table_ttls.get(t, self.default_ttl) for t in tables), default=self.default_ttl)
+
+    def execute_statement(self, sql: str, **kwargs) -> Dict[str, Any]:
+        """Serve from cache when fresh, otherwise execute and remember a successful result"""
+        if not kwargs.get("fetch_all", True):
+            if self.on_outcome is not None:
+                self.on_outcome("bypass")
+            return self.client.execute_statement(sql, **kwargs)  # Streamed results are partial
+
+        options = {k: v for k, v in kwargs.items() if k != "parameters"}
+        key = statement_key(sql, kwargs.get("parameters"))
+        if options:
+            key += " -- " + repr(sorted(options.items()))
+
+        tables = self._tables(sql)
+        if not tables:
+            if self.on_outcome is not None:
+                self.on_outcome("bypass")
+            return self.client.execute_statement(sql, **kwargs)
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if self.on_outcome is not None:
+                        self.on_outcome("hit")
+                    return entry.result
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation(tables)
+        if self.on_outcome is not None:
+            self.on_outcome("miss")
+
+        result = self.client.execute_statement(sql, **kwargs)
+        if result.get("status", {}).get("state") != "SUCCEEDED":
+            return result
+
+        size = len(json.dumps(result, default=str, separators=(",", ":")))
+        if size > self.max_bytes:
+            return result
+
+        entry = _Entry(result, size, now + self._ttl(tables), tables)
+        with self._lock:
+            if self._generation(tables) != generation:
+                return result  # A table was invalidated while this ran: don't cache what may be stale
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return result
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def invalidate(self, table: str) -> int:
+        """Drop every cached result that reads table; returns how many were dropped"""
+        table = self.aliases.get(table, table)
+        with self._lock:
+            keys = self._by_table.pop(table, set())
+            self._generations[table] = self._generations.get(table, 0) + 1
+            for key in list(keys):
+                if key in self._entries:
+                    self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._clears += 1
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for tuning TTLs and the byte budget"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def main():
+    """CLI demo"""
+    try:
+        from mock_databricks import MockDatabricksClient
+    except ImportError:
+        from scripts.mock_databricks import MockDatabricksClient
+
+    print("🗃️  Query Cache Demo")
+    print("=" * 50)
+
+    client = CachedClient(MockDatabricksClient())
+    for _ in range(5):
+        client.execute_statement("SELECT * FROM inventory WHERE sku = 'ABC123'")
+        client.execute_statement("select *  from production where job_id = 'JOB001'")
+    client.invalidate("inventory")
+    client.execute_statement("SELECT * FROM inventory WHERE sku = 'ABC123'")
+
+    for name, value in client.stats().items():
+        print(f"   {name}: {value:.2f}" if isinstance(value, float) else f"   {name}: {value}")
+
+if __name__ == "__main__":
+    main()
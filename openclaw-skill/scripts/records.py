@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Compact Record Types
+Slotted classes for the four mock tables: no per-row key dict, and categorical
+values ("Assembly", "IN_PROGRESS", "Day") interned so every row shares one string.
+Records behave as mutable mappings, so the indexes and tools read them like the dicts they replace
+"""
+
+import json
+import sys
+import tracemalloc
+from collections.abc import MutableMapping
+from typing import Dict, Any, Callable, FrozenSet, Iterable, Iterator, List, Tuple, Type
+
+
+class Record(MutableMapping):
+    """
+    Base for slotted rows. Subclasses set __slots__ = fields = (...) and categorical.
+    A field that was never set is absent, as a missing key would be (e.g. actual_completion
+    on an open job), so to_dict() gives back exactly the dict a record was made from.
+    """
+    __slots__ = ()
+    fields: Tuple[str, ...] = ()
+    categorical: FrozenSet[str] = frozenset()
+    _field_set: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.fields)
+
+    def __init__(self, **values: Any):
+        for field, value in values.items():
+            self[field] = value
+
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any]) -> "Record":
+        return cls(**row)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.fields if hasattr(self, field)}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._field_set:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        if key in self.categorical and type(value) is str:
+            value = sys.intern(value)
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str):
+        if key not in self._field_set or not hasattr(self, key):
+            raise KeyError(key)
+        delattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self.fields if hasattr(self, field))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        # `if not record:` is common in the tools; stop at the first field instead of counting
+        for field in self.fields:
+            if hasattr(self, field):
+                return True
+        return False
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._field_set and hasattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # The Mapping default goes through __getitem__ and an exception per missing key
+        return getattr(self, key, default) if key in self._field_set else default
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+
+class InventoryItem(Record):
+    __slots__ = fields = ("sku", "description", "barcode", "quantity_on_hand", "quantity_reserved",
+                          "quantity_available", "warehouse_location", "last_updated", "unit_cost",
+                          "reorder_point")
+    categorical = frozenset({"last_updated"})
+
+
+class ProductionJob(Record):
+    __slots__ = fields = ("job_id", "customer_name", "product_description", "quantity_ordered",
+                          "quantity_produced", "quantity_remaining", "status", "start_date",
+                          "estimated_completion", "actual_completion", "priority", "assigned_work_center")
+    categorical = frozenset({"customer_name", "status", "start_date", "estimated_completion",
+                             "actual_completion", "priority", "assigned_work_center"})
+
+
+class Employee(Record):
+    __slots__ = fields = ("employee_id", "name", "department", "shift", "hours_this_week",
+                          "hours_last_week", "status")
+    categorical = frozenset({"department", "shift", "status"})
+
+
+class Customer(Record):
+    __slots__ = fields = ("customer_id", "name", "contact", "email", "phone", "total_orders",
+                          "ytd_revenue", "outstanding_orders", "last_contact")
+    categorical = frozenset({"last_contact"})
+
+
+RECORD_TYPES: Dict[str, Type[Record]] = {
+    "inventory": InventoryItem,
+    "production_jobs": ProductionJob,
+    "employees": Employee,
+    "customers": Customer,
+}
+
+
+def to_records(table: str, rows: Iterable[Dict[str, Any]]) -> List[Record]:
+    """Compact records for a table's rows (dicts in the mock_data / synthetic_data shape)"""
+    record_type = RECORD_TYPES[table]
+    return [record_type.from_dict(row) for row in rows]
+
+
+def to_dicts(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Plain dicts again, e.g. for JSON; dict rows are copied"""
+    return [dict(record) for record in records]
+
+
+def compact_dataset(dataset: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Record]]:
+    """
+    Every table of a dataset as records; pass the result wherever a dataset is accepted
+    (EmployeeHours, CustomerInsights, SkillTools, MockDatabricksClient)
+    """
+    return {table: to_records(table, rows) for table, rows in dataset.items()}
+
+
+def plain_dataset(dataset: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    return {table: to_dicts(rows) for table, rows in dataset.items()}
+
+
+def _traced_bytes(build: Callable[[], Any]) -> int:
+    """Memory still allocated by what build() returns (temporaries it freed don't count)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return held
+
+
+def memory_report(rows: int = 10_000, seed: int = 42) -> Dict[str, Dict[str, Any]]:
+    """
+    Bytes held per table as dicts vs records, for rows parsed from JSON lines as a
+    warehouse fetch or load_dataset would deliver them (every value its own string)
+    """
+    try:
+        from synthetic_data import generate_dataset
+    except ImportError:
+        from scripts.synthetic_data import generate_dataset
+
+    report = {}
+    for table, table_rows in generate_dataset(rows, seed).items():
+        lines = [json.dumps(row) for row in table_rows]
+        record_type = RECORD_TYPES[table]
+        dict_bytes = _traced_bytes(lambda: [json.loads(line) for line in lines])
+        record_bytes = _traced_bytes(lambda: [record_type.from_dict(json.loads(line)) for line in lines])
+        report[table] = {
+            "rows": len(lines),
+            "dict_bytes": dict_bytes,
+            "record_bytes": record_bytes,
+            "saved": 1 - record_bytes / dict_bytes if dict_bytes else 0.0,
+        }
+    return report
+
+
+def main():
+    """CLI: compare the memory of dict rows and compact records"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Memory of dict rows vs compact records")
+    parser.add_argument("--rows", type=int, default=10_000, help="inventory rows; other tables scale from it")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("🧱 Compact Records Memory Report")
+    print("=" * 50)
+
+    report = memory_report(args.rows, args.seed)
+    print(f"\n   {'table':<16} {'rows':>8} {'dicts':>10} {'records':>10} {'saved':>7}")
+    for table, row in report.items():
+        print(f"   {table:<16} {row['rows']:>8,} {row['dict_bytes'] / 1024:>8.0f}KiB "
+              f"{row['record_bytes'] / 1024:>8.0f}KiB {row['saved']:>6.0%}")
+    dict_total = sum(row["dict_bytes"] for row in report.values())
+    record_total = sum(row["record_bytes"] for row in report.values())
+    print(f"\n   Total: {dict_total / 2**20:.1f} MiB as dicts, {record_total / 2**20:.1f} MiB as records "
+          f"({1 - record_total / dict_total:.0%} less)")
+
+if __name__ == "__main__":
+    main()
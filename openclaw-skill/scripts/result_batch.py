@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Columnar Result Batches
+Statement results as typed columns with real names, instead of row-major lists
+read by position
+"""
+
+from array import array
+from typing import Dict, Any, List, Optional, Iterator, Sequence, Tuple, Union
+
+try:
+    from columnar import numpy_or_none
+except ImportError:
+    from scripts.columnar import numpy_or_none
+
+# Databricks column types -> array typecodes; everything else stays a Python list
+_TYPECODES = {
+    "INT": "q", "BIGINT": "q", "SMALLINT": "q", "TINYINT": "q", "LONG": "q", "SHORT": "q", "BYTE": "q",
+    "DOUBLE": "d", "FLOAT": "d", "DECIMAL": "d",
+}
+_CONVERTERS = {"q": int, "d": float}
+
+
+def manifest_columns(schema: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Statement Execution API manifest entries for (name, type) pairs"""
+    return [
+        {"name": name, "position": i, "type_name": type_name, "type_text": type_name}
+        for i, (name, type_name) in enumerate(schema)
+    ]
+
+
+class ColumnBatch:
+    """
+    A result set stored column by column.
+    Non-null numeric columns live in contiguous typed arrays and are exposed zero-copy
+    (column() -> memoryview, as_numpy() -> ndarray); other columns are lists.
+    """
+
+    def __init__(self, schema: Sequence[Tuple[str, str]], rows: Sequence[Sequence[Any]] = ()):
+        self.schema = [(name, type_name.upper()) for name, type_name in schema]
+        self.names = [name for name, _ in self.schema]
+        self.positions = {name: i for i, name in enumerate(self.names)}
+
+        columns = list(zip(*rows)) if rows else [()] * len(self.schema)
+        self.data: Dict[str, Union[array, List[Any]]] = {}
+        for (name, type_name), values in zip(self.schema, columns):
+            self.data[name] = _pack(type_name, values)
+        self._length = len(rows)
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> "ColumnBatch":
+        """Build from an execute_statement response (manifest at top level or under result)"""
+        result = response.get("result", {})
+        manifest = response.get("manifest") or result.get("manifest") or {}
+        columns = manifest.get("schema", {}).get("columns", [])
+        schema = [(c["name"], c.get("type_name", "STRING")) for c in columns]
+        return cls(schema, result.get("data_array", []))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator["Row"]:
+        return (Row(self, i) for i in range(self._length))
+
+    def __getitem__(self, index: int) -> "Row":
+        if not -self._length <= index < self._length:
+            raise IndexError(index)
+        return Row(self, index % self._length)
+
+    def dtype(self, name: str) -> str:
+        return self.schema[self.positions[name]][1]
+
+    def column(self, name: str) -> Union[memoryview, List[Any]]:
+        """A column's values: a read-only memoryview over typed storage, or the list itself"""
+        values = self.data[name]
+        if isinstance(values, array):
+            return memoryview(values).toreadonly()
+        return values
+
+    def as_numpy(self, name: str):
+        """Zero-copy NumPy view of a numeric column (requires NumPy)"""
+        np = numpy_or_none()
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        values = self.data[name]
+        if not isinstance(values, array):
+            raise TypeError(f"{name} is not stored in a typed array")
+        array_view = np.frombuffer(values, dtype=np.dtype(values.typecode))
+        array_view.flags.writeable = False
+        return array_view
+
+    def to_rows(self) -> List[List[Any]]:
+        """Back to row-major lists (data_array layout)"""
+        return [list(values) for values in zip(*(self.data[name] for name in self.names))]
+
+
+class Row:
+    """Named view of one batch row; reads go straight to the batch's columns"""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: ColumnBatch, index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key: Union[str, int]) -> Any:
+        if isinstance(key, int):
+            key = self._batch.names[key]
+        return self._batch.data[key][self._index]
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        return self[key] if key in self._batch.positions else default
+
+    def keys(self) -> List[str]:
+        return list(self._batch.names)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: self[name] for name in self._batch.names}
+
+    def __repr__(self) -> str:
+        return f"Row({self.as_dict()!r})"
+
+
+def _pack(type_name: str, values: Sequence[Any]) -> Union[array, List[Any]]:
+    typecode = _TYPECODES.get(type_name)
+    if typecode is None:
+        return list(values)  # Strings and dates
+    # The real API's JSON_ARRAY format sends every value as a string
+    convert = _CONVERTERS[typecode]
+    if any(v is None for v in values):
+        # Typed arrays can't hold NULL: a list, still with numbers rather than numeric strings
+        return [None if v is None else convert(v) for v in values]
+    return array(typecode, map(convert, values))
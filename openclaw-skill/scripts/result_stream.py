@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Streaming Statement Results
+Iterate rows chunk by chunk as they arrive (next_chunk_index pagination),
+so callers can speak the first rows early and stop once they have enough
+"""
+
+from typing import Dict, Any, List, Iterator
+
+
+class StatementError(RuntimeError):
+    """A statement or one of its chunks failed"""
+
+
+def _check(response: Dict[str, Any]):
+    status = response.get("status", {})
+    if status.get("state") not in (None, "SUCCEEDED"):
+        error = status.get("error", {})
+        raise StatementError(error.get("message") or f"Statement {status.get('state')}")
+
+
+def iter_chunks(client, sql: str, **kwargs) -> Iterator[List[List[Any]]]:
+    """
+    Yield each chunk's rows in order. Works with any client whose execute_statement
+    accepts fetch_all=False and that provides get_chunk (MockDatabricksClient,
+    DatabricksClient). Closing the generator early releases the statement.
+    """
+    response = client.execute_statement(sql, fetch_all=False, **kwargs)
+    _check(response)
+    statement_id = response.get("statement_id")
+    result = response.get("result", {})
+
+    finished = False
+    try:
+        yield result.get("data_array", [])
+        next_index = result.get("next_chunk_index")
+        while next_index is not None:
+            chunk = client.get_chunk(statement_id, next_index)
+            _check(chunk)
+            yield chunk.get("data_array", [])
+            next_index = chunk.get("next_chunk_index")
+        finished = True
+    finally:
+        close = getattr(client, "close_statement", None)
+        if not finished and statement_id and close:
+            close(statement_id)
+
+
+def iter_rows(client, sql: str, **kwargs) -> Iterator[List[Any]]:
+    """Yield rows one at a time across chunks"""
+    for chunk in iter_chunks(client, sql, **kwargs):
+        yield from chunk
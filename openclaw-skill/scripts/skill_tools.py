@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Skill Tool Registry
+Every tool listed in SKILL.md, bound to one shared client and the tool classes,
+so a long-running process (tool_server.py) can answer calls with everything warm
+"""
+
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date
+from functools import partial
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+try:
+    from mock_databricks import MockDatabricksClient
+    from query_cache import CachedClient
+    from result_batch import ColumnBatch
+    from customer_insights import CustomerInsights
+    from employee_hours import EmployeeHours
+    from dataloader import DataLoader
+    from trigram_index import TrigramIndex
+    from production_aggregates import ProductionAggregates
+    from metrics import Metrics, maybe_span
+    from synthetic_data import REFERENCE_DATE
+except ImportError:
+    from scripts.mock_databricks import MockDatabricksClient
+    from scripts.query_cache import CachedClient
+    from scripts.result_batch import ColumnBatch
+    from scripts.customer_insights import CustomerInsights
+    from scripts.employee_hours import EmployeeHours
+    from scripts.dataloader import DataLoader
+    from scripts.trigram_index import TrigramIndex
+    from scripts.production_aggregates import ProductionAggregates
+    from scripts.metrics import Metrics, maybe_span
+    from scripts.synthetic_data import REFERENCE_DATE
+
+_ITEM_COLUMNS = "sku, description, quantity_available, warehouse_location, reorder_point, barcode"
+_JOB_COLUMNS = ("job_id, customer_name, product_description, quantity_ordered, quantity_produced, "
+                "status, estimated_completion, priority")
+_JOB_FIELDS = [column.strip() for column in _JOB_COLUMNS.split(",")]
+_AGGREGATE_SQL = (f"SELECT {_JOB_COLUMNS}, quantity_remaining, assigned_work_center, actual_completion "
+                  "FROM production_jobs")
+
+# Single-row lookups that are folded into one IN query (by call_batch, and by the
+# dataloaders across concurrent callers): (tool, argument) -> (table, key column, columns)
+_BATCHABLE = {
+    ("inventory_lookup", "sku"): ("inventory", "sku", _ITEM_COLUMNS),
+    ("inventory_lookup", "barcode"): ("inventory", "barcode", _ITEM_COLUMNS),
+    ("production_status", "job_id"): ("production_jobs", "job_id", _JOB_COLUMNS),
+}
+# Most values bound into one IN list; longer groups are split
+_MAX_GROUP = 256
+
+
+class ToolError(ValueError):
+    """Unknown tool or unusable arguments"""
+
+
+def _iso_date(value: Optional[str], argument: str) -> Optional[str]:
+    """value as a YYYY-MM-DD string (None stays None), or a ToolError naming the argument"""
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        raise ToolError(f"{argument} must be a date (YYYY-MM-DD), got {value!r}") from None
+
+
+def internal_error(tool: Any, error: Exception) -> Dict[str, Any]:
+    """Response for an unexpected exception in a tool; the traceback goes to stderr"""
+    traceback.print_exc()
+    return {"ok": False, "status": 500, "error": f"Internal error in {tool}: {type(error).__name__}: {error}"}
+
+
+class SkillTools:
+    """
+    Dispatches tool calls by name; build one and reuse it for every call.
+    With batch_window > 0, concurrent SKU / barcode / job-ID lookups arriving within
+    that many seconds of each other share one warehouse query (see dataloader.py).
+    Employee and customer lookups are answered from in-memory indexes, so they are not batched.
+    With metrics, every tool call, CustomerInsights / EmployeeHours method and statement is
+    timed as a span (see metrics.py); without, nothing is wrapped.
+    Date-relative answers ("this week", today's production, overdue jobs) are relative to
+    today, which defaults to REFERENCE_DATE: mock_data and synthetic datasets are dated around it.
+    """
+
+    def __init__(self, client=None, dataset: Optional[Dict[str, List[Dict]]] = None, cache: bool = True,
+                 max_workers: int = 4, batch_window: float = 0.0, metrics: Optional[Metrics] = None,
+                 today: Optional[date] = None):
+        client = client if client is not None else MockDatabricksClient(dataset, verbose=False)
+        self.client = CachedClient(client) if cache else client
+        self.today = today if today is not None else REFERENCE_DATE
+        self.employees = EmployeeHours(client, dataset=dataset, today=self.today)
+        self.customers = CustomerInsights(dataset=dataset)
+        self.calls = 0
+        self._calls_lock = threading.Lock()  # Batches count calls from pool threads
+        self.max_workers = max_workers
+        self.metrics: Optional[Metrics] = None
+        self._signatures: Dict[str, Any] = {}
+        self._search_index: Optional[TrigramIndex] = None
+        self._aggregates: Optional[ProductionAggregates] = None
+        self._aggregates_generation: Optional[Tuple[int, ...]] = None  # production_jobs generation at load
+        self.loaders: Dict[Tuple[str, str], DataLoader] = {}
+        if batch_window > 0:
+            self.loaders = {
+                key: DataLoader(partial(self._fetch_by, key), window=batch_window, max_batch=_MAX_GROUP)
+                for key in _BATCHABLE
+            }
+
+        self.tools: Dict[str, Callable[..., Dict[str, Any]]] = {
+            "inventory_lookup": self.inventory_lookup,
+            "inventory_search": self.inventory_search,
+            "low_stock_alert": self.low_stock_alert,
+            "production_status": self.production_status,
+            "customer_orders": self.customer_orders,
+            "customer_summary": self.customer_summary,
+            "top_customers": self.top_customers,
+            "daily_production": self.daily_production,
+            "overdue_jobs": self.overdue_jobs,
+            "employee_hours": self.employee_hours,
+            "employee_search": self.employee_search,
+            "department_roster": self.department_roster,
+        }
+        if metrics is not None:
+            self.instrument(metrics)
+
+    def instrument(self, metrics: Metrics):
+        """Start reporting to metrics (as metrics= does); tools already reporting elsewhere refuse"""
+        if self.metrics is metrics:
+            return
+        if self.metrics is not None:
+            raise ValueError("These tools already report to another Metrics instance")
+        # The raw client behind the query cache, if there is one
+        self._instrument(metrics, getattr(self.client, "client", self.client))
+        self.metrics = metrics
+
+    def _instrument(self, metrics: Metrics, client):
+        """Wrap the tools, the tool classes and execute_statement of the cache and the client behind it"""
+        self.tools = {name: metrics.timed("tool", name, tool) for name, tool in self.tools.items()}
+        metrics.instrument(self.customers)
+        metrics.instrument(self.employees)
+        for target in [self.client] if self.client is client else [self.client, client]:
+            metrics.instrument(target, "sql", ["execute_statement"])
+        if isinstance(self.client, CachedClient):
+            self.client.on_outcome = metrics.cache_outcome
+
+    def _signature(self, name: str):
+        signature = self._signatures.get(name)
+        if signature is None:
+            import inspect  # Slow to import; only needed once a tool is called
+            signature = self._signatures[name] = inspect.signature(self.tools[name])
+        return signature
+
+    def names(self) -> List[str]:
+        return sorted(self.tools)
+
+    def call(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run one tool; returns {"tool", "result", "text"} with text ready to speak"""
+        tool = self.tools.get(name)
+        if tool is None:
+            raise ToolError(f"Unknown tool: {name}")
+        arguments = {} if arguments is None else arguments
+        if not isinstance(arguments, dict):
+            raise ToolError(f"Bad arguments for {name}: expected an object, got {type(arguments).__name__}")
+        # Checked against the signature up front, so a TypeError raised inside a tool is a real bug
+        try:
+            self._signature(name).bind(**arguments)
+        except TypeError as e:
+            raise ToolError(f"Bad arguments for {name}: {e}") from None
+        response = tool(**arguments)
+        self._count_calls(1)
+        return {"tool": name, **response}
+
+    def _count_calls(self, count: int):
+        with self._calls_lock:
+            self.calls += count
+
+    def call_batch(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run many calls ([{"tool", "arguments"}]) in one go; results come back in request order,
+        each as call() would return it plus "ok" (or {"ok": False, "error"}).
+        Lookups by SKU, barcode or job ID are grouped into one IN query per key column,
+        and the groups and remaining calls run concurrently. Each call fails on its own:
+        a malformed entry or a tool that raises never costs the other results.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        groups: Dict[Tuple[str, str], List[Tuple[int, Any]]] = {}
+        singles: List[int] = []
+        for i, request in enumerate(calls):
+            if not isinstance(request, dict) or not isinstance(request.get("tool"), str):
+                results[i] = {"ok": False, "error": "Each batch entry is {\"tool\": name, \"arguments\": {...}}"}
+                continue
+            arguments = request.get("arguments")
+            if arguments is None:
+                arguments = {}
+            elif not isinstance(arguments, dict):
+                results[i] = {"ok": False, "error": f"Bad arguments for {request['tool']}: expected an object"}
+                continue
+            key = (request["tool"], next(iter(arguments), None))
+            value = arguments.get(key[1])
+            if key in _BATCHABLE and len(arguments) == 1 and value and isinstance(value, (str, int)):
+                groups.setdefault(key, []).append((i, value))
+            else:
+                singles.append(i)
+
+        def run_single(i: int):
+            try:
+                results[i] = {"ok": True, **self.call(calls[i]["tool"], calls[i].get("arguments"))}
+            except ToolError as e:
+                results[i] = {"ok": False, "error": str(e)}
+            except Exception as e:
+                results[i] = internal_error(calls[i]["tool"], e)
+
+        def run_group(key: Tuple[str, str], members: List[Tuple[int, Any]]):
+            try:
+                with maybe_span(self.metrics, "tool", key[0]):  # Grouped calls skip the wrapped tools
+                    found = self._fetch_by(key, [value for _, value in members])
+            except ToolError as e:
+                failed = {"ok": False, "error": str(e)}
+            except Exception as e:
+                failed = internal_error(key[0], e)
+            else:
+                failed = None
+            if failed is not None:
+                for i, _ in members:
+                    results[i] = dict(failed)
+                return
+            respond = self._item_response if _BATCHABLE[key][0] == "inventory" else self._job_response
+            for i, value in members:
+                results[i] = {"ok": True, "tool": key[0], **respond(value, found.get(value))}
+            self._count_calls(len(members))
+
+        tasks = [(run_single, (i,)) for i in singles]
+        for key, members in groups.items():
+            for start in range(0, len(members), _MAX_GROUP):
+                tasks.append((run_group, (key, members[start:start + _MAX_GROUP])))
+
+        if len(tasks) == 1 or self.max_workers <= 1:
+            for task, args in tasks:
+                task(*args)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as pool:
+                # Each task runs in a copy of this context, so its spans nest under the caller's
+                for future in [pool.submit(copy_context().run, task, *args) for task, args in tasks]:
+                    future.result()
+        return results
+
+    def _fetch_by(self, key: Tuple[str, str], values: List[Any]) -> Dict[Any, Dict[str, Any]]:
+        """First row for each key value, in one statement: {value: row}"""
+        table, column, columns = _BATCHABLE[key]
+        values = list(dict.fromkeys(values))
+        if len(values) == 1:
+            where = f"{column} = :v0"
+        else:
+            where = f"{column} IN ({', '.join(f':v{i}' for i in range(len(values)))})"
+        rows = self._query(f"SELECT {columns} FROM {table} WHERE {where}",
+                           **{f"v{i}": value for i, value in enumerate(values)})
+        found: Dict[Any, Dict[str, Any]] = {}
+        for row in rows:
+            found.setdefault(row[column], row)
+        return found
+
+    def _lookup(self, key: Tuple[str, str], value: Any) -> Optional[Dict[str, Any]]:
+        """One row by key, through the dataloader when batching is on"""
+        loader = self.loaders.get(key)
+        if loader is not None:
+            return loader.load(value)
+        return self._fetch_by(key, [value]).get(value)
+
+    def _forget(self, key: Tuple[str, str], value: Any = None):
+        """Drop a value (or every value) the dataloader for key has cached"""
+        loader = self.loaders.get(key)
+        if loader is not None:
+            loader.clear(value)
+
+    def _query(self, sql: str, **parameters) -> List[Dict[str, Any]]:
+        return self._rows(self._execute(sql, **parameters))
+
+    def _execute(self, sql: str, **parameters) -> Dict[str, Any]:
+        params = [{"name": k, "value": v} for k, v in parameters.items()]
+        response = self.client.execute_statement(sql, parameters=params)
+        if response.get("status", {}).get("state") != "SUCCEEDED":
+            error = response.get("status", {}).get("error", {})
+            raise ToolError(error.get("message", "Query failed"))
+        return response
+
+    @staticmethod
+    def _rows(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [row.as_dict() for row in ColumnBatch.from_response(response)]
+
+    # -- inventory -------------------------------------------------------------
+
+    def inventory_lookup(self, sku: Optional[str] = None, barcode: Optional[str] = None) -> Dict[str, Any]:
+        if sku:
+            item = self._lookup(("inventory_lookup", "sku"), sku)
+        elif barcode:
+            item = self._lookup(("inventory_lookup", "barcode"), barcode)
+        else:
+            raise ToolError("inventory_lookup needs a sku or barcode")
+        return self._item_response(sku or barcode, item)
+
+    def _item_response(self, key: str, item: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if item is None:
+            return {"result": {"found": False}, "text": f"I couldn't find {key} in inventory."}
+        text = (f"{item['description']}, SKU {item['sku']}. "
+                f"{item['quantity_available']} units available at {item['warehouse_location']}.")
+        return {"result": {"found": True, **item}, "text": text}
+
+    @property
+    def search_index(self) -> TrigramIndex:
+        """Trigram index over inventory descriptions, loaded on the first search"""
+        if self._search_index is None:
+            rows = self._query("SELECT sku, description FROM inventory")
+            self._search_index = TrigramIndex((row["sku"], row["description"]) for row in rows)
+        return self._search_index
+
+    def item_changed(self, sku: str, description: Optional[str] = None):
+        """
+        Keep the search index current: pass the new description, or None if the item is gone.
+        Batched lookups of the item are forgotten too.
+        """
+        self._forget(("inventory_lookup", "sku"), sku)
+        self._forget(("inventory_lookup", "barcode"))  # Its barcode may have changed: drop them all
+        if self._search_index is None:
+            return
+        if description is None:
+            self._search_index.remove(sku)
+        else:
+            self._search_index.add(sku, description)
+
+    def inventory_search(self, query: str, limit: int = 5) -> Dict[str, Any]:
+        ranked = self.search_index.search(query, limit=int(limit))
+        found = self._fetch_by(("inventory_lookup", "sku"), [sku for sku, _ in ranked]) if ranked else {}
+        matches = [{**found[sku], "score": score} for sku, score in ranked if sku in found]
+        if not matches:
+            return {"result": {"found": False, "items": []}, "text": f"No items match {query}."}
+        names = ", ".join(f"{m['description']} ({m['sku']})" for m in matches)
+        return {"result": {"found": True, "items": matches}, "text": f"{len(matches)} matches: {names}."}
+
+    def low_stock_alert(self, limit: int = 10) -> Dict[str, Any]:
+        items = self._query(
+            "SELECT sku, description, quantity_available, reorder_point FROM inventory "
+            "WHERE quantity_available <= reorder_point ORDER BY quantity_available"
+        )
+        if not items:
+            return {"result": {"count": 0, "items": []}, "text": "Nothing is below its reorder point."}
+        listed = ", ".join(f"{i['sku']} ({i['quantity_available']} left)" for i in items[:limit])
+        more = f", and {len(items) - limit} more" if len(items) > limit else ""
+        return {"result": {"count": len(items), "items": items},
+                "text": f"{len(items)} items are low on stock: {listed}{more}."}
+
+    # -- production ------------------------------------------------------------
+
+    def production_status(self, job_id: str) -> Dict[str, Any]:
+        return self._job_response(job_id, self._lookup(("production_status", "job_id"), job_id))
+
+    def _job_response(self, job_id: str, job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if job is None:
+            return {"result": {"found": False}, "text": f"I couldn't find job {job_id}."}
+        text = (f"{job['job_id']} for {job['customer_name']}: {job['status'].replace('_', ' ').lower()}, "
+                f"{job['quantity_produced']} of {job['quantity_ordered']} done.")
+        if job["estimated_completion"]:
+            text += f" Due {job['estimated_completion']}."
+        return {"result": {"found": True, **job}, "text": text}
+
+    @property
+    def aggregates(self) -> ProductionAggregates:
+        """
+        Production totals and due-date index, loaded on first use; job_changed keeps them
+        current. They are reloaded only when production_jobs is invalidated in the query
+        cache (or the cache is cleared), never because a cached result expired or was evicted.
+        """
+        generation = self.client.generation("production_jobs") if isinstance(self.client, CachedClient) else None
+        if self._aggregates is None or generation != self._aggregates_generation:
+            self._aggregates = ProductionAggregates(self._rows(self._execute(_AGGREGATE_SQL)))
+            self._aggregates_generation = generation
+        return self._aggregates
+
+    def job_changed(self, job_id: str, job: Optional[Dict[str, Any]] = None, day: Optional[str] = None):
+        """
+        Keep the aggregates current: pass the job's new row, or None if it is gone.
+        Newly produced units are credited to day (default today).
+        """
+        self._forget(("production_status", "job_id"), job_id)
+        if self._aggregates is None:
+            return
+        if job is None:
+            if job_id in self._aggregates.jobs:
+                self._aggregates.remove_job(job_id)
+        else:
+            self._aggregates.add_job({**job, "job_id": job_id}, day or self.today.isoformat())
+
+    def daily_production(self, day: Optional[str] = None) -> Dict[str, Any]:
+        summary = self.aggregates.summary(_iso_date(day, "day") or self.today.isoformat())
+        parts = ", ".join(f"{count} {status.replace('_', ' ').lower()}"
+                          for status, count in sorted(summary["by_status"].items()))
+        text = f"{summary['jobs']} jobs: {parts}. {summary['produced']} of {summary['ordered']} units produced"
+        if summary["produced_on_day"]:
+            text += f", {summary['produced_on_day']} of them on {summary['day']}"
+        urgent = summary["remaining_by_priority"].get("URGENT", 0)
+        if urgent:
+            text += f". {urgent} urgent units still to make"
+        return {"result": summary, "text": text + "."}
+
+    def overdue_jobs(self, as_of: Optional[str] = None, limit: int = 5) -> Dict[str, Any]:
+        as_of = _iso_date(as_of, "as_of") or self.today.isoformat()
+        jobs = [{column: job.get(column) for column in _JOB_FIELDS} for job in self.aggregates.overdue(as_of)]
+        if not jobs:
+            return {"result": {"count": 0, "jobs": []}, "text": "No jobs are overdue."}
+        listed = ", ".join(f"{j['job_id']} for {j['customer_name']}, due {j['estimated_completion']}"
+                           for j in jobs[:limit])
+        more = f", and {len(jobs) - limit} more" if len(jobs) > limit else ""
+        return {"result": {"count": len(jobs), "jobs": jobs},
+                "text": f"{len(jobs)} jobs are overdue: {listed}{more}."}
+
+    # -- customers -------------------------------------------------------------
+
+    def customer_orders(self, customer: str) -> Dict[str, Any]:
+        data = self.customers.get_order_status(customer)
+        return {"result": data, "text": self.customers.format_order_status_response(data)}
+
+    def customer_summary(self, customer: str) -> Dict[str, Any]:
+        data = self.customers.get_customer_summary(customer)
+        return {"result": data, "text": self.customers.format_customer_response(data)}
+
+    def top_customers(self, limit: int = 5) -> Dict[str, Any]:
+        top = self.customers.get_top_customers(int(limit))
+        listed = ", ".join(f"{c['name']} (${c['ytd_revenue']:,.0f})" for c in top)
+        return {"result": {"customers": top}, "text": f"Top customers: {listed}."}
+
+    # -- employees -------------------------------------------------------------
+
+    def employee_hours(self, employee_id: str, date_range: str = "this week") -> Dict[str, Any]:
+        data = self.employees.get_employee_hours(employee_id, date_range)
+        return {"result": data, "text": self.employees.format_hours_response(data)}
+
+    def employee_search(self, query: str) -> Dict[str, Any]:
+        data = self.employees.search_employees(query)
+        names = ", ".join(f"{e['name']} ({e['employee_id']})" for e in data["employees"][:5])
+        text = f"Found {data['count']}: {names}." if data["found"] else f"No employees match {query}."
+        return {"result": data, "text": text}
+
+    def department_roster(self, department: str, shift: Optional[str] = None,
+                          status: Optional[str] = None) -> Dict[str, Any]:
+        data = self.employees.get_department_roster(department, shift, status)
+        text = self.employees.format_roster_response(data)
+        # The Selection is decoded here, where the whole roster goes out as JSON
+        return {"result": {**data, "employees": data["employees"].to_list()}, "text": text}
+
+
+def main():
+    """CLI demo - one call to every tool"""
+    print("🧰 Skill Tools Demo")
+    print("=" * 50)
+
+    tools = SkillTools()
+    calls = [
+        ("inventory_lookup", {"sku": "ABC123"}),
+        ("inventory_lookup", {"barcode": "123456789012"}),
+        ("inventory_search", {"query": "carbon frame"}),
+        ("low_stock_alert", {}),
+        ("production_status", {"job_id": "JOB001"}),
+        ("customer_orders", {"customer": "City"}),
+        ("customer_summary", {"customer": "Acme"}),
+        ("top_customers", {"limit": 3}),
+        ("daily_production", {}),
+        ("overdue_jobs", {"as_of": "2026-02-18"}),
+        ("employee_hours", {"employee_id": "EMP001"}),
+        ("employee_search", {"query": "John"}),
+        ("department_roster", {"department": "Assembly"}),
+    ]
+    for name, arguments in calls:
+        print(f"\n🔍 {name}({', '.join(f'{k}={v!r}' for k, v in arguments.items())})")
+        print(f"   {tools.call(name, arguments)['text']}")
+
+if __name__ == "__main__":
+    main()
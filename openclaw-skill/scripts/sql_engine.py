@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+SQL Subset Engine for the Mock Warehouse
+SELECT <columns|*> FROM <table> [WHERE ...] [ORDER BY ...] [LIMIT n] over in-memory tables
+"""
+
+import operator
+import re
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Any, List, Optional, Callable, Iterable, Iterator, Tuple
+
+
+class SqlError(ValueError):
+    """Raised for statements outside the supported subset"""
+
+
+def type_mismatch(a: Any, b: Any) -> SqlError:
+    """Error for an ordering comparison between a string and a number (no implicit cast)"""
+    return SqlError(f"Cannot compare {type(a).__name__} {a!r} with {type(b).__name__} {b!r}")
+
+
+# Tokens: string literal, number, named parameter, comparison operator, identifier, punctuation
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<param>:[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op><=|>=|<>|!=|=|<|>)
+      | (?P<ident>`[^`]+`|[A-Za-z_][A-Za-z0-9_]*(?:\.(?:`[^`]+`|[A-Za-z_][A-Za-z0-9_]*))*)
+      | (?P<punct>[(),*;])
+    )""", re.VERBOSE)
+
+_KEYWORDS = {
+    "select", "from", "where", "and", "or", "not", "order", "by",
+    "asc", "desc", "limit", "null", "true", "false", "is", "as", "in",
+}
+
+_COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+Token = Tuple[str, str]
+Predicate = Callable[[Dict[str, Any], Dict[str, Any]], bool]
+
+
+def tokenize(sql: str) -> List[Token]:
+    """Split SQL into (kind, text) tokens; keywords and identifiers are case-folded"""
+    tokens = []
+    pos = 0
+    sql = sql.strip()
+    while pos < len(sql):
+        match = _TOKEN_RE.match(sql, pos)
+        if not match or match.end() == pos:
+            raise SqlError(f"Unexpected input at: {sql[pos:pos + 20]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "ident":
+            text = text.replace("`", "").lower()
+            if text in _KEYWORDS:
+                kind = "keyword"
+        tokens.append((kind, text))
+    return tokens
+
+
+def _join_tokens(tokens: List[Token]) -> str:
+    return " ".join(text for _, text in tokens).rstrip(" ;")
+
+
+def normalize_sql(sql: str) -> str:
+    """Canonical statement text used as the plan cache key"""
+    return _join_tokens(tokenize(sql))
+
+
+def statement_key(sql: str, parameters: Any = None) -> str:
+    """
+    Identity of a statement plus its bound parameters, for caching and de-duplication.
+    Falls back to whitespace-collapsed text for SQL outside the supported subset.
+    """
+    try:
+        text = normalize_sql(sql)
+    except SqlError:
+        text = " ".join(sql.split()).rstrip(" ;")
+    if not parameters:
+        return text
+    if isinstance(parameters, dict):
+        bound = sorted((str(k), repr(v)) for k, v in parameters.items())
+    else:
+        bound = sorted((str(p.get("name")), repr(p.get("value"))) for p in parameters)
+    return text + " -- " + ", ".join(f"{k}={v}" for k, v in bound)
+
+
+def referenced_tables(sql: str) -> List[str]:
+    """Table names (last dotted segment) after FROM or JOIN; empty if sql cannot be tokenized"""
+    try:
+        tokens = tokenize(sql)
+    except SqlError:
+        return []
+    return [tokens[i + 1][1].split(".")[-1]
+            for i, (_, text) in enumerate(tokens[:-1])
+            if text in ("from", "join") and tokens[i + 1][0] == "ident"]
+
+
+class Table:
+    """Rows (dicts) with an ordered column list and optional hash indexes (value -> row positions)"""
+
+    def __init__(self, name: str, columns: List[str], rows: List[Dict[str, Any]],
+                 indexed: Iterable[str] = ()):
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self.indexed = set(indexed)
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {}
+
+    def index(self, column: str) -> Dict[Any, List[int]]:
+        """Hash index on column, built on first use"""
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for position, row in enumerate(self.rows):
+                index.setdefault(row.get(column), []).append(position)
+            self._indexes[column] = index
+        return index
+
+    def invalidate(self):
+        """Drop cached indexes after rows change"""
+        self._indexes.clear()
+
+    def filter(self, plan: "Plan", params: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Rows matching the plan's WHERE clause, in table order"""
+        rows: Iterable[Dict[str, Any]] = self.rows
+        if plan.lookup and plan.lookup[0] in self.indexed:
+            column, values = plan.lookup
+            rows = [self.rows[p] for p in lookup_positions(self.index(column), values(params))]
+            if plan.lookup_exact:
+                return rows
+
+        if plan.predicate is not None:
+            predicate = plan.predicate
+            rows = (row for row in rows if predicate(row, params))
+        return rows
+
+
+def lookup_positions(index: Dict[Any, List[int]], values: List[Any]) -> List[int]:
+    """Positions of rows whose indexed value is one of values, in table order (NULL never matches)"""
+    if len(values) == 1:
+        return index.get(values[0], []) if values[0] is not None else []
+    positions = set()
+    for value in values:
+        if value is not None:
+            positions.update(index.get(value, ()))
+    return sorted(positions)
+
+
+class Plan:
+    """Parsed SELECT statement, reusable across executions and parameter values"""
+
+    def __init__(self, table: str, columns: Optional[List[str]], predicate: Optional[Predicate],
+                 order_by: List[Tuple[str, bool]], limit: Optional[int],
+                 lookup: Optional[Tuple[str, Callable[[Dict[str, Any]], List[Any]]]],
+                 conjuncts: Optional[List[Tuple[Callable, str, Callable]]] = None,
+                 lookup_exact: bool = False, referenced: Iterable[str] = ()):
+        self.table = table
+        self.columns = columns          # None means SELECT *
+        self.predicate = predicate
+        self.order_by = order_by        # [(column, descending)]
+        self.limit = limit
+        self.lookup = lookup            # (column, values getter) for an indexable = or IN
+        self.lookup_exact = lookup_exact  # The lookup is the whole WHERE clause
+        # WHERE as (left operand, operator, right operand) joined by AND, when it is
+        # that simple; column stores evaluate these as whole-column masks
+        self.conjuncts = conjuncts
+        # Columns named in WHERE and ORDER BY, checked against the table like the projection
+        self.referenced = list(dict.fromkeys(referenced))
+
+
+class _Parser:
+    """Recursive-descent parser producing a Plan"""
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+        self.lookups: List[Tuple[str, Callable[[Dict[str, Any]], List[Any]]]] = []
+        self.conjuncts: List[Tuple[Callable, str, Callable]] = []
+        self.simple = True
+        self.top_terms = 0
+        self.referenced: List[str] = []
+
+    def peek(self, offset: int = 0) -> Token:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else ("eof", "")
+
+    def next(self) -> Token:
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def accept(self, kind: str, text: Optional[str] = None) -> bool:
+        token_kind, token_text = self.peek()
+        if token_kind == kind and (text is None or token_text == text):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind: str, text: Optional[str] = None) -> str:
+        token_kind, token_text = self.next()
+        if token_kind != kind or (text is not None and token_text != text):
+            raise SqlError(f"Expected {text or kind}, got {token_text or 'end of statement'!r}")
+        return token_text
+
+    def parse(self) -> Plan:
+        self.expect("keyword", "select")
+        columns = self.parse_projection()
+        self.expect("keyword", "from")
+        table = self.expect("ident").split(".")[-1]
+
+        predicate = None
+        if self.accept("keyword", "where"):
+            predicate = self.parse_or(top_level=True)
+
+        order_by = []
+        if self.accept("keyword", "order"):
+            self.expect("keyword", "by")
+            order_by = self.parse_order_by()
+
+        limit = None
+        if self.accept("keyword", "limit"):
+            limit = int(self.expect("number"))
+            if limit < 0:
+                raise SqlError("LIMIT must be non-negative")
+
+        self.accept("punct", ";")
+        if self.peek()[0] != "eof":
+            raise SqlError(f"Unexpected {self.peek()[1]!r}")
+
+        lookup = self.lookups[0] if self.lookups else None
+        conjuncts = self.conjuncts if predicate is not None and self.simple else None
+        return Plan(table, columns, predicate, order_by, limit, lookup, conjuncts,
+                    lookup_exact=lookup is not None and self.top_terms == 1,
+                    referenced=self.referenced + [column for column, _ in order_by])
+
+    def parse_projection(self) -> Optional[List[str]]:
+        if self.accept("punct", "*"):
+            return None
+        columns = [self.expect("ident").split(".")[-1]]
+        while self.accept("punct", ","):
+            columns.append(self.expect("ident").split(".")[-1])
+        return columns
+
+    def parse_order_by(self) -> List[Tuple[str, bool]]:
+        items = []
+        while True:
+            column = self.expect("ident").split(".")[-1]
+            descending = False
+            if self.accept("keyword", "desc"):
+                descending = True
+            else:
+                self.accept("keyword", "asc")
+            items.append((column, descending))
+            if not self.accept("punct", ","):
+                return items
+
+    def parse_or(self, top_level: bool = False) -> Predicate:
+        terms = [self.parse_and(top_level)]
+        while self.accept("keyword", "or"):
+            terms.append(self.parse_and(False))
+        if len(terms) > 1:
+            # With a top-level OR, no single equality narrows every match
+            if top_level:
+                self.lookups.clear()
+                self.simple = False
+            return lambda row, params: any(term(row, params) for term in terms)
+        return terms[0]
+
+    def parse_and(self, top_level: bool) -> Predicate:
+        terms = [self.parse_not(top_level)]
+        while self.accept("keyword", "and"):
+            terms.append(self.parse_not(top_level))
+        if top_level:
+            self.top_terms += len(terms)
+        if len(terms) > 1:
+            return lambda row, params: all(term(row, params) for term in terms)
+        return terms[0]
+
+    def parse_not(self, top_level: bool) -> Predicate:
+        if top_level and self.peek() in (("keyword", "not"), ("punct", "(")):
+            self.simple = False
+        if self.accept("keyword", "not"):
+            term = self.parse_not(False)
+            return lambda row, params: not term(row, params)
+        if self.accept("punct", "("):
+            term = self.parse_or(False)
+            self.expect("punct", ")")
+            return term
+        return self.parse_comparison(top_level)
+
+    def parse_comparison(self, top_level: bool) -> Predicate:
+        left = self.parse_operand()
+
+        if self.peek() == ("keyword", "in") or self.peek() == ("keyword", "not") and self.peek(1) == ("keyword", "in"):
+            return self.parse_in(left, top_level)
+
+        if self.accept("keyword", "is"):
+            if top_level:
+                self.simple = False
+            negate = self.accept("keyword", "not")
+            self.expect("keyword", "null")
+            if negate:
+                return lambda row, params: left(row, params) is not None
+            return lambda row, params: left(row, params) is None
+
+        op_text = self.expect("op")
+        right = self.parse_operand()
+        compare = _COMPARISONS[op_text]
+
+        if top_level:
+            self.conjuncts.append((left, op_text, right))
+
+        if top_level and op_text == "=":
+            left_kind, right_kind = left.kind, right.kind
+            if left_kind == "column" and right_kind != "column":
+                self.lookups.append((left.column, lambda params: [right(None, params)]))
+            elif right_kind == "column" and left_kind != "column":
+                self.lookups.append((right.column, lambda params: [left(None, params)]))
+
+        def predicate(row, params):
+            a = left(row, params)
+            b = right(row, params)
+            # SQL semantics: any comparison against NULL is not true
+            if a is None or b is None:
+                return False
+            try:
+                return compare(a, b)
+            except TypeError:
+                raise type_mismatch(a, b) from None
+        return predicate
+
+    def parse_in(self, left, top_level: bool) -> Predicate:
+        negate = self.accept("keyword", "not")
+        self.expect("keyword", "in")
+        self.expect("punct", "(")
+        items = [self.parse_operand()]
+        while self.accept("punct", ","):
+            items.append(self.parse_operand())
+        self.expect("punct", ")")
+
+        if top_level:
+            self.simple = False
+            if not negate and left.kind == "column" and all(item.kind != "column" for item in items):
+                self.lookups.append((left.column, lambda params: [item(None, params) for item in items]))
+
+        def predicate(row, params):
+            value = left(row, params)
+            values = [item(row, params) for item in items]
+            if value is None:
+                return False
+            if value in values:
+                return not negate
+            # x NOT IN (..., NULL) is never true
+            return negate and None not in values
+        return predicate
+
+    def parse_operand(self):
+        kind, text = self.next()
+        if kind == "ident":
+            column = text.split(".")[-1]
+            self.referenced.append(column)
+            getter = lambda row, params: row.get(column)
+            getter.kind, getter.column = "column", column
+        elif kind == "string":
+            value = text[1:-1].replace("''", "'")
+            getter = lambda row, params: value
+            getter.kind = "literal"
+        elif kind == "number":
+            value = float(text) if "." in text else int(text)
+            getter = lambda row, params: value
+            getter.kind = "literal"
+        elif kind == "param":
+            name = text[1:]
+            def getter(row, params):
+                if name not in params:
+                    raise SqlError(f"No value bound for parameter :{name}")
+                return params[name]
+            getter.kind = "param"
+        elif kind == "keyword" and text in ("null", "true", "false"):
+            value = {"null": None, "true": True, "false": False}[text]
+            getter = lambda row, params: value
+            getter.kind = "literal"
+        else:
+            raise SqlError(f"Expected a column or value, got {text or 'end of statement'!r}")
+        return getter
+
+
+def _sort_key(column: str, descending: bool) -> Callable[[Dict[str, Any]], Any]:
+    # NULLs sort last in either direction, as in Databricks SQL
+    def key(row):
+        value = row.get(column)
+        return (value is not None) if descending else (value is None), value
+    return key
+
+
+class SqlEngine:
+    """Executes the supported SELECT subset over registered tables, caching parsed plans"""
+
+    def __init__(self, plan_cache_size: int = 256):
+        self.tables: Dict[str, Table] = {}
+        self._factories: Dict[str, Callable[[], Table]] = {}
+        self._build_lock = threading.Lock()
+        self._plan_lock = threading.Lock()
+        self._aliases: Dict[str, str] = {}
+        self._plans: "OrderedDict[str, Plan]" = OrderedDict()
+        self._plan_cache_size = plan_cache_size
+        self.plan_hits = 0
+        self.plan_misses = 0
+
+    def register(self, table: Table, aliases: Iterable[str] = ()):
+        self.tables[table.name] = table
+        self._add_aliases(table.name, aliases)
+
+    def register_lazy(self, name: str, factory: Callable[[], Table], aliases: Iterable[str] = ()):
+        """Register a table that is only built (by factory) the first time it is queried"""
+        self._factories[name] = factory
+        self._add_aliases(name, aliases)
+
+    def _add_aliases(self, name: str, aliases: Iterable[str]):
+        self._aliases[name] = name
+        for alias in aliases:
+            self._aliases[alias] = name
+
+    def table_name(self, name: str) -> str:
+        """Canonical name for a table or alias"""
+        table_name = self._aliases.get(name)
+        if table_name is None:
+            raise SqlError(f"Table or view not found: {name}")
+        return table_name
+
+    def table(self, name: str) -> Table:
+        """A registered table, building it now if it was registered lazily"""
+        table = self.tables.get(name)
+        if table is None:
+            with self._build_lock:
+                table = self.tables.get(name)
+                if table is None:
+                    table = self._factories[name]()
+                    self.tables[name] = table
+                    del self._factories[name]
+        return table
+
+    def resolve(self, name: str) -> Table:
+        return self.table(self.table_name(name))
+
+    def plan(self, sql: str) -> Plan:
+        """Parse sql, or return the cached plan for the same normalized text"""
+        tokens = tokenize(sql)
+        key = _join_tokens(tokens)
+
+        with self._plan_lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self.plan_hits += 1
+                self._plans.move_to_end(key)
+                return plan
+            self.plan_misses += 1
+
+        plan = _Parser(tokens).parse()
+        plan.table = self.table_name(plan.table)
+        with self._plan_lock:
+            self._plans[key] = plan
+            if len(self._plans) > self._plan_cache_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def columns(self, plan: Plan) -> List[str]:
+        """Output column names for a plan"""
+        return plan.columns if plan.columns is not None else self.table(plan.table).columns
+
+    def iter_rows(self, plan: Plan, parameters: Optional[Dict[str, Any]] = None) -> Iterator[List[Any]]:
+        """Yield projected rows lazily; without ORDER BY a LIMIT stops the scan early"""
+        params = parameters or {}
+        table = self.table(plan.table)
+        columns = self.columns(plan)
+        unknown = [c for c in dict.fromkeys(columns + plan.referenced) if c not in table.columns]
+        if unknown:
+            raise SqlError(f"Unknown column(s) in {table.name}: {', '.join(unknown)}")
+
+        rows = table.filter(plan, params)
+
+        if plan.order_by:
+            rows = list(rows)
+            # Stable sorts applied from the last key to the first give a multi-key order
+            for column, descending in reversed(plan.order_by):
+                rows.sort(key=_sort_key(column, descending), reverse=descending)
+
+        if plan.limit is not None:
+            rows = islice(rows, plan.limit)
+
+        for row in rows:
+            yield [row.get(c) for c in columns]
+
+    def execute(self, sql: str, parameters: Optional[Dict[str, Any]] = None) -> Tuple[List[str], List[List[Any]]]:
+        """Run sql and return (column names, rows)"""
+        plan = self.plan(sql)
+        return self.columns(plan), list(self.iter_rows(plan, parameters))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Startup Profile
+Per-module import time and time-to-first-tool-result of a cold process,
+checked against a start-up budget
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, Any, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Milliseconds a cold tool call may spend before answering (interpreter launch excluded)
+DEFAULT_BUDGET = {
+    "import_ms": 40.0,
+    "first_result_ms": 100.0,
+}
+
+# Runs inside the profiled process, after interpreter start-up
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {scripts!r})
+import skill_tools
+imported = time.perf_counter()
+tools = skill_tools.SkillTools()
+ready = time.perf_counter()
+response = tools.call({tool!r}, {arguments!r})
+answered = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "init_ms": (ready - imported) * 1000,
+    "first_call_ms": (answered - ready) * 1000,
+    "first_result_ms": (answered - started) * 1000,
+    "ok": "text" in response,
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Rows of `python -X importtime` output: module, depth, self_ms, cumulative_ms"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  <self> | <cumulative> |   <two spaces per nesting level><name>"
+        self_part, cumulative_us, name = line.split("|", 2)
+        self_us = self_part.split(":", 1)[1]
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append({
+            "module": name.strip(),
+            "depth": depth,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def profile_once(tool: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Start a fresh interpreter, make one tool call, and collect its timings"""
+    code = _CHILD.format(scripts=SCRIPTS_DIR, tool=tool, arguments=arguments)
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               capture_output=True, text=True, cwd=SCRIPTS_DIR)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["modules"] = parse_importtime(completed.stderr)
+    return timings
+
+
+def profile(tool: str = "inventory_lookup", arguments: Optional[Dict[str, Any]] = None,
+            runs: int = 3) -> Dict[str, Any]:
+    """Best of `runs` cold starts (the least disturbed by other work on the machine)"""
+    arguments = {"sku": "ABC123"} if arguments is None and tool == "inventory_lookup" else arguments or {}
+    results = [profile_once(tool, arguments) for _ in range(runs)]
+    best = min(results, key=lambda r: r["first_result_ms"])
+    best["tool"] = tool
+    best["arguments"] = arguments
+    return best
+
+
+def check_budget(result: Dict[str, Any], budget: Dict[str, float]) -> List[str]:
+    """Budget lines that were exceeded"""
+    return [
+        f"{metric}: {result[metric]:.1f} ms > {limit:.1f} ms"
+        for metric, limit in budget.items()
+        if result.get(metric, 0.0) > limit
+    ]
+
+
+def report(result: Dict[str, Any], budget: Dict[str, float], top: int = 10):
+    local = {name[:-3] for name in os.listdir(SCRIPTS_DIR) if name.endswith(".py")}
+    modules = result["modules"]
+
+    print(f"\n⏱️  Cold start: {result['tool']}({', '.join(f'{k}={v!r}' for k, v in result['arguments'].items())})")
+    for metric in ("import_ms", "init_ms", "first_call_ms", "first_result_ms"):
+        limit = budget.get(metric)
+        status = "" if limit is None else ("  ✅" if result[metric] <= limit else "  ❌") + f" budget {limit:.0f} ms"
+        print(f"   {metric:<16} {result[metric]:8.1f} ms{status}")
+
+    print("\n📦 Skill modules (cumulative includes what they import)")
+    for m in modules:
+        if m["module"].split(".")[-1] in local:
+            print(f"   {m['module']:<24} self {m['self_ms']:7.2f} ms   cumulative {m['cumulative_ms']:7.2f} ms")
+
+    print(f"\n🐘 Heaviest top-level imports")
+    heaviest = sorted((m for m in modules if m["depth"] == 0), key=lambda m: -m["cumulative_ms"])[:top]
+    for m in heaviest:
+        print(f"   {m['module']:<24} {m['cumulative_ms']:7.2f} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: profile a cold tool call; exits 1 when over budget"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cold-start profile of one tool call")
+    parser.add_argument("tool", nargs="?", default="inventory_lookup")
+    parser.add_argument("arguments", nargs="*", help="key=value tool arguments")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", help="JSON file overriding the default budget")
+    parser.add_argument("--json", action="store_true", help="print the raw result as JSON")
+    args = parser.parse_args(argv)
+
+    arguments = None
+    if args.arguments:
+        try:
+            from tool_cli import parse_arguments
+        except ImportError:
+            from scripts.tool_cli import parse_arguments
+        arguments = parse_arguments(args.arguments)
+
+    budget = dict(DEFAULT_BUDGET)
+    if args.budget:
+        with open(args.budget) as f:
+            budget.update(json.load(f))
+
+    result = profile(args.tool, arguments, args.runs)
+    over = check_budget(result, budget)
+    if args.json:
+        print(json.dumps({**result, "budget": budget, "over_budget": over}, indent=2))
+    else:
+        report(result, budget)
+        print("\n" + ("❌ Over budget:\n   " + "\n   ".join(over) if over else "✅ Within budget"))
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
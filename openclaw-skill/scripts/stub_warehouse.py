@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Stub Statement Execution API Server
+Local HTTP stand-in for a Databricks SQL warehouse, backed by the mock tables,
+so DatabricksClient can be exercised end to end without credentials
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any
+
+try:
+    from mock_databricks import MockDatabricksClient
+except ImportError:
+    from scripts.mock_databricks import MockDatabricksClient
+
+STATEMENTS_PATH = "/api/2.0/sql/statements"
+_STATEMENT_RE = re.compile(rf"^{STATEMENTS_PATH}/([^/]+)$")
+_CHUNK_RE = re.compile(rf"^{STATEMENTS_PATH}/([^/]+)/result/chunks/(\d+)$")
+_CANCEL_RE = re.compile(rf"^{STATEMENTS_PATH}/([^/]+)/cancel$")
+
+
+class _Statement:
+    def __init__(self, statement_id: str, response: Dict[str, Any], ready_at: float):
+        self.statement_id = statement_id
+        self.response = response
+        self.ready_at = ready_at
+        self.canceled = False
+
+
+class StubWarehouse:
+    """
+    Runs statements on the mock client and serves them like the real API:
+    PENDING/RUNNING until `latency` seconds pass, then SUCCEEDED with results
+    split into chunks of `chunk_rows` rows.
+    """
+
+    def __init__(self, token: str = "stub-token", warehouse_id: str = "stub-warehouse",
+                 latency: float = 0.0, chunk_rows: int = 1000, dataset=None):
+        self.token = token
+        self.warehouse_id = warehouse_id
+        self.latency = latency
+        self.chunk_rows = chunk_rows
+        self.client = MockDatabricksClient(dataset, verbose=False)
+        self.statements: Dict[str, _Statement] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def submit(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if body.get("warehouse_id") != self.warehouse_id:
+            raise _ApiError(404, "RESOURCE_DOES_NOT_EXIST", f"Warehouse {body.get('warehouse_id')} not found")
+
+        with self._lock:
+            result = self.client.execute_statement(body.get("statement", ""), parameters=body.get("parameters"))
+        statement_id = uuid.uuid4().hex
+        if result["status"]["state"] == "SUCCEEDED":
+            rows = result["result"]["data_array"]
+            if "row_limit" in body:
+                rows = rows[:int(body["row_limit"])]
+            response = self._succeeded(statement_id, rows, result["result"]["manifest"])
+        else:
+            response = {"statement_id": statement_id, "status": result["status"]}
+
+        statement = _Statement(statement_id, response, time.monotonic() + self.latency)
+        with self._lock:
+            self.statements[statement_id] = statement
+
+        # Like the real API, hold the request up to wait_timeout for a result
+        wait = float(str(body.get("wait_timeout", "10s")).rstrip("s") or 0)
+        remaining = statement.ready_at - time.monotonic()
+        if remaining > 0 and wait > 0:
+            time.sleep(min(remaining, wait))
+        return self.status(statement_id)
+
+    def _succeeded(self, statement_id: str, rows, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        size = self.chunk_rows
+        chunks = [rows[i:i + size] for i in range(0, len(rows), size)] or [[]]
+        return {
+            "statement_id": statement_id,
+            "status": {"state": "SUCCEEDED"},
+            "manifest": {
+                "format": "JSON_ARRAY",
+                "schema": manifest["schema"],
+                "total_chunk_count": len(chunks),
+                "total_row_count": len(rows),
+                "chunks": [
+                    {"chunk_index": i, "row_offset": i * size, "row_count": len(chunk)}
+                    for i, chunk in enumerate(chunks)
+                ],
+            },
+            "_chunks": chunks,
+        }
+
+    def _chunk(self, response: Dict[str, Any], index: int) -> Dict[str, Any]:
+        chunks = response["_chunks"]
+        chunk = {
+            "chunk_index": index,
+            "row_offset": index * self.chunk_rows,
+            "row_count": len(chunks[index]),
+            "data_array": chunks[index],
+        }
+        if index + 1 < len(chunks):
+            chunk["next_chunk_index"] = index + 1
+            chunk["next_chunk_internal_link"] = f"{STATEMENTS_PATH}/{response['statement_id']}/result/chunks/{index + 1}"
+        return chunk
+
+    def _get(self, statement_id: str) -> _Statement:
+        statement = self.statements.get(statement_id)
+        if statement is None:
+            raise _ApiError(404, "RESOURCE_DOES_NOT_EXIST", f"Statement {statement_id} not found")
+        return statement
+
+    def status(self, statement_id: str) -> Dict[str, Any]:
+        statement = self._get(statement_id)
+        if statement.canceled:
+            return {"statement_id": statement_id, "status": {"state": "CANCELED"}}
+        if time.monotonic() < statement.ready_at:
+            return {"statement_id": statement_id, "status": {"state": "RUNNING"}}
+
+        response = statement.response
+        if "_chunks" not in response:
+            return response
+        public = {k: v for k, v in response.items() if k != "_chunks"}
+        public["result"] = self._chunk(response, 0)
+        return public
+
+    def chunk(self, statement_id: str, index: int) -> Dict[str, Any]:
+        statement = self._get(statement_id)
+        chunks = statement.response.get("_chunks")
+        if chunks is None or time.monotonic() < statement.ready_at or not 0 <= index < len(chunks):
+            raise _ApiError(400, "INVALID_PARAMETER_VALUE", f"Chunk {index} is not available")
+        return self._chunk(statement.response, index)
+
+    def cancel(self, statement_id: str) -> Dict[str, Any]:
+        self._get(statement_id).canceled = True
+        return {}
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """Start serving on a background thread; port 0 picks a free port"""
+        server = ThreadingHTTPServer((host, port), _make_handler(self))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class _ApiError(Exception):
+    def __init__(self, status: int, error_code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.error_code = error_code
+        self.message = message
+
+
+def _make_handler(warehouse: StubWarehouse):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real endpoint
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: Dict[str, Any]):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _dispatch(self, action):
+            warehouse.requests += 1
+            if self.headers.get("Authorization") != f"Bearer {warehouse.token}":
+                return self._send(401, {"error_code": "UNAUTHENTICATED", "message": "Invalid access token"})
+            try:
+                self._send(200, action())
+            except _ApiError as e:
+                self._send(e.status, {"error_code": e.error_code, "message": e.message})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == STATEMENTS_PATH:
+                return self._dispatch(lambda: warehouse.submit(body))
+            match = _CANCEL_RE.match(self.path)
+            if match:
+                return self._dispatch(lambda: warehouse.cancel(match.group(1)))
+            self._send(404, {"error_code": "ENDPOINT_NOT_FOUND", "message": self.path})
+
+        def do_GET(self):
+            match = _CHUNK_RE.match(self.path)
+            if match:
+                return self._dispatch(lambda: warehouse.chunk(match.group(1), int(match.group(2))))
+            match = _STATEMENT_RE.match(self.path)
+            if match:
+                return self._dispatch(lambda: warehouse.status(match.group(1)))
+            self._send(404, {"error_code": "ENDPOINT_NOT_FOUND", "message": self.path})
+
+    return Handler
+
+
+def main():
+    """CLI: serve the stub warehouse until interrupted"""
+    parser = argparse.ArgumentParser(description="Stub Databricks Statement Execution API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default="stub-token")
+    parser.add_argument("--warehouse-id", default="stub-warehouse")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds a statement stays RUNNING")
+    parser.add_argument("--chunk-rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    warehouse = StubWarehouse(args.token, args.warehouse_id, args.latency, args.chunk_rows)
+    server = warehouse.serve(port=args.port)
+    host, port = server.server_address
+    print("🧪 Stub Databricks warehouse")
+    print(f"   DATABRICKS_HOST=http://{host}:{port}")
+    print(f"   DATABRICKS_TOKEN={args.token}")
+    print(f"   DATABRICKS_WAREHOUSE_ID={args.warehouse_id}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
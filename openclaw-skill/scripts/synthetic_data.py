@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for the Mock Tables
+Seeded, referentially consistent inventory, jobs, employees and customers at any size
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+
+TABLES = ("inventory", "production_jobs", "employees", "customers")
+
+# Rows per table relative to the inventory row count
+DEFAULT_RATIOS = {"inventory": 1.0, "production_jobs": 0.5, "employees": 0.05, "customers": 0.01}
+
+# Matches the "today" used by the hand-written mock data
+REFERENCE_DATE = date(2026, 2, 18)
+
+_COLORS = ["Red", "Blue", "Black", "White", "Green", "Silver", "Orange", "Yellow", "Matte Grey", "Navy"]
+_MATERIALS = ["Carbon", "Aluminum", "Steel", "Titanium", "Chromoly", "Nylon", "Rubber", "Kevlar"]
+_PRODUCTS = [
+    "Bicycle Helmet", "Mountain Bike Frame", "Road Bike Frame", "Hydraulic Brake Set", "Seat Post",
+    "Handlebar", "Crankset", "Chain", "Cassette", "Derailleur", "Wheelset", "Tire", "Inner Tube",
+    "Saddle", "Pedal Set", "Fork", "Stem", "Headset", "Bottom Bracket", "Brake Pads",
+]
+_FIRST_NAMES = [
+    "John", "Sarah", "Mike", "Lisa", "David", "Emma", "James", "Olivia", "Robert", "Sophia",
+    "Daniel", "Mia", "Carlos", "Aisha", "Wei", "Priya", "Tom", "Grace", "Ahmed", "Nina",
+]
+_LAST_NAMES = [
+    "Smith", "Johnson", "Chen", "Rodriguez", "Brown", "Garcia", "Nguyen", "Patel", "Kim", "Lopez",
+    "Wilson", "Martin", "Singh", "Clark", "Lewis", "Walker", "Young", "Hall", "Allen", "King",
+]
+_DEPARTMENTS = ["Assembly", "Quality Control", "Shipping", "Receiving", "Paint Shop", "Maintenance", "Carbon Fiber Shop"]
+_SHIFTS = ["Day", "Night", "Swing"]
+_EMPLOYEE_STATUSES = [("Active", 0.9), ("On Leave", 0.07), ("Inactive", 0.03)]
+_COMPANY_PREFIXES = [
+    "Acme", "Mountain", "City", "Racing", "Summit", "Urban", "Trail", "Velo", "Peak", "Coastal",
+    "Northern", "Metro", "Alpine", "Desert", "Valley", "River", "Prairie", "Harbor", "Canyon", "Pioneer",
+]
+_COMPANY_SUFFIXES = [
+    "Bicycle Co", "Adventures", "Cycles", "Team Pro", "Bikes", "Wheelworks", "Outfitters",
+    "Sports", "Rides", "Supply", "Cycle Shop", "Gear",
+]
+_WORK_CENTERS = ["Assembly Line 1", "Assembly Line 2", "Carbon Fiber Shop", "Prototype Shop", "Paint Shop", "Wheel Build"]
+_JOB_STATUSES = [("IN_PROGRESS", 0.45), ("COMPLETED", 0.35), ("DELAYED", 0.1), ("SCHEDULED", 0.1)]
+_PRIORITIES = [("NORMAL", 0.7), ("HIGH", 0.2), ("URGENT", 0.1)]
+
+
+def _rng(seed: int, table: str) -> random.Random:
+    # One stream per table, so changing one table's size never reshuffles another
+    return random.Random(f"{seed}:{table}")
+
+
+def _weighted(rng: random.Random, choices) -> str:
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def table_sizes(rows: int) -> Dict[str, int]:
+    """Row counts for every table, scaled from an inventory size"""
+    return {table: max(1, int(rows * ratio)) for table, ratio in DEFAULT_RATIOS.items()}
+
+
+def iter_inventory(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "inventory")
+    for i in range(count):
+        on_hand = rng.randint(0, 1000)
+        reserved = rng.randint(0, on_hand // 4)
+        yield {
+            "sku": f"SKU{i:08d}",
+            "description": f"{rng.choice(_COLORS)} {rng.choice(_MATERIALS)} {rng.choice(_PRODUCTS)}",
+            "barcode": f"{200000000000 + i:012d}",
+            "quantity_on_hand": on_hand,
+            "quantity_reserved": reserved,
+            "quantity_available": on_hand - reserved,
+            "warehouse_location": f"{rng.choice('ABCDEFGH')}-{rng.randint(1, 40):02d}-{rng.randint(1, 6)}",
+            "last_updated": (REFERENCE_DATE - timedelta(days=rng.randint(0, 30))).isoformat(),
+            "unit_cost": round(rng.uniform(2.0, 900.0), 2),
+            "reorder_point": rng.randint(5, 150),
+        }
+
+
+def iter_employees(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "employees")
+    for i in range(count):
+        status = _weighted(rng, _EMPLOYEE_STATUSES)
+        this_week = 0.0 if status != "Active" else round(rng.uniform(20, 50) * 2) / 2
+        yield {
+            "employee_id": f"EMP{i:07d}",
+            "name": f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+            "department": rng.choice(_DEPARTMENTS),
+            "shift": rng.choice(_SHIFTS),
+            "hours_this_week": this_week,
+            "hours_last_week": round(rng.uniform(20, 50) * 2) / 2,
+            "status": status,
+        }
+
+
+def customer_names(count: int, seed: int = 42) -> List[str]:
+    """Unique company names; numbered once the word combinations run out"""
+    rng = _rng(seed, "customer_names")
+    combos = [f"{p} {s}" for p in _COMPANY_PREFIXES for s in _COMPANY_SUFFIXES]
+    rng.shuffle(combos)
+    return [combos[i] if i < len(combos) else f"{combos[i % len(combos)]} {i // len(combos) + 1}"
+            for i in range(count)]
+
+
+class _CustomerTotals:
+    """Per-customer aggregates accumulated while jobs are generated"""
+
+    def __init__(self, count: int):
+        self.total_orders = [0] * count
+        self.outstanding_orders = [0] * count
+        self.revenue = [0.0] * count
+
+
+def iter_jobs(count: int, names: List[str], seed: int = 42,
+              totals: Optional[_CustomerTotals] = None) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "production_jobs")
+    for i in range(count):
+        customer = rng.randrange(len(names))
+        status = _weighted(rng, _JOB_STATUSES)
+        ordered = rng.randint(5, 500)
+        if status == "COMPLETED":
+            produced = ordered
+        elif status == "SCHEDULED":
+            produced = 0
+        else:
+            produced = rng.randint(0, ordered - 1)
+        start = REFERENCE_DATE - timedelta(days=rng.randint(0, 120))
+        due = start + timedelta(days=rng.randint(5, 60))
+
+        job = {
+            "job_id": f"JOB{i:08d}",
+            "customer_name": names[customer],
+            "product_description": f"{ordered}x {rng.choice(_COLORS)} {rng.choice(_PRODUCTS)}",
+            "quantity_ordered": ordered,
+            "quantity_produced": produced,
+            "quantity_remaining": ordered - produced,
+            "status": status,
+            "start_date": start.isoformat(),
+            "priority": _weighted(rng, _PRIORITIES),
+            "assigned_work_center": rng.choice(_WORK_CENTERS),
+        }
+        if status == "COMPLETED":
+            job["actual_completion"] = min(due, REFERENCE_DATE).isoformat()
+        else:
+            job["estimated_completion"] = due.isoformat()
+
+        if totals is not None:
+            totals.total_orders[customer] += 1
+            totals.outstanding_orders[customer] += status != "COMPLETED"
+            totals.revenue[customer] += ordered * rng.uniform(80, 1200)
+        yield job
+
+
+def iter_customers(names: List[str], totals: _CustomerTotals, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "customers")
+    for i, name in enumerate(names):
+        slug = "".join(ch for ch in name.lower() if ch.isalnum())
+        first = rng.choice(_FIRST_NAMES)
+        yield {
+            "customer_id": f"CUST{i:06d}",
+            "name": name,
+            "contact": f"{first} {rng.choice(_LAST_NAMES)}",
+            "email": f"{first.lower()}@{slug}.com",
+            "phone": f"555-{rng.randint(0, 9999):04d}",
+            "total_orders": totals.total_orders[i],
+            "ytd_revenue": round(totals.revenue[i], 2),
+            "outstanding_orders": totals.outstanding_orders[i],
+            "last_contact": (REFERENCE_DATE - timedelta(days=rng.randint(0, 60))).isoformat(),
+        }
+
+
+def iter_timesheets(employees: List[Dict[str, Any]], days: int = 365, end: date = REFERENCE_DATE,
+                    seed: int = 42) -> Iterator[Tuple[str, date, List[float]]]:
+    """(employee_id, first day, daily hours) for the `days` days up to end: weekends off, occasional leave"""
+    rng = _rng(seed, "timesheets")
+    first = end - timedelta(days=days - 1)
+    weekend = [(first + timedelta(days=i)).weekday() >= 5 for i in range(days)]
+    for employee in employees:
+        hours = [0.0 if off or rng.random() < 0.04 else round(rng.uniform(6, 11) * 4) / 4 for off in weekend]
+        yield employee["employee_id"], first, hours
+
+
+def _iter_tables(sizes: Dict[str, int], seed: int):
+    """(table, row iterator) pairs; jobs run before customers so their totals are known"""
+    names = customer_names(sizes["customers"], seed)
+    totals = _CustomerTotals(len(names))
+    yield "inventory", iter_inventory(sizes["inventory"], seed)
+    yield "employees", iter_employees(sizes["employees"], seed)
+    yield "production_jobs", iter_jobs(sizes["production_jobs"], names, seed, totals)
+    yield "customers", iter_customers(names, totals, seed)
+
+
+def generate_dataset(rows: int = 10_000, seed: int = 42, **sizes: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build all four tables in memory.
+    rows sets the inventory size (other tables scale from it); keyword sizes override per table.
+    """
+    counts = {**table_sizes(rows), **sizes}
+    return {table: list(rows_iter) for table, rows_iter in _iter_tables(counts, seed)}
+
+
+def save_dataset(path: str, rows: int = 10_000, seed: int = 42, **sizes: int) -> Dict[str, int]:
+    """Stream a generated dataset to path/<table>.jsonl without holding it in memory"""
+    counts = {**table_sizes(rows), **sizes}
+    os.makedirs(path, exist_ok=True)
+    for table, rows_iter in _iter_tables(counts, seed):
+        with open(os.path.join(path, f"{table}.jsonl"), "w") as f:
+            for row in rows_iter:
+                f.write(json.dumps(row, separators=(",", ":")))
+                f.write("\n")
+    with open(os.path.join(path, "manifest.json"), "w") as f:
+        json.dump({"seed": seed, "sizes": counts}, f, indent=2)
+    return counts
+
+
+def iter_saved_table(path: str, table: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows of one saved table"""
+    with open(os.path.join(path, f"{table}.jsonl")) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def load_dataset(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Load a dataset written by save_dataset"""
+    return {table: list(iter_saved_table(path, table)) for table in TABLES}
+
+
+def main():
+    """CLI: generate (and optionally save) a synthetic dataset"""
+    parser = argparse.ArgumentParser(description="Generate synthetic manufacturing data")
+    parser.add_argument("--rows", type=int, default=10_000, help="inventory rows; other tables scale from it")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="directory to write <table>.jsonl files to")
+    args = parser.parse_args()
+
+    print("🏭 Synthetic Data Generator")
+    print("=" * 50)
+
+    started = time.perf_counter()
+    if args.out:
+        counts = save_dataset(args.out, args.rows, args.seed)
+        print(f"\n💾 Saved to {args.out}")
+    else:
+        dataset = generate_dataset(args.rows, args.seed)
+        counts = {table: len(rows) for table, rows in dataset.items()}
+    elapsed = time.perf_counter() - started
+
+    for table in TABLES:
+        print(f"   • {counts[table]:,} {table}")
+    print(f"\n⏱️  {elapsed:.2f}s (seed {args.seed})")
+
+if __name__ == "__main__":
+    main()
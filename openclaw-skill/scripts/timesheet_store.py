@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Timesheet Time-Series Store
+Daily hours per employee as prefix sums in compact integer arrays, so hours
+between any two dates, department totals and weekly overtime are O(1) lookups
+"""
+
+import re
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, Any, List, Iterable, Optional, Sequence, Tuple
+
+# Hours are stored in hundredths so sums are exact; 'l' keeps years of a busy employee in range
+_SCALE = 100
+_TYPECODE = "l"
+
+_RANGE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s*(?:\.\.|to|-|through|until)\s*(\d{4}-\d{2}-\d{2})")
+_LAST_DAYS_RE = re.compile(r"(?:last|past)\s+(\d+)\s+days?")
+
+
+def _iso(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def parse_date_range(text: str, today: date) -> Tuple[date, date]:
+    """
+    Inclusive (start, end) for phrases like "this week", "last month", "yesterday",
+    "last 30 days", "2026-01-01 to 2026-01-31" or a single ISO date. Weeks start on Monday.
+    """
+    phrase = " ".join((text or "this week").lower().split())
+    monday = today - timedelta(days=today.weekday())
+    first_of_month = today.replace(day=1)
+
+    if phrase == "today":
+        return today, today
+    if phrase == "yesterday":
+        return today - timedelta(days=1), today - timedelta(days=1)
+    if phrase in ("this week", "week to date"):
+        return monday, today
+    if phrase == "last week":
+        return monday - timedelta(days=7), monday - timedelta(days=1)
+    if phrase in ("this month", "month to date"):
+        return first_of_month, today
+    if phrase == "last month":
+        end = first_of_month - timedelta(days=1)
+        return end.replace(day=1), end
+    if phrase in ("this year", "year to date"):
+        return today.replace(month=1, day=1), today
+
+    match = _LAST_DAYS_RE.fullmatch(phrase)
+    if match:
+        return today - timedelta(days=int(match.group(1)) - 1), today
+    match = _RANGE_RE.fullmatch(phrase)
+    if match:
+        start, end = date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))
+        return min(start, end), max(start, end)
+    try:
+        day = date.fromisoformat(phrase)
+    except ValueError:
+        raise ValueError(f"Unrecognised date range: {text!r}") from None
+    return day, day
+
+
+class _Series:
+    """Running total per day: totals[i] = hundredths of an hour worked before day start + i"""
+    __slots__ = ("totals",)
+
+    def __init__(self):
+        self.totals = array(_TYPECODE, [0])
+
+    def __len__(self) -> int:
+        return len(self.totals) - 1  # Days covered
+
+    def before(self, offset: int) -> int:
+        """Total worked before day `offset` (clamped to the recorded span)"""
+        if offset <= 0:
+            return 0
+        totals = self.totals
+        return totals[offset] if offset < len(totals) else totals[-1]
+
+    def add(self, offset: int, delta: int):
+        """Add delta to day `offset`; O(1) for the latest day, O(days after it) for an edit"""
+        totals = self.totals
+        if offset >= len(totals) - 1:
+            totals.extend(array(_TYPECODE, [totals[-1]]) * (offset + 2 - len(totals)))
+        for i in range(offset + 1, len(totals)):
+            totals[i] += delta
+
+
+class TimesheetStore:
+    """
+    Daily hours for many employees from `start` onward.
+    Each employee and department has a prefix-sum series, so any date range is two
+    array reads. Weekly totals over `weekly_limit` are tracked as hours are recorded,
+    so overtime for a week is read, not scanned.
+    Department totals follow current membership: an employee recorded under a new
+    department takes all of their hours, past days included, with them.
+    """
+
+    def __init__(self, start: date, weekly_limit: float = 40.0):
+        self.start = _iso(start)
+        self.weekly_limit = weekly_limit
+        self.end: Optional[date] = None  # Latest day with recorded hours
+        self._employees: Dict[str, _Series] = {}
+        self._departments: Dict[str, _Series] = {}
+        self._department_of: Dict[str, str] = {}
+        self._overtime: Dict[int, Dict[str, float]] = {}  # week number -> {employee: hours} over the limit
+
+    def __len__(self) -> int:
+        return len(self._employees)
+
+    def __contains__(self, employee_id: str) -> bool:
+        return employee_id in self._employees
+
+    def _offset(self, day) -> int:
+        return (_iso(day) - self.start).days
+
+    def record(self, employee_id: str, day, hours: float, department: Optional[str] = None):
+        """Set an employee's hours for one day (replacing what was recorded for that day)"""
+        offset = self._offset(day)
+        if offset < 0:
+            raise ValueError(f"{day} is before the store starts ({self.start})")
+
+        series = self._employees.get(employee_id)
+        if series is None:
+            series = self._employees[employee_id] = _Series()
+        if department is not None:
+            self._set_department(employee_id, department)
+        department = self._department_of.get(employee_id)
+
+        delta = round(hours * _SCALE) - (series.before(offset + 1) - series.before(offset))
+        if delta:
+            series.add(offset, delta)
+            if department is not None:
+                self._departments.setdefault(department, _Series()).add(offset, delta)
+            self._check_overtime(employee_id, series, offset // 7 * 7)
+        day = _iso(day)
+        if self.end is None or day > self.end:
+            self.end = day
+
+    def record_series(self, employee_id: str, first_day, hours: Sequence[float], department: Optional[str] = None):
+        """
+        Append consecutive days of hours from first_day, e.g. an imported history.
+        The employee's running totals are extended in one pass; use record() to edit past days.
+        """
+        offset = self._offset(first_day)
+        series = self._employees.get(employee_id)
+        if series is None:
+            series = self._employees[employee_id] = _Series()
+        if offset < 0 or offset < len(series):
+            raise ValueError(f"{first_day} is not after {employee_id}'s recorded days; use record()")
+        if department is not None:
+            self._set_department(employee_id, department)
+        if not hours:
+            return
+
+        increments = [round(h * _SCALE) for h in hours]
+        totals = series.totals
+        totals.extend(array(_TYPECODE, [totals[-1]]) * (offset - len(series)))
+        totals.extend(array(_TYPECODE, accumulate(increments, initial=totals[-1]))[1:])
+
+        department = self._department_of.get(employee_id)
+        if department is not None:
+            rollup = self._departments.setdefault(department, _Series())
+            rollup.add(offset + len(increments) - 1, 0)  # Make room
+            running = 0
+            for i, increment in enumerate(increments, offset + 1):
+                running += increment
+                rollup.totals[i] += running
+            for i in range(offset + len(increments) + 1, len(rollup.totals)):
+                rollup.totals[i] += running
+
+        for week_offset in range(offset // 7 * 7, offset + len(increments), 7):
+            self._check_overtime(employee_id, series, week_offset)
+        last = self.start + timedelta(days=offset + len(increments) - 1)
+        if self.end is None or last > self.end:
+            self.end = last
+
+    def record_many(self, entries: Iterable[Tuple[str, Any, float]], departments: Optional[Dict[str, str]] = None):
+        """Bulk load (employee_id, day, hours) entries; fastest in date order"""
+        for employee_id, department in (departments or {}).items():
+            self._set_department(employee_id, department)
+        for employee_id, day, hours in entries:
+            self.record(employee_id, day, hours)
+
+    def _set_department(self, employee_id: str, department: str):
+        """Assign an employee to a department, moving the hours already recorded for them - O(days)"""
+        old = self._department_of.get(employee_id)
+        if old == department:
+            return
+        self._department_of[employee_id] = department
+        series = self._employees.get(employee_id)
+        if series is None or not len(series):
+            return
+        if old is not None:
+            self._add_series(self._departments.setdefault(old, _Series()), series, -1)
+        self._add_series(self._departments.setdefault(department, _Series()), series, 1)
+
+    @staticmethod
+    def _add_series(rollup: _Series, series: _Series, sign: int):
+        """Add (sign=1) or subtract (sign=-1) every day of series into a department rollup"""
+        rollup.add(len(series) - 1, 0)  # Make room
+        totals = rollup.totals
+        for i, total in enumerate(series.totals):
+            totals[i] += sign * total
+        for i in range(len(series.totals), len(totals)):
+            totals[i] += sign * series.totals[-1]
+
+    def _check_overtime(self, employee_id: str, series: _Series, week_offset: int):
+        """Re-evaluate one employee's week (weeks are 7-day blocks from start)"""
+        week = week_offset // 7
+        hours = (series.before(week_offset + 7) - series.before(week_offset)) / _SCALE
+        flagged = self._overtime.setdefault(week, {})
+        if hours > self.weekly_limit:
+            flagged[employee_id] = hours
+        else:
+            flagged.pop(employee_id, None)
+
+    def hours(self, employee_id: str, start, end) -> float:
+        """Hours an employee worked from start to end inclusive - O(1)"""
+        series = self._employees.get(employee_id)
+        if series is None:
+            return 0.0
+        return (series.before(self._offset(end) + 1) - series.before(self._offset(start))) / _SCALE
+
+    def day_hours(self, employee_id: str, day) -> float:
+        return self.hours(employee_id, day, day)
+
+    def department_hours(self, department: str, start, end) -> float:
+        """Hours everyone in a department worked from start to end inclusive - O(1)"""
+        series = self._departments.get(department)
+        if series is None:
+            return 0.0
+        return (series.before(self._offset(end) + 1) - series.before(self._offset(start))) / _SCALE
+
+    def departments(self) -> List[str]:
+        return sorted(self._departments)
+
+    def department_rollup(self, start, end) -> Dict[str, float]:
+        """Hours per department from start to end inclusive - O(departments)"""
+        return {department: self.department_hours(department, start, end) for department in self.departments()}
+
+    def overtime(self, day) -> Dict[str, float]:
+        """{employee: hours} for everyone over weekly_limit in the week holding day (weeks begin on start's weekday)"""
+        return dict(self._overtime.get(self._offset(day) // 7, {}))
+
+    def stats(self) -> Dict[str, Any]:
+        days = max((len(series) for series in self._employees.values()), default=0)
+        cells = sum(len(series.totals) for series in self._employees.values())
+        return {
+            "employees": len(self._employees),
+            "departments": len(self._departments),
+            "days": days,
+            "bytes": cells * array(_TYPECODE).itemsize,
+        }
+
+
+def weekly_entries(employees: Iterable[Dict[str, Any]], today: date) -> Iterable[Tuple[str, date, float]]:
+    """
+    Daily entries reproducing each employee's hours_this_week (Monday to today) and
+    hours_last_week (Monday to Friday), spread evenly over working days in quarter hours
+    """
+    monday = today - timedelta(days=today.weekday())
+    this_week = [monday + timedelta(days=i) for i in range(min(today.weekday(), 4) + 1)]
+    last_week = [monday - timedelta(days=7 - i) for i in range(5)]
+    for employee in employees:
+        for days, total in ((last_week, employee.get("hours_last_week")), (this_week, employee.get("hours_this_week"))):
+            quarters, extra = divmod(round((total or 0) * 4), len(days))
+            for i, day in enumerate(days):
+                yield employee["employee_id"], day, (quarters + (i < extra)) / 4
+
+
+def from_employees(employees: List[Dict[str, Any]], today: date, weekly_limit: float = 40.0) -> TimesheetStore:
+    """Store whose this-week and last-week totals match the employees table"""
+    monday = today - timedelta(days=today.weekday())
+    store = TimesheetStore(monday - timedelta(days=7), weekly_limit)
+    store.record_many(weekly_entries(employees, today),
+                      departments={e["employee_id"]: e["department"] for e in employees})
+    return store
+
+
+def main():
+    """CLI demo"""
+    try:
+        from mock_data import MOCK_EMPLOYEES
+        from synthetic_data import REFERENCE_DATE
+    except ImportError:
+        from scripts.mock_data import MOCK_EMPLOYEES
+        from scripts.synthetic_data import REFERENCE_DATE
+
+    print("⏱️  Timesheet Store Demo")
+    print("=" * 50)
+
+    store = from_employees(MOCK_EMPLOYEES, REFERENCE_DATE)
+    for phrase in ("this week", "last week", "last 10 days"):
+        start, end = parse_date_range(phrase, REFERENCE_DATE)
+        print(f"\n{phrase} ({start} to {end}):")
+        for employee in MOCK_EMPLOYEES:
+            print(f"   {employee['name']}: {store.hours(employee['employee_id'], start, end)} hours")
+        print(f"   By department: {store.department_rollup(start, end)}")
+
+    start, _ = parse_date_range("last week", REFERENCE_DATE)
+    print(f"\nOvertime the week of {start}: {store.overtime(start)}")
+
+if __name__ == "__main__":
+    main()
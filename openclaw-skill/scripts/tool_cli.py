@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Skill Tool CLI
+Thin shim that forwards one tool call to a running tool_server.py, falling back
+to running the tool in-process when no server is listening.
+Only the standard library is imported on the forwarding path.
+
+    python3 scripts/tool_cli.py inventory_lookup sku=ABC123
+    python3 scripts/tool_cli.py department_roster department=Assembly shift=Day --json
+    python3 scripts/tool_cli.py --startup-profile employee_hours employee_id=EMP001
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Dict, Any, List, Optional
+
+DEFAULT_SOCKET = os.getenv("OPENCLAW_SKILL_SOCKET", os.path.join(tempfile.gettempdir(), "openclaw-skill.sock"))
+
+
+def parse_arguments(pairs: List[str]) -> Dict[str, Any]:
+    """key=value pairs; values that parse as JSON (numbers, true, null) keep their type"""
+    arguments = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"Expected key=value, got {pair!r}")
+        try:
+            arguments[key] = json.loads(value)
+        except ValueError:
+            arguments[key] = value
+    return arguments
+
+
+def forward(request: Dict[str, Any], path: str = DEFAULT_SOCKET, timeout: float = 10.0) -> Optional[Dict[str, Any]]:
+    """Send one call to the server; None if no server is listening or it gave no usable reply"""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+    except OSError:  # No socket, refused, reset, or timed out: run it here instead
+        return None
+    if not line:
+        return None  # Closed without replying
+    try:
+        return json.loads(line)
+    except ValueError:  # Not JSON (or not UTF-8): whatever answered is no tool server
+        return None
+
+
+def run_local(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the call in this process (pays the full import and index build)"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from skill_tools import SkillTools, ToolError
+
+    try:
+        return {"ok": True, **SkillTools().call(request["tool"], request["arguments"])}
+    except ToolError as e:
+        return {"ok": False, "error": str(e)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if "--startup-profile" in argv:
+        # Cold-start report for the same call, run in a fresh interpreter
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from startup_profile import main as startup_profile
+        return startup_profile([a for a in argv if a != "--startup-profile"])
+
+    as_json = "--json" in argv
+    argv = [a for a in argv if a != "--json"]
+    if not argv:
+        print(__doc__.strip())
+        return 2
+
+    request = {"tool": argv[0], "arguments": parse_arguments(argv[1:])}
+    response = forward(request) or run_local(request)
+
+    if as_json:
+        print(json.dumps(response, default=str))
+    else:
+        print(response["text"] if response.get("ok") else f"Error: {response.get('error')}")
+    return 0 if response.get("ok") else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Skill Tool Server
+Long-running process that keeps the client, indexes and caches warm and answers
+tool calls over a Unix socket (one JSON line per call) or local HTTP
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+
+try:
+    from skill_tools import SkillTools, ToolError, internal_error
+    from metrics import Metrics, maybe_span, CONTENT_TYPE as METRICS_CONTENT_TYPE
+except ImportError:
+    from scripts.skill_tools import SkillTools, ToolError, internal_error
+    from scripts.metrics import Metrics, maybe_span, CONTENT_TYPE as METRICS_CONTENT_TYPE
+
+DEFAULT_SOCKET = os.getenv("OPENCLAW_SKILL_SOCKET", os.path.join(tempfile.gettempdir(), "openclaw-skill.sock"))
+TOOLS_PATH = "/tools"
+BATCH_PATH = "/batch"
+METRICS_PATH = "/metrics"
+TRACES_PATH = "/traces"
+
+
+def _json_default(value: Any) -> Any:
+    """Compact records (records.py) go out as objects; anything else, e.g. dates, as text"""
+    return dict(value) if isinstance(value, Mapping) else str(value)
+
+
+class ToolServer:
+    """
+    Wraps one SkillTools instance shared by every connection. Calls run concurrently,
+    so single-key lookups from different sessions land in the same dataloader window.
+    With metrics, each request is traced (tool call, methods, statements, serialization)
+    and exported on /metrics; without, requests run unwrapped.
+    """
+
+    def __init__(self, tools: SkillTools = None, batch_window: float = 0.002, metrics: Optional[Metrics] = None):
+        if tools is None:
+            tools = SkillTools(batch_window=batch_window, metrics=metrics)
+        elif metrics is not None:
+            tools.instrument(metrics)  # Tools built without metrics are wrapped now
+        self.tools = tools
+        self.metrics = tools.metrics
+        self.started = time.time()
+
+    def span(self, kind: str, name: str):
+        """A metrics span, or a shared no-op context when metrics are off"""
+        return maybe_span(self.metrics, kind, name)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        {"tool": name, "arguments": {...}} -> {"ok": True, "tool", "result", "text"} or {"ok": False, "error"}.
+        A tool that fails for any other reason than bad input answers with "status": 500.
+        """
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Bad request: expected a JSON object"}
+        try:
+            response = self.tools.call(request.get("tool", ""), request.get("arguments"))
+        except ToolError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:  # A bug in one tool must not drop the connection
+            return internal_error(request.get("tool"), e)
+        return {"ok": True, **response}
+
+    def dispatch(self, request: Any) -> Dict[str, Any]:
+        """One socket message: a tool call, {"batch": [...]}, or {"tool": "health" | "metrics"}"""
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Bad request: expected a JSON object per line"}
+        if "batch" in request:
+            return self.handle_batch(request["batch"])
+        if request.get("tool") == "health":
+            return self.health()
+        if request.get("tool") == "metrics":
+            return self.metrics_response()
+        return self.handle(request)
+
+    def handle_batch(self, calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """[{"tool", "arguments"}, ...] -> {"ok": True, "results": [...]} in request order"""
+        if not isinstance(calls, list):
+            return {"ok": False, "error": "A batch is a list of {tool, arguments} calls"}
+        try:
+            return {"ok": True, "results": self.tools.call_batch(calls)}
+        except Exception as e:
+            return internal_error("batch", e)
+
+    def health(self) -> Dict[str, Any]:
+        return {"ok": True, "uptime_s": round(time.time() - self.started, 1), "calls": self.tools.calls,
+                "tools": self.tools.names(), "metrics": self.metrics is not None,
+                "dataloaders": {f"{tool}.{argument}": loader.stats()
+                                for (tool, argument), loader in self.tools.loaders.items()}}
+
+    def metrics_response(self) -> Dict[str, Any]:
+        """Prometheus text and recent traces, for clients on the Unix socket"""
+        if self.metrics is None:
+            return {"ok": False, "error": "Metrics are off; start the server with --metrics"}
+        return {"ok": True, "text": self.metrics.to_prometheus(), "traces": self.metrics.recent()}
+
+    def serve_unix(self, path: str = DEFAULT_SOCKET) -> socketserver.BaseServer:
+        """Listen on a Unix socket (replacing a stale one) on a background thread"""
+        if os.path.exists(path):
+            os.unlink(path)
+        server = socketserver.ThreadingUnixStreamServer(path, _make_stream_handler(self))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def serve_http(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """Listen on HTTP on a background thread; port 0 picks a free port"""
+        server = ThreadingHTTPServer((host, port), _make_http_handler(self))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _make_stream_handler(tool_server: ToolServer):
+    class Handler(socketserver.StreamRequestHandler):
+        # A connection may carry any number of calls, one JSON object per line;
+        # {"batch": [{"tool", "arguments"}, ...]} runs many calls in one round trip
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                with tool_server.span("request", "socket"):
+                    try:
+                        response = tool_server.dispatch(json.loads(line))
+                    except ValueError as e:
+                        response = {"ok": False, "error": f"Bad request: {e}"}
+                    with tool_server.span("serialize", "json"):
+                        payload = json.dumps(response, default=_json_default).encode()
+                self.wfile.write(payload + b"\n")
+                self.wfile.flush()
+
+    return Handler
+
+
+def _make_http_handler(tool_server: ToolServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: Dict[str, Any]):
+            with tool_server.span("serialize", "json"):
+                payload = json.dumps(body, default=_json_default).encode()
+            self._send_bytes(status, payload, "application/json")
+
+        def _send_bytes(self, status: int, payload: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path in ("/health", TOOLS_PATH):
+                return self._send(200, tool_server.health())
+            if self.path in (METRICS_PATH, TRACES_PATH):
+                if tool_server.metrics is None:
+                    return self._send(404, {"ok": False, "error": "Metrics are off; start the server with --metrics"})
+                if self.path == TRACES_PATH:
+                    return self._send(200, {"ok": True, "traces": tool_server.metrics.recent()})
+                return self._send_bytes(200, tool_server.metrics.to_prometheus().encode(), METRICS_CONTENT_TYPE)
+            self._send(404, {"ok": False, "error": f"Not found: {self.path}"})
+
+        def do_POST(self):
+            with tool_server.span("request", "http"):
+                self._post()
+
+        def _post(self):
+            # POST /tools/<name> with the arguments object as the body,
+            # or POST /batch with a list of {tool, arguments}
+            length = int(self.headers.get("Content-Length") or 0)
+            if self.path != BATCH_PATH and not self.path.startswith(TOOLS_PATH + "/"):
+                return self._send(404, {"ok": False, "error": f"Not found: {self.path}"})
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError as e:
+                return self._send(400, {"ok": False, "error": f"Bad request: {e}"})
+            if self.path == BATCH_PATH:
+                response = tool_server.handle_batch(body)
+            else:
+                response = tool_server.handle({"tool": self.path[len(TOOLS_PATH) + 1:], "arguments": body})
+            self._send(200 if response["ok"] else response.get("status", 400), response)
+
+    return Handler
+
+
+def main():
+    """CLI: serve tool calls until interrupted"""
+    parser = argparse.ArgumentParser(description="Manufacturing skill tool server")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--port", type=int, help="serve HTTP on this port instead of a Unix socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="coalesce concurrent single-key lookups arriving this close together (0 = off)")
+    metrics_on = os.getenv("OPENCLAW_METRICS", "").lower() in ("1", "true", "yes")  # "0" / "false" stay off
+    parser.add_argument("--metrics", action="store_true", default=metrics_on,
+                        help="time every call and serve Prometheus metrics on /metrics ($OPENCLAW_METRICS)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    tool_server = ToolServer(batch_window=args.batch_window_ms / 1000, metrics=Metrics() if args.metrics else None)
+    tool_server.tools.call("inventory_lookup", {"sku": "ABC123"})  # Warm plans, indexes and caches
+    warmup_ms = (time.perf_counter() - started) * 1000
+
+    if args.port is not None or not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        server = tool_server.serve_http(args.host, args.port or 8766)
+        host, port = server.server_address
+        where = f"http://{host}:{port}{TOOLS_PATH}/<tool>"
+        metrics_at = f"http://{host}:{port}{METRICS_PATH}"
+    else:
+        server = tool_server.serve_unix(args.socket)
+        where = f"unix:{args.socket}"
+        metrics_at = '{"tool": "metrics"} on the socket'
+
+    print("🛰️  Skill tool server")
+    print(f"   Listening on {where}")
+    print(f"   Ready in {warmup_ms:.0f} ms with {len(tool_server.tools.names())} tools")
+    if tool_server.metrics is not None:
+        print(f"   Metrics: {metrics_at}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        if isinstance(server, socketserver.UnixStreamServer):
+            os.unlink(args.socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Trigram Index for Fuzzy Text Search
+Inverted index from character trigrams to documents, ranking matches by how much
+of the query they contain, tolerant of typos, word order and partial words
+"""
+
+import heapq
+import math
+import re
+from typing import Dict, Any, List, Hashable, Iterable, Set, Tuple, FrozenSet
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# Score bands tried from the top down; most searches are settled by the first one
+_THRESHOLDS = (1.0, 0.75, 0.5)
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigrams of each word, padded like pg_trgm ("  ca", "car", ..., "on ")"""
+    grams = set()
+    for word in _WORD_RE.findall(text.casefold()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.casefold()))
+
+
+class _Text:
+    __slots__ = ("grams", "keys")
+
+    def __init__(self, grams: FrozenSet[str]):
+        self.grams = grams
+        self.keys: Dict[Hashable, None] = {}  # Insertion-ordered set
+
+
+class TrigramIndex:
+    """
+    Maps keys (e.g. SKUs) to text (e.g. descriptions) for ranked fuzzy search.
+    Identical texts are indexed once, so catalogues with many repeated descriptions
+    keep short posting lists.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Hashable, str]] = ()):
+        self._texts: Dict[str, _Text] = {}           # normalized text -> grams and keys
+        self._postings: Dict[str, Set[str]] = {}     # trigram -> normalized texts
+        self._key_text: Dict[Hashable, str] = {}     # key -> normalized text
+        for key, text in items:
+            self.add(key, text)
+
+    def __len__(self) -> int:
+        return len(self._key_text)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._key_text
+
+    def add(self, key: Hashable, text: str):
+        """Index key under text, replacing whatever it was indexed under before"""
+        if key in self._key_text:
+            self.remove(key)
+        normalized = _normalize(text or "")
+        entry = self._texts.get(normalized)
+        if entry is None:
+            entry = self._texts[normalized] = _Text(trigrams(normalized))
+            for gram in entry.grams:
+                self._postings.setdefault(gram, set()).add(normalized)
+        entry.keys[key] = None
+        self._key_text[key] = normalized
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop key; returns False if it was not indexed"""
+        normalized = self._key_text.pop(key, None)
+        if normalized is None:
+            return False
+        entry = self._texts[normalized]
+        del entry.keys[key]
+        if not entry.keys:
+            del self._texts[normalized]
+            for gram in entry.grams:
+                texts = self._postings[gram]
+                texts.discard(normalized)
+                if not texts:
+                    del self._postings[gram]
+        return True
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Tuple[Hashable, float]]:
+        """
+        Top matches as (key, score), best first.
+        score is the share of the query's trigrams found in the text (1.0 = every query
+        word appears); ties go to the text with fewer extra trigrams (higher Jaccard).
+        """
+        query_grams = trigrams(query)
+        if not query_grams or limit <= 0:
+            return []
+
+        # A text scoring >= t shares at least ceil(t * n) of the n query trigrams, so it must
+        # hold one of the n - ceil(t * n) + 1 rarest. Scoring only those candidates, band by
+        # band, avoids walking the long posting lists of common trigrams.
+        size = len(query_grams)
+        rarest = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+        scored: Dict[str, Tuple[float, float, str]] = {}
+        for threshold in [t for t in _THRESHOLDS if t > min_score] + [min_score]:
+            needed = max(1, math.ceil(threshold * size - 1e-9))
+            for gram in rarest[:size - needed + 1]:
+                for text in self._postings.get(gram, ()):
+                    if text not in scored:
+                        grams = self._texts[text].grams
+                        shared = len(query_grams & grams)
+                        scored[text] = (shared / size, shared / (size + len(grams) - shared), text)
+            band = [entry for entry in scored.values() if entry[0] >= threshold]
+            if sum(len(self._texts[entry[2]].keys) for entry in band) >= limit:
+                break
+        ranked = heapq.nlargest(limit, band)
+
+        matches: List[Tuple[Hashable, float]] = []
+        for score, _, text in ranked:
+            for key in self._texts[text].keys:
+                matches.append((key, round(score, 3)))
+                if len(matches) == limit:
+                    return matches
+        return matches
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._key_text),
+            "distinct_texts": len(self._texts),
+            "trigrams": len(self._postings),
+        }
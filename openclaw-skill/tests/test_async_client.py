@@ -0,0 +1,75 @@
+"""AsyncStatementClient single-flight: sharing, streaming and cancellation"""
+
+import asyncio
+import threading
+
+from scripts.async_client import AsyncStatementClient
+from scripts.mock_databricks import MockDatabricksClient
+
+SQL = "SELECT * FROM inventory WHERE sku = 'ABC123'"
+
+
+class _GatedWarehouse:
+    """Mock client whose statements block until released, so calls overlap"""
+
+    def __init__(self):
+        self.client = MockDatabricksClient(verbose=False)
+        self.release = threading.Event()
+        self.executed = 0
+
+    def execute_statement(self, sql, **kwargs):
+        self.executed += 1
+        self.release.wait(5)
+        return self.client.execute_statement(sql, **kwargs)
+
+
+def _run(scenario):
+    warehouse = _GatedWarehouse()
+
+    async def main():
+        async with AsyncStatementClient(warehouse, max_concurrency=4) as client:
+            return client, await scenario(client, warehouse)
+
+    return asyncio.run(main())
+
+
+async def _released(warehouse, calls):
+    await asyncio.sleep(0.05)
+    warehouse.release.set()
+    return await asyncio.gather(*calls)
+
+
+def test_identical_statements_run_once():
+    async def scenario(client, warehouse):
+        calls = [asyncio.ensure_future(client.execute_statement(SQL)) for _ in range(3)]
+        return await _released(warehouse, calls)
+
+    client, results = _run(scenario)
+    assert (client.executions, client.deduplicated) == (1, 2)
+    assert results[0] is results[1] is results[2]
+    assert results[0]["status"]["state"] == "SUCCEEDED"
+
+
+def test_streamed_statements_are_not_shared():
+    async def scenario(client, warehouse):
+        calls = [asyncio.ensure_future(client.execute_statement(SQL, fetch_all=False)) for _ in range(2)]
+        return await _released(warehouse, calls)
+
+    client, (first, second) = _run(scenario)
+    assert (client.executions, client.deduplicated) == (2, 0)
+    assert first["statement_id"] != second["statement_id"]
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    async def scenario(client, warehouse):
+        first = asyncio.ensure_future(client.execute_statement(SQL))
+        second = asyncio.ensure_future(client.execute_statement(SQL))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        (result,) = await _released(warehouse, [second])
+        return first, result
+
+    client, (first, result) = _run(scenario)
+    assert first.cancelled()
+    assert result["status"]["state"] == "SUCCEEDED"
+    assert (client.executions, client.deduplicated) == (1, 1)
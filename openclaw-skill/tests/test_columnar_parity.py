@@ -0,0 +1,86 @@
+"""The columnar inventory table answers every statement exactly as the row store does"""
+
+import pytest
+
+from scripts import columnar
+from scripts.columnar import InventoryColumns
+from scripts.mock_databricks import INVENTORY_SCHEMA
+from scripts.sql_engine import SqlEngine, SqlError, Table
+from scripts.synthetic_data import generate_dataset
+
+ROWS = generate_dataset(300, seed=7)["inventory"]
+
+QUERIES = [
+    ("SELECT * FROM inventory", None),
+    ("SELECT sku, quantity_available FROM inventory WHERE quantity_available < reorder_point", None),
+    ("SELECT sku FROM inventory WHERE quantity_on_hand > :n AND unit_cost <= :cost", {"n": 100, "cost": 50.0}),
+    ("SELECT sku FROM inventory WHERE warehouse_location = :loc", None),
+    ("SELECT sku FROM inventory WHERE description != :desc ORDER BY unit_cost DESC LIMIT 20", None),
+    ("SELECT sku FROM inventory WHERE sku = :sku", None),
+    ("SELECT sku FROM inventory WHERE barcode IN (:barcode, 'none')", None),
+    ("SELECT sku FROM inventory WHERE 10 < quantity_reserved", None),
+    ("SELECT sku FROM inventory WHERE description = 'no such item'", None),
+    ("SELECT sku FROM inventory WHERE last_updated >= '2026-01-01' ORDER BY last_updated, sku", None),
+    ("SELECT sku FROM inventory WHERE NOT quantity_on_hand > 50 OR warehouse_location = :loc", None),
+    ("SELECT sku FROM inventory WHERE quantity_available < 0 AND 1 = 1", None),
+    ("SELECT sku FROM inventory ORDER BY quantity_on_hand DESC, sku LIMIT 5", None),
+]
+
+FAILING = [
+    "SELECT sku FROM inventory WHERE bogus = 1",
+    "SELECT sku FROM inventory ORDER BY bogus",
+    "SELECT sku FROM inventory WHERE sku > 100",
+    "SELECT sku FROM inventory WHERE quantity_on_hand > 'many'",
+]
+
+
+def _defaults():
+    row = ROWS[42]
+    return {"loc": row["warehouse_location"], "desc": row["description"], "sku": row["sku"],
+            "barcode": row["barcode"]}
+
+
+@pytest.fixture(params=["array", "numpy"])
+def engines(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "_numpy", False)
+    rows = SqlEngine()
+    rows.register(Table("inventory", [c for c, _ in INVENTORY_SCHEMA], [dict(r) for r in ROWS],
+                        indexed=("sku", "barcode")))
+    columns = SqlEngine()
+    columns.register(InventoryColumns(INVENTORY_SCHEMA, ROWS))
+    return rows, columns
+
+
+@pytest.mark.parametrize("sql, parameters", QUERIES)
+def test_same_rows(engines, sql, parameters):
+    row_store, column_store = engines
+    parameters = parameters or _defaults()
+    expected = row_store.execute(sql, parameters)
+    assert column_store.execute(sql, parameters) == expected
+
+
+def test_queries_select_something(engines):
+    row_store, _ = engines
+    matched = [sql for sql, parameters in QUERIES if row_store.execute(sql, parameters or _defaults())[1]]
+    assert len(matched) >= len(QUERIES) - 2  # Only the deliberately empty ones match nothing
+
+
+@pytest.mark.parametrize("sql", FAILING)
+def test_same_errors(engines, sql):
+    for engine in engines:
+        with pytest.raises(SqlError):
+            engine.execute(sql)
+
+
+def test_null_numerics_are_rejected_whole_row():
+    table = InventoryColumns(INVENTORY_SCHEMA, ROWS[:3])
+    with pytest.raises(ValueError, match="inventory.unit_cost"):
+        table.append({**ROWS[3], "unit_cost": None})
+    with pytest.raises(ValueError, match="inventory.quantity_available"):
+        table.set_value(0, "quantity_available", None)
+    assert len(table) == 3
+    assert all(len(values) == 3 for values in table.data.values())
+    assert table.append({**ROWS[3], "description": None}) == 3  # Strings may be NULL
@@ -0,0 +1,23 @@
+"""CustomerInsights index wiring"""
+
+from scripts.customer_insights import CustomerInsights
+from scripts.entity_store import EntityStore
+from scripts.leaderboard import RevenueLeaderboard
+from scripts.order_index import OrderIndex
+
+
+def test_empty_indexes_are_used_not_replaced():
+    customers = EntityStore([], id_field="customer_id")
+    orders, leaderboard = OrderIndex([]), RevenueLeaderboard([])
+    dataset = {"customers": [{"customer_id": "C1", "name": "X"}], "production_jobs": []}
+    insights = CustomerInsights(customers, orders, leaderboard, dataset=dataset)
+    assert (insights.customers, insights.orders, insights.leaderboard) == (customers, orders, leaderboard)
+    assert insights.get_customer_summary("Acme")["found"] is False
+
+
+def test_a_misheard_name_is_flagged_as_a_guess():
+    insights = CustomerInsights()
+    data = insights.get_customer_summary("Akme Bicycle")
+    assert data["name"] == "Acme Bicycle Co" and data["fuzzy_match"] is True
+    assert insights.format_customer_response(data).startswith("I think you mean Acme Bicycle Co. ")
+    assert insights.get_customer_summary("Acme")["fuzzy_match"] is False
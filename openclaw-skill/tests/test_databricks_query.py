@@ -0,0 +1,48 @@
+"""The real client against the local stub warehouse: failures keep the FAILED response shape"""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from scripts.databricks_query import DatabricksClient
+from scripts.stub_warehouse import StubWarehouse
+
+
+@pytest.fixture(scope="module")
+def warehouse():
+    warehouse = StubWarehouse(latency=0.0, chunk_rows=1)
+    server = warehouse.serve()
+    yield warehouse, server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(warehouse):
+    stub, (host, port) = warehouse
+    client = DatabricksClient(f"http://{host}:{port}", stub.token, stub.warehouse_id)
+    yield client
+    client.close()
+
+
+def test_chunks_are_gathered(client):
+    response = client.execute_statement("SELECT sku FROM inventory")
+    assert response["status"]["state"] == "SUCCEEDED"
+    assert response["result"]["row_count"] == len(response["result"]["data_array"]) > 1
+
+
+def test_a_failed_chunk_fails_the_statement(client, monkeypatch):
+    fetch = client.get_chunk
+    failed = {"status": {"state": "FAILED", "error": {"error_code": "NOT_FOUND", "message": "chunk expired"}}}
+    monkeypatch.setattr(client, "get_chunk", lambda statement_id, index: failed if index == 2 else fetch(statement_id, index))
+    response = client.execute_statement("SELECT sku FROM inventory")
+    assert response["status"] == failed["status"]
+    assert "result" not in response
+
+
+def test_network_errors_are_failed_responses():
+    client = DatabricksClient("http://127.0.0.1:1", "token", "warehouse", request_timeout=1)
+    response = client.execute_statement("SELECT 1")
+    assert response["status"]["state"] == "FAILED"
+    assert response["status"]["error"]["error_code"] == "NETWORK_ERROR"
+    client.cancel("no-such-statement")  # Best effort: does not raise
@@ -0,0 +1,103 @@
+"""DataLoader batching: coalescing, batch size limits, errors and the result cache"""
+
+import threading
+
+import pytest
+
+from scripts.dataloader import DataLoader
+
+
+class _Backend:
+    """batch_fn that records every batch it is called with"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, keys):
+        with self._lock:
+            self.batches.append(sorted(keys))
+        if self.fail:
+            raise LookupError("warehouse unavailable")
+        return {key: key.upper() for key in keys if key != "missing"}
+
+
+def _load_concurrently(loader, keys):
+    results, errors = {}, {}
+    start = threading.Barrier(len(keys))
+
+    def worker(key):
+        start.wait()
+        try:
+            results[key] = loader.load(key)
+        except Exception as e:
+            errors[key] = e
+
+    threads = [threading.Thread(target=worker, args=(key,)) for key in keys]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_loads_coalesce_into_one_batch():
+    backend = _Backend()
+    loader = DataLoader(backend, window=0.2)
+    results, errors = _load_concurrently(loader, ["a", "b", "c", "a", "missing"])
+    assert not errors
+    assert results == {"a": "A", "b": "B", "c": "C", "missing": None}
+    assert backend.batches == [["a", "b", "c", "missing"]]
+    assert loader.stats()["batches"] == 1
+
+
+def test_full_batches_are_sent_without_waiting():
+    backend = _Backend()
+    loader = DataLoader(backend, window=0.2, max_batch=2)
+    results, _ = _load_concurrently(loader, ["a", "b", "c", "d"])
+    assert results == {"a": "A", "b": "B", "c": "C", "d": "D"}
+    assert all(len(batch) <= 2 for batch in backend.batches)
+    assert sorted(key for batch in backend.batches for key in batch) == ["a", "b", "c", "d"]
+
+
+def test_load_many_splits_at_max_batch():
+    backend = _Backend()
+    loader = DataLoader(backend, max_batch=2)
+    assert loader.load_many(["a", "b", "c", "a", "d", "e"]) == ["A", "B", "C", "A", "D", "E"]
+    assert backend.batches == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_a_failed_batch_fails_every_caller_and_is_not_cached():
+    backend = _Backend(fail=True)
+    loader = DataLoader(backend, window=0.2)
+    results, errors = _load_concurrently(loader, ["a", "b"])
+    assert not results
+    assert set(errors) == {"a", "b"} and all(isinstance(e, LookupError) for e in errors.values())
+
+    backend.fail = False
+    assert loader.load("a") == "A"  # Retried, not served a cached failure
+    assert len(backend.batches) == 2
+
+
+def test_results_are_cached_until_cleared():
+    now = [0.0]
+    backend = _Backend()
+    loader = DataLoader(backend, window=0, clock=lambda: now[0])
+    assert loader.load("a") == loader.load("a") == "A"
+    assert len(backend.batches) == 1 and loader.stats()["cache_hits"] == 1
+
+    loader.clear("a")
+    loader.load("a")
+    now[0] += loader.cache_ttl
+    loader.load("a")
+    assert len(backend.batches) == 3
+
+
+@pytest.mark.parametrize("max_batch", [1, 3])
+def test_load_many_uses_the_cache(max_batch):
+    backend = _Backend()
+    loader = DataLoader(backend, window=0, max_batch=max_batch)
+    loader.prime("a", "primed")
+    assert loader.load_many(["a", "b"]) == ["primed", "B"]
+    assert backend.batches == [["b"]]
@@ -0,0 +1,96 @@
+"""Date ranges and rosters in EmployeeHours"""
+
+from datetime import date
+
+import pytest
+
+from scripts.employee_hours import EmployeeHours
+from scripts.synthetic_data import REFERENCE_DATE
+
+
+@pytest.fixture
+def hours():
+    return EmployeeHours(today=REFERENCE_DATE)
+
+
+def test_today_defaults_to_the_real_date():
+    assert EmployeeHours().today == date.today()
+
+
+def test_range_is_clipped_to_the_timesheets(hours):
+    data = hours.get_employee_hours("EMP001", "this year")
+    assert data["found"]
+    assert data["start_date"] == hours.timesheets.start.isoformat()
+    assert data["hours"] == data["hours_this_week"] + data["hours_last_week"]
+
+
+@pytest.mark.parametrize("date_range, message", [
+    ("2020-01-01 to 2020-02-01", "No timesheet data"),
+    ("next decade", "Unrecognised date range"),
+])
+def test_unusable_ranges_are_answered_the_same_way(hours, date_range, message):
+    for data in (hours.get_employee_hours("EMP001", date_range), hours.get_department_hours(date_range),
+                 hours.get_overtime(date_range)):
+        assert data["found"] is False
+        assert data["message"].startswith(message)
+    assert hours.format_hours_response(hours.get_employee_hours("EMP001", date_range)).startswith(message)
+
+
+def test_roster_from_a_store_without_categories():
+    from scripts.entity_store import EntityStore
+    from scripts.mock_data import MOCK_EMPLOYEES
+
+    store = EntityStore([dict(e) for e in MOCK_EMPLOYEES], id_field="employee_id")
+    data = EmployeeHours(employees=store, today=REFERENCE_DATE).get_department_roster("Assembly")
+    assert data["found"]
+    assert data["count"] == len(data["employees"].to_list()) == sum(e["department"] == "Assembly" for e in MOCK_EMPLOYEES)
+
+    with pytest.raises(ValueError):
+        store.set_category(data["employees"][0]["employee_id"], "name", "Someone Else")
+    assert store.set_category(data["employees"][0]["employee_id"], "status", "Inactive")
+    assert store.select(status="Inactive").to_list() == [data["employees"][0]]
+
+
+class _CountingRecords(list):
+    reads = 0
+
+    def __getitem__(self, item):
+        self.reads += 1
+        return super().__getitem__(item)
+
+
+def test_roster_count_reads_no_records():
+    from scripts.entity_store import EntityStore
+    from scripts.mock_data import MOCK_EMPLOYEES
+
+    store = EntityStore([dict(e) for e in MOCK_EMPLOYEES], id_field="employee_id")
+    hours = EmployeeHours(employees=store, today=REFERENCE_DATE)
+    store.records = records = _CountingRecords(store.records)
+    expected = sum(e["department"] == "Assembly" for e in MOCK_EMPLOYEES)
+
+    data = hours.get_department_roster("Assembly")
+    assert data["count"] == len(data["employees"]) == expected
+    assert records.reads == 0
+
+    hours.format_roster_response(data)
+    assert records.reads == min(expected, 5)
+
+
+def test_an_empty_store_is_used_not_replaced():
+    from scripts.entity_store import EntityStore
+
+    store = EntityStore([], id_field="employee_id")
+    hours = EmployeeHours(employees=store, today=REFERENCE_DATE)
+    assert hours.employees is store
+    assert hours.get_department_roster("Assembly")["count"] == 0
+
+
+def test_a_misheard_name_is_flagged_as_a_guess(hours):
+    data = hours.get_employee_hours("Jon Smyth")
+    assert data["name"] == "John Smith" and data["fuzzy_match"] is True
+    assert hours.format_hours_response(data).startswith("I think you mean John Smith. ")
+    assert hours.get_employee_hours("John")["fuzzy_match"] is False
+
+
+def test_a_different_name_that_sounds_alike_is_not_matched(hours):
+    assert hours.get_employee_hours("Jane")["found"] is False
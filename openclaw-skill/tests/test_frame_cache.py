@@ -0,0 +1,43 @@
+"""FrameCache reuses results for the same view only"""
+
+from scripts.frame_cache import FrameCache, synthetic_frame
+
+
+def _flat(shade):
+    return [[shade] * 160 for _ in range(120)]
+
+
+def _lookup(cache, frame):
+    return cache.lookup(frame, lambda f: id(f))
+
+
+def test_same_view_is_reused():
+    cache = FrameCache()
+    first = synthetic_frame(3)
+    assert _lookup(cache, first) == id(first)
+    assert _lookup(cache, synthetic_frame(3, shift=1, take=1)) == id(first)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_different_scene_is_computed():
+    cache = FrameCache()
+    _lookup(cache, synthetic_frame(3))
+    other = synthetic_frame(4)
+    assert _lookup(cache, other) == id(other)
+
+
+def test_featureless_frames_are_never_cached():
+    cache = FrameCache()
+    light, dark = _flat(200), _flat(100)
+    assert cache.fingerprint(light) == cache.fingerprint(dark)
+    assert _lookup(cache, light) == id(light)
+    assert _lookup(cache, dark) == id(dark)
+    assert (len(cache), cache.uncacheable, cache.hits) == (0, 2, 0)
+
+
+def test_brightness_change_is_a_different_view():
+    cache = FrameCache()
+    frame = synthetic_frame(5, noise=0)
+    brighter = [[min(255, value + 60) for value in row] for row in frame]
+    _lookup(cache, frame)
+    assert _lookup(cache, brighter) == id(brighter)
@@ -0,0 +1,93 @@
+"""CachedClient freshness: TTLs, invalidation, and results that raced an invalidation"""
+
+import pytest
+
+from scripts.mock_databricks import MockDatabricksClient
+from scripts.query_cache import CachedClient
+
+SQL = "SELECT sku FROM inventory WHERE sku = 'ABC123'"
+
+
+class _Warehouse:
+    """Mock client that can run a hook (e.g. a concurrent write) while a statement executes"""
+
+    def __init__(self):
+        self.client = MockDatabricksClient(verbose=False)
+        self.during = None
+        self.executed = 0
+
+    def execute_statement(self, sql, **kwargs):
+        self.executed += 1
+        if self.during is not None:
+            self.during()
+        return self.client.execute_statement(sql, **kwargs)
+
+
+@pytest.fixture
+def warehouse():
+    return _Warehouse()
+
+
+def test_hits_until_expiry(warehouse):
+    now = [0.0]
+    cache = CachedClient(warehouse, clock=lambda: now[0])
+    assert cache.execute_statement(SQL) is cache.execute_statement(SQL)
+    now[0] += cache.table_ttls["inventory"] + 1
+    cache.execute_statement(SQL)
+    assert (warehouse.executed, cache.hits, cache.expirations) == (2, 1, 1)
+
+
+def test_invalidate_drops_results_of_that_table_only(warehouse):
+    cache = CachedClient(warehouse)
+    cache.execute_statement(SQL)
+    cache.execute_statement("SELECT job_id FROM production WHERE job_id = 'JOB001'")
+    assert cache.invalidate("inventory") == 1
+    assert cache.invalidate("jobs") == 1  # Aliases name the same table
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("write", [lambda cache: cache.invalidate("inventory"), lambda cache: cache.clear()])
+def test_result_fetched_across_an_invalidation_is_not_cached(warehouse, write):
+    cache = CachedClient(warehouse)
+    warehouse.during = lambda: write(cache)
+    cache.execute_statement(SQL)
+    assert cache.stats()["entries"] == 0
+
+    warehouse.during = None
+    cache.execute_statement(SQL)
+    cache.execute_statement(SQL)
+    assert (warehouse.executed, cache.hits) == (2, 1)
+
+
+def test_other_tables_invalidated_meanwhile_do_not_matter(warehouse):
+    cache = CachedClient(warehouse)
+    warehouse.during = lambda: cache.invalidate("customers")
+    cache.execute_statement(SQL)
+    assert cache.stats()["entries"] == 1
+
+
+def test_statements_without_readable_tables_are_not_cached(warehouse):
+    cache = CachedClient(warehouse)
+    outcomes = []
+    cache.on_outcome = outcomes.append
+    for _ in range(2):
+        cache.execute_statement("SELECT sku FROM inventory WHERE sku = $1")
+    assert warehouse.executed == 2
+    assert outcomes == ["bypass", "bypass"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_generation_moves_on_invalidation_not_expiry(warehouse):
+    now = [0.0]
+    cache = CachedClient(warehouse, clock=lambda: now[0])
+    generation = cache.generation("inventory")
+    cache.execute_statement(SQL)
+    now[0] += cache.table_ttls["inventory"] + 1
+    cache.execute_statement(SQL)
+    cache.invalidate("customers")
+    assert cache.generation("inventory") == generation
+    cache.invalidate("inventory")
+    assert cache.generation("inventory") != generation
+    generation = cache.generation("inventory")
+    cache.clear()
+    assert cache.generation("inventory") != generation
@@ -0,0 +1,20 @@
+"""ColumnBatch typing of API values"""
+
+from array import array
+
+from scripts.result_batch import ColumnBatch
+
+SCHEMA = [("sku", "STRING"), ("qty", "INT"), ("cost", "DOUBLE")]
+
+
+def test_numeric_strings_are_converted_into_typed_arrays():
+    batch = ColumnBatch(SCHEMA, [["A", "3", "1.5"], ["B", "4", "2"]])
+    assert isinstance(batch.data["qty"], array)
+    assert batch[1].as_dict() == {"sku": "B", "qty": 4, "cost": 2.0}
+
+
+def test_nullable_numeric_columns_are_still_converted():
+    batch = ColumnBatch(SCHEMA, [["A", "3", None], ["B", None, "2.25"]])
+    assert batch.column("qty") == [3, None]
+    assert batch.column("cost") == [None, 2.25]
+    assert batch.to_rows() == [["A", 3, None], ["B", None, 2.25]]
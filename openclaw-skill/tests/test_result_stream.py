@@ -0,0 +1,42 @@
+"""Streaming statements from the mock warehouse, including from many threads at once"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts.mock_databricks import MockDatabricksClient
+from scripts.result_stream import StatementError, iter_rows
+from scripts.synthetic_data import generate_dataset
+
+SQL = "SELECT sku FROM inventory ORDER BY sku"
+
+
+@pytest.fixture(scope="module")
+def client():
+    return MockDatabricksClient(generate_dataset(500, seed=3), chunk_rows=7, verbose=False)
+
+
+def test_rows_stream_across_chunks(client):
+    assert list(iter_rows(client, SQL)) == client.execute_statement(SQL)["result"]["data_array"]
+
+
+def test_concurrent_streams_are_complete(client):
+    expected = client.execute_statement(SQL)["result"]["data_array"]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: list(iter_rows(client, SQL)), range(32)))
+    assert all(rows == expected for rows in results)
+    assert not client._streams  # Every finished statement was released
+
+
+def test_chunks_are_handed_out_once(client):
+    first = client.execute_statement(SQL, fetch_all=False)
+    statement_id = first["statement_id"]
+    assert client.get_chunk(statement_id, 1)["row_offset"] == 7
+    assert client.get_chunk(statement_id, 1)["status"]["state"] == "FAILED"
+    client.close_statement(statement_id)
+    assert client.get_chunk(statement_id, 2)["status"]["state"] == "FAILED"
+
+
+def test_failed_statement_raises(client):
+    with pytest.raises(StatementError, match="Unknown column"):
+        list(iter_rows(client, "SELECT sku FROM inventory WHERE bogus = 1"))
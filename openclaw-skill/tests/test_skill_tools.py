@@ -0,0 +1,103 @@
+"""SkillTools behaviour that the tool server and CLI rely on"""
+
+import pytest
+
+from scripts.skill_tools import SkillTools, ToolError
+from scripts.synthetic_data import REFERENCE_DATE
+
+
+@pytest.fixture
+def tools():
+    return SkillTools()
+
+
+def test_aggregates_outlive_cache_entries(tools):
+    aggregates = tools.aggregates
+    tools.job_changed("JOB900", {"status": "IN_PROGRESS", "quantity_ordered": 5, "quantity_produced": 0,
+                                 "estimated_completion": "2000-01-01"})
+    tools.client.table_ttls["production_jobs"] = 0  # Every cached result is already expired
+    tools.client.max_bytes = 0  # and too big to keep
+    assert tools.aggregates is aggregates
+    assert tools.aggregates is aggregates
+    assert "JOB900" in aggregates.jobs
+
+
+def test_aggregates_reload_on_invalidation(tools):
+    aggregates = tools.aggregates
+    tools.client.invalidate("production_jobs")
+    assert tools.aggregates is not aggregates
+    reloaded = tools.aggregates
+    tools.client.clear()
+    assert tools.aggregates is not reloaded
+
+
+def test_aggregates_without_cache_load_once():
+    tools = SkillTools(cache=False)
+    assert tools.aggregates is tools.aggregates
+
+
+@pytest.mark.parametrize("tool, arguments", [
+    ("overdue_jobs", {"as_of": "next week"}),
+    ("overdue_jobs", {"as_of": "2026-02-30"}),
+    ("daily_production", {"day": "today"}),
+])
+def test_dates_are_validated(tools, tool, arguments):
+    with pytest.raises(ToolError, match="YYYY-MM-DD"):
+        tools.call(tool, arguments)
+
+
+def test_overdue_as_of(tools):
+    assert tools.call("overdue_jobs", {"as_of": "2026-02-18"})["result"]["count"] == 1
+    assert tools.call("overdue_jobs", {"as_of": "2000-01-01"})["result"]["count"] == 0
+
+
+def test_roster_is_serialized_as_a_list(tools):
+    import json
+
+    result = tools.call("department_roster", {"department": "Assembly"})["result"]
+    assert isinstance(result["employees"], list)
+    assert len(result["employees"]) == result["count"] > 0
+    json.dumps(result)
+
+
+def test_item_changed_keeps_the_search_index_current(tools):
+    tools.item_changed("XYZ789", "Carbon Wheelset")  # Index not loaded yet: nothing to do
+    assert tools.call("inventory_search", {"query": "hydraulic brake"})["result"]["found"]
+
+    tools.item_changed("XYZ789", "Carbon Wheelset")
+    assert [sku for sku, _ in tools.search_index.search("wheelset")] == ["XYZ789"]
+    assert not tools.call("inventory_search", {"query": "hydraulic brake"})["result"]["found"]
+
+    tools.item_changed("XYZ789")
+    assert "XYZ789" not in tools.search_index
+    assert not tools.call("inventory_search", {"query": "wheelset"})["result"]["found"]
+
+
+def test_writes_clear_the_batched_lookups():
+    tools = SkillTools(batch_window=0.001)
+    for tool, arguments, key in [
+        ("inventory_lookup", {"sku": "XYZ789"}, ("inventory_lookup", "sku")),
+        ("inventory_lookup", {"barcode": "555666777888"}, ("inventory_lookup", "barcode")),
+        ("production_status", {"job_id": "JOB001"}, ("production_status", "job_id")),
+    ]:
+        loader = tools.loaders[key]
+        tools.call(tool, arguments)
+        tools.call(tool, arguments)
+        assert (loader.stats()["batches"], loader.stats()["cache_hits"]) == (1, 1)
+
+        if tool == "production_status":
+            tools.job_changed("JOB001")
+        else:
+            tools.item_changed("XYZ789", "Hydraulic Brake Set")
+        tools.call(tool, arguments)
+        assert (loader.stats()["batches"], loader.stats()["cache_hits"]) == (2, 1)
+
+
+def test_one_today_for_every_date_relative_tool():
+    from datetime import date
+
+    tools = SkillTools(today=date(2026, 2, 18))
+    assert tools.employees.today == tools.today
+    assert tools.call("daily_production", {})["result"]["day"] == "2026-02-18"
+    assert tools.call("overdue_jobs", {})["result"] == tools.call("overdue_jobs", {"as_of": "2026-02-18"})["result"]
+    assert SkillTools().today == REFERENCE_DATE
@@ -0,0 +1,121 @@
+"""Parser, plan cache and SQL semantics of the mock warehouse engine"""
+
+import pytest
+
+from scripts.sql_engine import (SqlEngine, SqlError, Table, normalize_sql, referenced_tables,
+                                statement_key, tokenize)
+
+ROWS = [
+    {"id": "A1", "name": "Bolt", "qty": 5, "price": 1.5},
+    {"id": "A2", "name": "Nut", "qty": 0, "price": None},
+    {"id": "A3", "name": "Washer", "qty": 12, "price": 0.25},
+]
+
+
+@pytest.fixture
+def engine():
+    engine = SqlEngine(plan_cache_size=2)
+    engine.register(Table("parts", ["id", "name", "qty", "price"], ROWS, indexed=("id",)), aliases=["part"])
+    return engine
+
+
+def test_tokenize_folds_keywords_and_keeps_literals():
+    assert tokenize("Select ID from Parts where name = 'O''Brien'") == [
+        ("keyword", "select"), ("ident", "id"), ("keyword", "from"), ("ident", "parts"),
+        ("keyword", "where"), ("ident", "name"), ("op", "="), ("string", "'O''Brien'"),
+    ]
+
+
+def test_tokenize_rejects_unknown_input():
+    with pytest.raises(SqlError):
+        tokenize("SELECT id FROM parts WHERE qty = $1")
+
+
+def test_statement_key_ignores_spacing_and_case_but_not_parameters():
+    assert normalize_sql("select  id\nFROM parts") == normalize_sql("SELECT id FROM parts")
+    params = [{"name": "id", "value": "A1"}]
+    assert statement_key("SELECT id FROM parts WHERE id = :id", params) == \
+        statement_key("select id from parts where id = :id", params)
+    assert statement_key("SELECT id FROM parts WHERE id = :id", params) != \
+        statement_key("SELECT id FROM parts WHERE id = :id", [{"name": "id", "value": "A2"}])
+
+
+def test_referenced_tables():
+    assert referenced_tables("SELECT * FROM main.shop.parts WHERE qty > 0") == ["parts"]
+    assert referenced_tables("not sql at all $") == []
+
+
+def test_plan_fields(engine):
+    plan = engine.plan("SELECT id, name FROM part WHERE id = 'A1' ORDER BY name DESC LIMIT 1")
+    assert plan.table == "parts"
+    assert plan.columns == ["id", "name"]
+    assert plan.order_by == [("name", True)]
+    assert plan.limit == 1
+    assert plan.lookup[0] == "id" and plan.lookup_exact
+    assert plan.referenced == ["id", "name"]
+
+
+def test_or_disables_lookup_and_conjuncts(engine):
+    plan = engine.plan("SELECT id FROM parts WHERE id = 'A1' OR qty > 3")
+    assert plan.lookup is None
+    assert plan.conjuncts is None
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT id FROM parts LIMIT -1",
+    "SELECT id FROM parts WHERE",
+    "SELECT id FROM parts extra",
+    "UPDATE parts SET qty = 1",
+    "SELECT id FROM missing",
+])
+def test_invalid_statements(engine, sql):
+    with pytest.raises(SqlError):
+        engine.plan(sql)
+
+
+def test_plan_cache_hits_on_normalized_text_and_evicts_oldest(engine):
+    first = engine.plan("SELECT id FROM parts")
+    assert engine.plan("select   id from PARTS") is first
+    assert (engine.plan_hits, engine.plan_misses) == (1, 1)
+
+    engine.plan("SELECT name FROM parts")
+    engine.plan("SELECT qty FROM parts")  # Cache holds two plans: the first is evicted
+    assert engine.plan("SELECT id FROM parts") is not first
+    assert engine.plan_misses == 4
+
+
+def test_execute_where_order_limit(engine):
+    columns, rows = engine.execute("SELECT id, qty FROM parts WHERE qty >= :min ORDER BY qty DESC",
+                                   {"min": 1})
+    assert columns == ["id", "qty"]
+    assert rows == [["A3", 12], ["A1", 5]]
+    assert engine.execute("SELECT id FROM parts ORDER BY price LIMIT 2")[1] == [["A3"], ["A1"]]
+
+
+def test_null_semantics(engine):
+    assert engine.execute("SELECT id FROM parts WHERE price IS NULL")[1] == [["A2"]]
+    assert engine.execute("SELECT id FROM parts WHERE price > 0")[1] == [["A1"], ["A3"]]
+    assert engine.execute("SELECT id FROM parts WHERE id NOT IN ('A1', NULL)")[1] == []
+
+
+def test_missing_parameter(engine):
+    with pytest.raises(SqlError, match=":min"):
+        engine.execute("SELECT id FROM parts WHERE qty > :min")
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT bogus FROM parts",
+    "SELECT id FROM parts WHERE bogus = 1",
+    "SELECT id FROM parts WHERE id = 'A1' AND bogus IS NULL",
+    "SELECT id FROM parts ORDER BY bogus",
+])
+def test_unknown_columns(engine, sql):
+    with pytest.raises(SqlError, match="Unknown column"):
+        engine.execute(sql)
+
+
+def test_string_number_comparison_is_an_error(engine):
+    with pytest.raises(SqlError, match="Cannot compare"):
+        engine.execute("SELECT id FROM parts WHERE name > 100")
+    # Equality across types is simply false, as for any unequal values
+    assert engine.execute("SELECT id FROM parts WHERE name = 100")[1] == []
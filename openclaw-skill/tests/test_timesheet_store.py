@@ -0,0 +1,39 @@
+"""TimesheetStore department rollups when employees move"""
+
+from datetime import date
+
+import pytest
+
+from scripts.timesheet_store import TimesheetStore
+
+START = date(2026, 2, 2)
+
+
+@pytest.fixture
+def store():
+    store = TimesheetStore(START)
+    store.record_series("E1", START, [8, 8, 6], department="Assembly")
+    store.record_series("E2", START, [4, 4, 4], department="Assembly")
+    return store
+
+
+def test_a_move_takes_past_hours_along(store):
+    store.record("E1", date(2026, 2, 5), 7, department="Welding")
+    assert store.department_hours("Welding", START, date(2026, 2, 5)) == 29
+    assert store.department_hours("Assembly", START, date(2026, 2, 5)) == 12
+    assert store.department_hours("Assembly", date(2026, 2, 5), date(2026, 2, 5)) == 0
+    assert store.hours("E1", START, date(2026, 2, 5)) == 29
+
+
+@pytest.mark.parametrize("move", [
+    lambda store: store.record_series("E2", date(2026, 2, 5), [5], department="Welding"),
+    lambda store: store.record_many([("E2", date(2026, 2, 5), 5)], departments={"E2": "Welding"}),
+])
+def test_every_way_of_assigning_moves_the_hours(store, move):
+    move(store)
+    assert store.department_rollup(START, date(2026, 2, 5)) == {"Assembly": 22, "Welding": 17}
+
+
+def test_the_same_department_is_not_counted_twice(store):
+    store.record("E1", START, 9, department="Assembly")
+    assert store.department_hours("Assembly", START, date(2026, 2, 4)) == 35
@@ -0,0 +1,61 @@
+"""tool_cli falls back to running in-process whenever the server gives no usable reply"""
+
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from scripts import tool_cli
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+REQUEST = {"tool": "top_customers", "arguments": {"limit": 1}}
+
+
+@pytest.fixture
+def listener():
+    """A socket that accepts one connection and answers it with the given behaviour"""
+    path = os.path.join(tempfile.mkdtemp(), "tools.sock")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(1)
+    done = threading.Event()
+
+    def start(answer):
+        def serve():
+            connection, _ = sock.accept()
+            with connection:
+                connection.recv(65536)
+                answer(connection)
+                done.wait(5)
+        threading.Thread(target=serve, daemon=True).start()
+        return path
+
+    yield start
+    done.set()
+    sock.close()
+    os.unlink(path)
+
+
+@pytest.mark.parametrize("answer", [
+    lambda connection: connection.sendall(b"<html>not a tool server</html>\n"),
+    lambda connection: connection.sendall(b"\xff\xfe\n"),
+    lambda connection: None,  # Never replies: the client times out
+    lambda connection: connection.close(),  # Hangs up without a reply
+])
+def test_unusable_replies_fall_back(listener, answer):
+    assert tool_cli.forward(REQUEST, listener(answer), timeout=0.2) is None
+
+
+def test_no_server_falls_back():
+    assert tool_cli.forward(REQUEST, os.path.join(tempfile.mkdtemp(), "missing.sock")) is None
+
+
+def test_main_runs_the_call_locally(listener, monkeypatch, capsys):
+    path = listener(lambda connection: None)
+    forward = tool_cli.forward
+    monkeypatch.setattr(tool_cli, "forward", lambda request: forward(request, path, timeout=0.2))
+    assert tool_cli.main(["top_customers", "limit=1"]) == 0
+    assert capsys.readouterr().out.strip()
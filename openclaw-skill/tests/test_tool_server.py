@@ -0,0 +1,148 @@
+"""Tool server error paths: every failure is answered, over both transports"""
+
+import json
+import os
+import socket
+import tempfile
+import urllib.error
+import urllib.request
+
+import pytest
+
+from scripts.metrics import Metrics
+from scripts.tool_server import ToolServer
+
+
+@pytest.fixture(scope="module", params=[None, "metrics"])
+def server(request):
+    return ToolServer(metrics=Metrics() if request.param else None)
+
+
+def test_tool_call(server):
+    response = server.handle({"tool": "top_customers", "arguments": {"limit": 1}})
+    assert response["ok"] and response["tool"] == "top_customers"
+
+
+@pytest.mark.parametrize("request_body, error", [
+    ({"tool": "no_such_tool"}, "Unknown tool"),
+    ({"tool": "top_customers", "arguments": {"bogus": 1}}, "Bad arguments"),
+    ({"tool": "top_customers", "arguments": [1]}, "Bad arguments"),
+])
+def test_bad_input_is_a_client_error(server, request_body, error):
+    response = server.handle(request_body)
+    assert not response["ok"] and "status" not in response
+    assert error in response["error"]
+
+
+def test_tool_bug_is_an_internal_error(server, capsys):
+    response = server.handle({"tool": "top_customers", "arguments": {"limit": "x"}})
+    assert response["ok"] is False and response["status"] == 500
+    assert response["error"].startswith("Internal error in top_customers: ValueError")
+    assert "Traceback" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("message", [5, None, [1, 2], "text"])
+def test_dispatch_rejects_non_objects(server, message):
+    response = server.dispatch(message)
+    assert response == {"ok": False, "error": "Bad request: expected a JSON object per line"}
+
+
+def test_batch_fails_entries_one_at_a_time(server):
+    response = server.dispatch({"batch": [
+        {"tool": "inventory_lookup", "arguments": {"sku": "ABC123"}},
+        "not a call",
+        {"tool": "top_customers", "arguments": {"limit": "x"}},
+        {"tool": "top_customers", "arguments": 3},
+        {"tool": "no_such_tool"},
+    ]})
+    assert response["ok"]
+    results = response["results"]
+    assert results[0]["ok"]
+    assert [r["ok"] for r in results[1:]] == [False] * 4
+    assert results[2]["status"] == 500
+    assert "Unknown tool" in results[4]["error"]
+    assert not server.handle_batch({"tool": "top_customers"})["ok"]
+
+
+def _post(address, path, body):
+    host, port = address
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=json.dumps(body).encode(), method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_status_codes(server):
+    http = server.serve_http(port=0)
+    try:
+        assert _post(http.server_address, "/tools/top_customers", {"limit": 1})[0] == 200
+        assert _post(http.server_address, "/tools/top_customers", {"bogus": 1})[0] == 400
+        assert _post(http.server_address, "/tools/top_customers", [1])[0] == 400
+        assert _post(http.server_address, "/tools/top_customers", {"limit": "x"})[0] == 500
+        assert _post(http.server_address, "/nowhere", {})[0] == 404
+    finally:
+        http.shutdown()
+        http.server_close()
+
+
+def test_socket_connection_survives_bad_lines(server):
+    path = os.path.join(tempfile.mkdtemp(), "tools.sock")
+    unix = server.serve_unix(path)
+    try:
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(path)
+            stream = sock.makefile("rwb")
+            replies = []
+            for line in [b"5", b"null", b"{bad", b'{"tool": "top_customers", "arguments": {"limit": "x"}}',
+                         b'{"tool": "top_customers", "arguments": {"limit": 1}}']:
+                stream.write(line + b"\n")
+                stream.flush()
+                replies.append(json.loads(stream.readline()))
+        assert [reply["ok"] for reply in replies] == [False, False, False, False, True]
+        assert replies[2]["error"].startswith("Bad request")
+        assert replies[3]["status"] == 500
+    finally:
+        unix.shutdown()
+        unix.server_close()
+        os.unlink(path)
+
+
+def test_metrics_on_existing_tools():
+    from scripts.skill_tools import SkillTools
+
+    tools, metrics = SkillTools(), Metrics()
+    server = ToolServer(tools=tools, metrics=metrics)
+    assert server.metrics is metrics and tools.metrics is metrics
+    server.handle({"tool": "inventory_lookup", "arguments": {"sku": "ABC123"}})
+    names = {(kind, name) for kind, name in metrics.latency}
+    assert ("tool", "inventory_lookup") in names
+    assert ("sql", "MockDatabricksClient.execute_statement") in names
+    assert metrics.cache  # The query cache reports its outcomes
+
+    assert ToolServer(tools=tools, metrics=metrics).metrics is metrics  # Same instance again: no double wrapping
+    with pytest.raises(ValueError):
+        ToolServer(tools=tools, metrics=Metrics())
+
+
+@pytest.mark.parametrize("value, on", [("1", True), ("true", True), ("YES", True), ("0", False),
+                                       ("false", False), ("", False)])
+def test_metrics_environment_flag(monkeypatch, value, on):
+    from scripts import tool_server
+
+    seen = {}
+    monkeypatch.setenv("OPENCLAW_METRICS", value)
+    monkeypatch.setattr("sys.argv", ["tool_server.py"])
+
+    class Stop(Exception):
+        pass
+
+    def fake_server(*args, metrics=None, **kwargs):
+        seen["metrics"] = metrics is not None
+        raise Stop
+
+    monkeypatch.setattr(tool_server, "ToolServer", fake_server)
+    with pytest.raises(Stop):
+        tool_server.main()
+    assert seen["metrics"] is on
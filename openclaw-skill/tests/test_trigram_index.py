@@ -0,0 +1,62 @@
+"""TrigramIndex ranking, typo tolerance and upkeep"""
+
+from scripts.trigram_index import TrigramIndex, trigrams
+
+CATALOGUE = [
+    ("ABC123", "Red Bicycle Helmet"),
+    ("DEF456", "Mountain Bike Frame - Carbon"),
+    ("XYZ789", "Hydraulic Brake Set"),
+    ("LOW001", "Titanium Seat Post"),
+    ("BRK002", "Hydraulic Brake Set"),
+    ("BRK003", "Disc Brake Pads"),
+]
+
+
+def _keys(matches):
+    return [key for key, _ in matches]
+
+
+def test_trigrams_are_padded_per_word():
+    assert trigrams("Car") == {"  c", " ca", "car", "ar "}
+    assert trigrams("car car") == trigrams("CAR")
+
+
+def test_every_query_word_present_ranks_first():
+    index = TrigramIndex(CATALOGUE)
+    matches = index.search("brake")
+    assert set(_keys(matches[:3])) == {"XYZ789", "BRK002", "BRK003"}
+    assert matches[0][1] == 1.0
+    # Equal scores: the text with fewer extra trigrams wins
+    assert _keys(index.search("brake pads", limit=1)) == ["BRK003"]
+
+
+def test_typos_and_word_order_are_tolerated():
+    index = TrigramIndex(CATALOGUE)
+    assert _keys(index.search("hydralic brake", limit=1)) in (["XYZ789"], ["BRK002"])
+    assert _keys(index.search("helmet bicycle red", limit=1)) == ["ABC123"]
+    assert index.search("submarine") == []
+
+
+def test_limit_counts_keys_sharing_a_text():
+    index = TrigramIndex(CATALOGUE)
+    assert set(_keys(index.search("hydraulic brake set", limit=2))) == {"XYZ789", "BRK002"}
+    assert len(index.search("hydraulic brake set", limit=1)) == 1
+    assert index.stats()["distinct_texts"] == 5
+
+
+def test_add_replaces_and_remove_drops():
+    index = TrigramIndex(CATALOGUE)
+    index.add("LOW001", "Carbon Seat Post")
+    assert "LOW001" in index and len(index) == 6
+    assert "LOW001" not in _keys(index.search("titanium"))
+    assert _keys(index.search("carbon seat", limit=1)) == ["LOW001"]
+
+    assert index.remove("BRK002") and not index.remove("BRK002")
+    assert _keys(index.search("hydraulic")) == ["XYZ789"]
+    before = index.stats()
+    assert index.remove("XYZ789")
+    assert index.search("hydraulic") == []
+    # Last key gone: the text and the trigrams only it held go too
+    after = index.stats()
+    assert after["distinct_texts"] == before["distinct_texts"] - 1
+    assert after["trigrams"] < before["trigrams"]